@@ -0,0 +1,586 @@
+"""
+AI機能モジュール
+OpenAI APIを使うAIチャット・会話の要約・文字起こし・議事録生成を管理
+（openaiパッケージの読み込みに時間がかかるため、database.pyからは初めて使うときに読み込まれる）
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple
+from openai import OpenAI
+
+from config import get_config
+from database import (
+    CHAT_CONTEXT_TURNS,
+    get_connection,
+    get_recording_by_meeting,
+    save_recording,
+    record_ai_metric,
+    get_chat_thread,
+    get_recent_chat_history,
+    get_cached_answer,
+    save_cached_answer,
+)
+
+# 会話の要約：未要約の履歴がこのトークン数を超えたら古い部分を要約にまとめる
+CHAT_HISTORY_TOKEN_BUDGET = 1500
+# 要約するときも、直近のこの件数はそのまま残す
+CHAT_KEEP_RECENT_TURNS = 4
+
+def get_openai_api_key() -> Optional[str]:
+    """OpenAI APIキーを取得（config.pyで読み込んだ設定から）"""
+    return get_config().openai_api_key
+
+def get_openai_base_url() -> Optional[str]:
+    """
+    OpenAI APIの接続先URLを取得（未設定ならNone＝本番のAPI）
+    fake_openai_server.pyなどの代替サーバーを使うときに設定します。
+    """
+    return get_config().openai_base_url
+
+def get_openai_client(api_key: str) -> OpenAI:
+    """設定された接続先に向けたOpenAIクライアントを作成"""
+    return OpenAI(api_key=api_key, base_url=get_openai_base_url())
+
+def _create_chat_completion(client, feature: str, meeting_id: Optional[int], **kwargs):
+    """chat.completions.createを呼び出し、所要時間とトークン数をai_metricsに記録"""
+    started = time.perf_counter()
+    try:
+        response = client.chat.completions.create(**kwargs)
+    except Exception as e:
+        record_ai_metric(feature, kwargs.get("model", ""), meeting_id,
+                         (time.perf_counter() - started) * 1000, success=False, error=str(e)[:500])
+        raise
+
+    usage = getattr(response, "usage", None)
+    record_ai_metric(
+        feature, kwargs.get("model", ""), meeting_id, (time.perf_counter() - started) * 1000,
+        prompt_tokens=getattr(usage, "prompt_tokens", None),
+        completion_tokens=getattr(usage, "completion_tokens", None)
+    )
+    return response
+
+def _create_transcription(client, feature: str, meeting_id: Optional[int], **kwargs):
+    """audio.transcriptions.createを呼び出し、所要時間と音声の長さをai_metricsに記録"""
+    # 音声の長さ（duration）を受け取るためverbose_jsonで呼び出す
+    kwargs.setdefault("response_format", "verbose_json")
+    started = time.perf_counter()
+    try:
+        response = client.audio.transcriptions.create(**kwargs)
+    except Exception as e:
+        record_ai_metric(feature, kwargs.get("model", ""), meeting_id,
+                         (time.perf_counter() - started) * 1000, success=False, error=str(e)[:500])
+        raise
+
+    record_ai_metric(
+        feature, kwargs.get("model", ""), meeting_id, (time.perf_counter() - started) * 1000,
+        audio_seconds=getattr(response, "duration", None)
+    )
+    return response
+
+def _build_chat_system_prompt(recording: Optional[Dict], conversation_summary: str = "") -> str:
+    """AIチャット用のシステムプロンプトを構築（シニア向け、議事録コンテキスト付き）"""
+    transcript = recording['transcript'] if recording and recording['transcript'] else ""
+    summary = recording['summary'] if recording and recording['summary'] else ""
+
+    system_prompt = f"""あなたは高齢者向けのAI学習会をサポートする優しいアシスタントです。
+以下の議事録の内容に基づいて、ユーザーの質問に答えてください。
+
+【重要な注意点】
+- 高齢者にもわかりやすい、丁寧で優しい言葉を使ってください
+- 専門用語は避け、必要な場合は簡単な説明を添えてください
+- 回答は簡潔にまとめ、箇条書きなどを活用して見やすくしてください
+- 議事録に関係ない質問でも、親切に対応してください
+- 励ましの言葉を適度に入れてください
+
+【議事録の内容】
+{summary if summary else transcript if transcript else '（議事録はまだ作成されていません）'}
+
+【文字起こしテキスト】
+{transcript[:2000] if transcript else '（文字起こしはまだありません）'}
+"""
+
+    # 以前の会話の要約があれば追加（古い履歴の代わりに使う）
+    if conversation_summary:
+        system_prompt += f"""
+【これまでの会話の要約】
+{conversation_summary}
+"""
+
+    return system_prompt
+
+def generate_ai_response_with_gpt4o(meeting_id: int, user_message: str, chat_history: List[Dict] = None,
+                                    conversation_summary: str = "") -> Tuple[bool, str, str]:
+    """
+    GPT-4oを使って議事録に基づいたAI応答を生成
+
+    Args:
+        meeting_id: ミーティングID
+        user_message: ユーザーの質問
+        chat_history: 過去のチャット履歴（要約に含まれていない直近の分）
+        conversation_summary: それより前の会話の要約
+
+    Returns:
+        (成功, メッセージ, AI応答)
+    """
+    try:
+        # APIキーを取得
+        api_key = get_openai_api_key()
+        if not api_key:
+            return False, "OPENAI_API_KEYが設定されていません。", ""
+
+        # OpenAIクライアントを初期化
+        client = get_openai_client(api_key)
+
+        # 議事録を取得し、システムプロンプトを構築
+        recording = get_recording_by_meeting(meeting_id)
+        system_prompt = _build_chat_system_prompt(recording, conversation_summary)
+
+        # メッセージを構築
+        messages = [{"role": "system", "content": system_prompt}]
+
+        # チャット履歴があれば追加（最新CHAT_CONTEXT_TURNS件まで）
+        if chat_history:
+            for msg in chat_history[-CHAT_CONTEXT_TURNS:]:
+                role = "assistant" if msg.get('is_ai') else "user"
+                messages.append({"role": role, "content": msg['message']})
+
+        # ユーザーの新しい質問を追加
+        messages.append({"role": "user", "content": user_message})
+
+        # GPT-4oで応答を生成
+        response = _create_chat_completion(
+            client, "chat", meeting_id,
+            model=get_config().chat_model,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=1000
+        )
+
+        ai_response = response.choices[0].message.content.strip()
+
+        return True, "応答を生成しました", ai_response
+
+    except Exception as e:
+        error_msg = str(e)
+        if "api_key" in error_msg.lower():
+            return False, "OpenAI APIキーが無効です。設定を確認してください。", ""
+        return False, f"エラーが発生しました: {error_msg}", ""
+
+def precompute_standard_answers(meeting_id: int, questions: Optional[List[str]] = None) -> Tuple[bool, str, int]:
+    """
+    よくある質問への回答を1回のリクエストでまとめて作成し、回答キャッシュに保存
+    議事録の作成直後に呼び出しておくと、AIチャットでこれらの質問にすぐ回答できます。
+
+    Args:
+        meeting_id: ミーティングID
+        questions: 質問のリスト（省略時は設定のstandard_questions）
+
+    Returns:
+        (成功, メッセージ, 保存した回答の数)
+    """
+    if questions is None:
+        questions = list(get_config().standard_questions)
+    if not questions:
+        return True, "用意する質問がありません", 0
+
+    try:
+        api_key = get_openai_api_key()
+        if not api_key:
+            return False, "OPENAI_API_KEYが設定されていません。", 0
+
+        recording = get_recording_by_meeting(meeting_id)
+        if not recording or not (recording['summary'] or recording['transcript']):
+            return False, "議事録がまだありません", 0
+
+        client = get_openai_client(api_key)
+
+        numbered_questions = "\n".join(f"{i + 1}. {q}" for i, q in enumerate(questions))
+        request = f"""次の{len(questions)}個の質問に、それぞれ独立した回答を作成してください。
+回答は {{"answers": ["1つ目の回答", "2つ目の回答", ...]}} という形のJSONで、質問と同じ順番で返してください。
+
+{numbered_questions}"""
+
+        response = _create_chat_completion(
+            client, "chat_precompute", meeting_id,
+            model=get_config().chat_model,
+            messages=[
+                {"role": "system", "content": _build_chat_system_prompt(recording)},
+                {"role": "user", "content": request}
+            ],
+            temperature=0.7,
+            max_tokens=1000 * len(questions),
+            response_format={"type": "json_object"}
+        )
+
+        answers = json.loads(response.choices[0].message.content).get("answers", [])
+        if not isinstance(answers, list) or len(answers) != len(questions):
+            return False, "回答の形式が正しくありませんでした", 0
+
+        saved_count = 0
+        for question, answer in zip(questions, answers):
+            if isinstance(answer, str) and answer.strip():
+                if save_cached_answer(meeting_id, question, answer.strip(), recording):
+                    saved_count += 1
+
+        return True, f"よくある質問の回答を{saved_count}件用意しました", saved_count
+
+    except Exception as e:
+        return False, f"エラーが発生しました: {str(e)}", 0
+
+def start_precompute_standard_answers(meeting_id: int) -> threading.Thread:
+    """
+    よくある質問への回答の作成をバックグラウンドで始める
+    議事録の保存直後に呼び出し、画面の表示を回答の作成で待たせないようにします。
+    （作成が終わる前に質問された場合は、その質問だけ都度回答します）
+    """
+    thread = threading.Thread(target=precompute_standard_answers, args=(meeting_id,), daemon=True)
+    thread.start()
+    return thread
+
+def generate_ai_response(meeting_id: int, user_message: str, chat_history: Optional[List[Dict]] = None,
+                         thread_id: Optional[int] = None, standard_question: bool = False) -> str:
+    """
+    AI応答を生成（後方互換性のためのラッパー関数）
+    GPT-4oを使用し、失敗した場合はフォールバック応答を返す
+
+    chat_historyに画面で読み込み済みの履歴を渡すと、再取得せずにそのまま使います。
+    省略した場合はスレッド（thread_id）の直近CHAT_CONTEXT_TURNS件だけを取得します。
+
+    同じ議事録に対する同じ最初の質問（履歴も要約もない質問）は、
+    キャッシュした回答をAPIを呼ばずに返します。
+    standard_question=True（よくある質問のボタン）のときは会話の流れに関係なく答える質問として、
+    履歴があっても最初の質問と同じように扱い、用意しておいた回答を返します。
+    """
+    # 会話の要約と、要約済みの位置を取得（よくある質問は会話の流れを使わない）
+    conversation_summary = ""
+    summarized_until_id = 0
+    if standard_question:
+        chat_history = []
+    elif thread_id is not None:
+        thread = get_chat_thread(thread_id)
+        if thread:
+            conversation_summary = thread['summary'] or ""
+            summarized_until_id = thread['summarized_until_id']
+
+    # チャット履歴を取得（要約されていない直近の分だけ）
+    if chat_history is None:
+        chat_history = get_recent_chat_history(meeting_id, limit=CHAT_CONTEXT_TURNS + 1, thread_id=thread_id)
+        # 直前に保存した今回の質問は履歴に含めない（画面から渡す履歴と同じ扱いにする）
+        if chat_history and not chat_history[-1]['is_ai'] and chat_history[-1]['message'] == user_message:
+            chat_history = chat_history[:-1]
+    chat_history = [msg for msg in chat_history if msg['id'] > summarized_until_id][-CHAT_CONTEXT_TURNS:]
+
+    # 会話の流れに依存しない（最初の質問への）回答だけをキャッシュから返す
+    recording = get_recording_by_meeting(meeting_id)
+    is_first_question = not chat_history and not conversation_summary
+    if is_first_question:
+        cached_answer = get_cached_answer(meeting_id, user_message, recording)
+        if cached_answer is not None:
+            return cached_answer
+
+    # GPT-4oで応答を生成
+    success, message, ai_response = generate_ai_response_with_gpt4o(
+        meeting_id, user_message, chat_history, conversation_summary
+    )
+
+    if success:
+        # キャッシュを使うときと同じ条件で保存する
+        if is_first_question:
+            save_cached_answer(meeting_id, user_message, ai_response, recording)
+        return ai_response
+
+    # フォールバック応答（API接続失敗時）
+    fallback_responses = [
+        f"申し訳ありません。現在AIとの接続に問題が発生しています。\n\n議事録の内容を確認したいときは、「📝 議事録」タブをご覧ください。\n\n({message})",
+        f"ただいまAIが応答できない状態です。しばらくお待ちいただいてから、もう一度お試しください。\n\n({message})"
+    ]
+
+    import random
+    return random.choice(fallback_responses)
+
+def estimate_tokens(text: str) -> int:
+    """
+    トークン数のおおよその見積もり
+    （日本語は1文字≒1トークン、英数字は4文字≒1トークンとして数える）
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_chars) + ascii_chars // 4
+
+def summarize_conversation_with_gpt4o(previous_summary: str, turns: List[Dict],
+                                      meeting_id: Optional[int] = None) -> Tuple[bool, str, Optional[str]]:
+    """
+    これまでの要約と古い会話をまとめて、新しい要約を作成
+
+    Args:
+        previous_summary: これまでの要約（なければ空文字）
+        turns: 要約に取り込む会話
+        meeting_id: ミーティングID（利用状況の記録用）
+
+    Returns:
+        (成功, メッセージ, 新しい要約)
+    """
+    try:
+        api_key = get_openai_api_key()
+        if not api_key:
+            return False, "OPENAI_API_KEYが設定されていません。", None
+
+        client = get_openai_client(api_key)
+
+        conversation = "\n".join(
+            f"{'AI' if msg.get('is_ai') else 'ユーザー'}: {msg['message']}" for msg in turns
+        )
+
+        prompt = f"""
+以下は、高齢者向けAI学習会の参加者とAIアシスタントの会話です。
+これまでの要約に新しい会話の内容を加えて、今後の会話に必要な情報（質問の内容、説明したこと、ユーザーの理解度や関心）を
+300文字以内の日本語で要約してください。
+
+【これまでの要約】
+{previous_summary if previous_summary else '（なし）'}
+
+【新しい会話】
+{conversation}
+"""
+
+        response = _create_chat_completion(
+            client, "chat_summary", meeting_id,
+            model=get_config().summary_model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.3,
+            max_tokens=500
+        )
+
+        return True, "会話を要約しました", response.choices[0].message.content.strip()
+
+    except Exception as e:
+        return False, f"会話の要約中にエラーが発生しました: {str(e)}", None
+
+def summarize_chat_thread_if_needed(thread_id: int) -> Tuple[bool, str]:
+    """
+    未要約の履歴がCHAT_HISTORY_TOKEN_BUDGETを超えていれば、
+    直近CHAT_KEEP_RECENT_TURNS件を残して古い部分を要約に取り込む
+
+    Args:
+        thread_id: 会話スレッドID
+
+    Returns:
+        (要約を更新したか, メッセージ)
+    """
+    thread = get_chat_thread(thread_id)
+    if not thread:
+        return False, "会話が見つかりません"
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, message, is_ai
+        FROM chat_history
+        WHERE thread_id = ? AND id > ?
+        ORDER BY created_at ASC, id ASC
+    """, (thread_id, thread['summarized_until_id']))
+    turns = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+
+    if sum(estimate_tokens(msg['message']) for msg in turns) <= CHAT_HISTORY_TOKEN_BUDGET:
+        return False, "要約は不要です"
+
+    older_turns = turns[:-CHAT_KEEP_RECENT_TURNS]
+    if not older_turns:
+        return False, "要約は不要です"
+
+    success, message, new_summary = summarize_conversation_with_gpt4o(
+        thread['summary'] or "", older_turns, thread['meeting_id']
+    )
+    if not success:
+        return False, message
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE chat_threads
+            SET summary = ?, summarized_until_id = ?
+            WHERE id = ?
+        """, (new_summary, older_turns[-1]['id'], thread_id))
+        conn.commit()
+        conn.close()
+        return True, message
+    except Exception as e:
+        return False, f"エラーが発生しました: {str(e)}"
+
+def transcribe_audio_with_whisper(audio_file_path: str, meeting_id: Optional[int] = None) -> Tuple[bool, str, Optional[str]]:
+    """
+    Whisper APIを使って音声ファイルを文字起こし
+
+    Args:
+        audio_file_path: 音声ファイルのパス
+        meeting_id: ミーティングID（利用状況の記録用）
+
+    Returns:
+        (成功, メッセージ, 文字起こしテキスト)
+    """
+    try:
+        # APIキーを取得（Streamlit Cloud優先）
+        api_key = get_openai_api_key()
+        if not api_key:
+            return False, "OPENAI_API_KEYが設定されていません。Streamlit Cloudの場合はSecretsに、ローカルの場合は.envファイルに設定してください。", None
+
+        # OpenAIクライアントを初期化
+        client = get_openai_client(api_key)
+
+        # ファイルサイズチェック（25MB = 26,214,400 bytes）
+        file_size = os.path.getsize(audio_file_path)
+        max_size = 25 * 1024 * 1024  # 25MB
+
+        if file_size > max_size:
+            return False, f"ファイルサイズが大きすぎます（上限25MB）。現在のサイズ: {file_size / (1024*1024):.1f}MB", None
+
+        # 音声ファイルを開いて文字起こし
+        with open(audio_file_path, "rb") as audio_file:
+            transcript = _create_transcription(
+                client, "transcription", meeting_id,
+                model=get_config().transcription_model,
+                file=audio_file,
+                language="ja"  # 日本語に指定
+            )
+
+        return True, "文字起こしが完了しました", transcript.text
+
+    except FileNotFoundError:
+        return False, f"音声ファイルが見つかりません: {audio_file_path}", None
+    except Exception as e:
+        error_msg = str(e)
+        if "api_key" in error_msg.lower():
+            return False, "OpenAI APIキーが無効です。.envファイルを確認してください。", None
+        return False, f"文字起こし中にエラーが発生しました: {error_msg}", None
+
+def save_audio_and_transcribe(meeting_id: int, audio_file, created_by: int) -> Tuple[bool, str, Optional[str]]:
+    """
+    音声ファイルを保存してWhisper APIで文字起こし、議事録として保存
+
+    Args:
+        meeting_id: ミーティングID
+        audio_file: Streamlitのアップロードファイルオブジェクト
+        created_by: 作成者のユーザーID
+
+    Returns:
+        (成功, メッセージ, 文字起こしテキスト)
+    """
+    try:
+        # アップロードディレクトリを作成
+        upload_dir = "audio_uploads"
+        os.makedirs(upload_dir, exist_ok=True)
+
+        # ファイル名を生成（ミーティングID + タイムスタンプ + 元のファイル名）
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_extension = os.path.splitext(audio_file.name)[1]
+        safe_filename = f"meeting_{meeting_id}_{timestamp}{file_extension}"
+        file_path = os.path.join(upload_dir, safe_filename)
+
+        # ファイルを保存
+        with open(file_path, "wb") as f:
+            f.write(audio_file.getbuffer())
+
+        # Whisper APIで文字起こし
+        success, message, transcript = transcribe_audio_with_whisper(file_path, meeting_id)
+
+        if not success:
+            # エラーの場合、保存したファイルを削除
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            return False, message, None
+
+        # 議事録としてデータベースに保存
+        save_success, save_message, _ = save_recording(meeting_id, file_path, transcript, created_by)
+
+        if not save_success:
+            # データベース保存失敗の場合、ファイルを削除
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            return False, f"議事録の保存に失敗しました: {save_message}", None
+
+        return True, "音声ファイルの文字起こしと議事録保存が完了しました", transcript
+
+    except Exception as e:
+        return False, f"処理中にエラーが発生しました: {str(e)}", None
+
+def generate_minutes_with_gpt4o(transcript: str, meeting_id: Optional[int] = None) -> Tuple[bool, str, Optional[str]]:
+    """
+    GPT-4oを使って文字起こしから議事録を自動生成
+
+    Args:
+        transcript: 文字起こしテキスト
+        meeting_id: ミーティングID（利用状況の記録用）
+
+    Returns:
+        (成功, メッセージ, 整形された議事録)
+    """
+    try:
+        # APIキーを取得（Streamlit Cloud優先）
+        api_key = get_openai_api_key()
+        if not api_key:
+            return False, "OPENAI_API_KEYが設定されていません。Streamlit Cloudの場合はSecretsに、ローカルの場合は.envファイルに設定してください。", None
+
+        # OpenAIクライアントを初期化
+        client = get_openai_client(api_key)
+
+        # プロンプトを構築（シニア向けにわかりやすく）
+        prompt = f"""
+以下は会議の文字起こしテキストです。このテキストから、高齢者にもわかりやすい議事録を作成してください。
+
+【文字起こし】
+{transcript}
+
+【議事録フォーマット】
+以下の形式で議事録を作成してください：
+
+## 📝 会議の要約
+（会議の内容を3-5文で簡潔にまとめてください。高齢者にもわかりやすい言葉を使用してください。）
+
+## 📌 主要なトピック
+- （重要なトピック1）
+- （重要なトピック2）
+- （重要なトピック3）
+（必要に応じて追加してください）
+
+## ✅ 決定事項
+- （決定事項1）
+- （決定事項2）
+（決定事項がない場合は「特になし」と記載してください）
+
+## 🔄 次回への申し送り事項
+- （申し送り事項1）
+- （申し送り事項2）
+（申し送り事項がない場合は「特になし」と記載してください）
+
+重要：
+- 専門用語は避け、平易な日本語を使用してください
+- 箇条書きは簡潔にまとめてください
+- 高齢者の方々が読みやすいように配慮してください
+"""
+
+        # GPT-4oで議事録を生成
+        response = _create_chat_completion(
+            client, "minutes", meeting_id,
+            model=get_config().minutes_model,
+            messages=[
+                {"role": "system", "content": "あなたは高齢者向けのAI学習会の議事録作成アシスタントです。わかりやすく、丁寧な言葉で議事録を作成してください。"},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=2000
+        )
+
+        formatted_minutes = response.choices[0].message.content.strip()
+
+        return True, "議事録の生成が完了しました", formatted_minutes
+
+    except Exception as e:
+        error_msg = str(e)
+        if "api_key" in error_msg.lower():
+            return False, "OpenAI APIキーが無効です。.envファイルを確認してください。", None
+        return False, f"議事録生成中にエラーが発生しました: {error_msg}", None
@@ -0,0 +1,55 @@
+"""
+AI利用状況レポート
+OpenAI APIの呼び出し記録（ai_metricsテーブル）を機能別・ミーティング別・モデル別に集計して表示します。
+
+使い方:
+    python ai_usage_report.py                 # 機能別
+    python ai_usage_report.py --by meeting    # ミーティング別
+    python ai_usage_report.py --since 2026-01-01
+"""
+
+import argparse
+
+import database as db
+
+
+def format_ms(value):
+    return f"{value:,.0f}" if value is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI利用状況（レイテンシ・トークン数・推定料金）を集計します")
+    parser.add_argument("--by", choices=["feature", "meeting", "model"], default="feature",
+                        help="集計の単位（既定: feature）")
+    parser.add_argument("--since", help="この日時以降の記録だけを集計（例: 2026-01-01）")
+    parser.add_argument("--db", default=db.DB_FILE, help="データベースファイル")
+    args = parser.parse_args()
+
+    db.DB_FILE = args.db
+    db.init_database()
+    report = db.get_ai_usage_report(args.by, args.since)
+
+    if not report:
+        print("記録がありません")
+        return
+
+    header = f"{args.by:<16}{'calls':>7}{'fail':>6}{'p50 ms':>10}{'p95 ms':>10}" \
+             f"{'prompt':>10}{'compl.':>10}{'audio s':>10}{'cost $':>10}"
+    print(header)
+    print("-" * len(header))
+    for row in report:
+        print(f"{str(row[args.by]):<16}{row['calls']:>7}{row['failures']:>6}"
+              f"{format_ms(row['p50_ms']):>10}{format_ms(row['p95_ms']):>10}"
+              f"{row['prompt_tokens']:>10,}{row['completion_tokens']:>10,}"
+              f"{row['audio_seconds']:>10,.0f}{row['cost_usd']:>10.4f}")
+
+    print("-" * len(header))
+    print(f"{'total':<16}{sum(r['calls'] for r in report):>7}{sum(r['failures'] for r in report):>6}"
+          f"{'':>20}{sum(r['prompt_tokens'] for r in report):>10,}"
+          f"{sum(r['completion_tokens'] for r in report):>10,}"
+          f"{sum(r['audio_seconds'] for r in report):>10,.0f}"
+          f"{sum(r['cost_usd'] for r in report):>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,15 @@
 import streamlit as st
+import streamlit.components.v1 as components
+from streamlit.errors import StreamlitAPIException
 import database as db
-from datetime import datetime
+import rate_limit
+from config import get_config
+from datetime import datetime, timedelta
+import functools
+import html
+import json
+import math
+import time
 import os
 
 # ページ設定
@@ -10,8 +19,36 @@ st.set_page_config(
     layout="wide"
 )
 
-# データベース初期化
-db.init_database()
+# SQLの計測（有効なときのみ）を再描画ごとにリセット
+db.reset_query_stats()
+# ページ全体を実行している間だけTrue（フラグメントだけの再実行と区別する）
+page_run_active = True
+
+# データベース初期化（テーブル作成・移行はプロセスごとに1回だけ）
+@st.cache_resource(show_spinner=False)
+def initialize_database(db_file):
+    db.init_database()
+    db.init_reminder_table()
+    return True
+
+initialize_database(db.DB_FILE)
+
+def rerun_fragment():
+    """実行中のフラグメントだけを再実行（ページ全体の実行中に呼ばれたときはページ全体を再実行）"""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+def fragment(func):
+    """st.fragmentと同じ（フラグメントだけを再実行したときは、SQLの記録もそこからやり直す）"""
+    @st.fragment
+    @functools.wraps(func)
+    def run_fragment(*args, **kwargs):
+        if not page_run_active:
+            db.reset_query_stats()
+        return func(*args, **kwargs)
+    return run_fragment
 
 # チェックリストデータ
 CHECKLIST_CATEGORIES = {
@@ -401,6 +438,32 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# 一覧の1ページあたりの表示件数
+MEETINGS_PAGE_SIZE = 10
+CHAT_PAGE_SIZE = 20
+
+# カレンダーの表示（曜日は月曜始まり）
+CALENDAR_VIEWS = {'month': "🗓️ 月", 'week': "📅 週"}
+WEEKDAY_LABELS = ["月", "火", "水", "木", "金", "土", "日"]
+# カレンダーの日付の区切りと表示する時刻のタイムゾーン（期間の取得と日ごとの振り分けで同じものを使う）
+CALENDAR_TIMEZONE = db.DEFAULT_TIMEZONE
+
+# ミーティングの繰り返し（表示名: (頻度, 間隔)）
+MEETING_REPEAT_OPTIONS = {
+    "繰り返さない": None,
+    "毎週": ('WEEKLY', 1),
+    "隔週（2週間ごと）": ('WEEKLY', 2),
+    "毎月": ('MONTHLY', 1),
+}
+
+# ミーティング詳細のタブ（選んだタブだけを表示する）
+MEETING_DETAIL_TABS = {
+    'minutes': "📝 議事録",
+    'ai_chat': "🤖 AIに質問",
+    'learning_notes': "📚 学んだこと",
+    'recording': "🎤 録音",
+}
+
 # セッション状態の初期化
 if 'user' not in st.session_state:
     st.session_state.user = None
@@ -411,6 +474,104 @@ if 'success_message' not in st.session_state:
 if 'success_type' not in st.session_state:
     st.session_state.success_type = None
 
+# ログイン状態の復元（Cookieのセッショントークンから。ブラウザを開き直しても再ログインしなくてよい）
+SESSION_COOKIE = "ai_literacy_session"
+# 以前はURLに付けていたセッショントークン（読み込んだらURLから外す）
+SESSION_QUERY_PARAM = "session"
+
+def get_session_cookie():
+    """ブラウザから送られたセッショントークンのCookie（接続したときの値）"""
+    try:
+        return st.context.cookies.get(SESSION_COOKIE)
+    except Exception:
+        return None
+
+def set_session_cookie(token, max_age):
+    """次の描画でセッショントークンのCookieを書き込む（tokenがNoneなら削除）"""
+    st.session_state.pending_session_cookie = (token or "", max_age)
+
+def write_pending_session_cookie():
+    """予約されたCookieを書き込む（Streamlitからは直接設定できないため、埋め込んだスクリプトで設定する）"""
+    pending = st.session_state.pop('pending_session_cookie', None)
+    if pending is None:
+        return
+    token, max_age = pending
+    cookie = f"{SESSION_COOKIE}={token}; Max-Age={max_age}; Path=/; SameSite=Strict"
+    components.html(f"""
+    <script>
+    const secure = window.parent.location.protocol === "https:" ? "; Secure" : "";
+    window.parent.document.cookie = {json.dumps(cookie)} + secure;
+    </script>
+    """, height=0)
+
+def restore_session():
+    # URLにトークンが付いていたらURLから外す（履歴や共有したURLに残さない）
+    url_token = st.query_params.get(SESSION_QUERY_PARAM)
+    if url_token:
+        del st.query_params[SESSION_QUERY_PARAM]
+
+    # 復元を試すのはブラウザのセッションごとに1回だけ（ログアウト後に古いCookieで戻らないように）
+    if st.session_state.user is not None or st.session_state.get('session_restore_tried'):
+        return
+    st.session_state.session_restore_tried = True
+
+    token = url_token or get_session_cookie()
+    if not token:
+        return
+    user = db.get_user_by_session_token(token)
+    if user:
+        st.session_state.user = user
+        st.session_state.session_token = token
+        if url_token:
+            set_session_cookie(token, db.SESSION_TTL_DAYS * 24 * 60 * 60)
+    elif not url_token:
+        # 期限切れ・無効なトークンのCookieは削除する
+        set_session_cookie(None, 0)
+
+def get_client_key():
+    """
+    ログイン回数制限に使う接続元
+    信頼できるプロキシがX-Forwarded-Forに追記したIPアドレスを使い、
+    わからなければ共通の「unknown」にまとめる（セッションごとのキーにすると作り直すだけで制限を外せるため）
+    """
+    try:
+        forwarded = st.context.headers.get("X-Forwarded-For")
+    except Exception:
+        forwarded = None
+    client_key = rate_limit.client_key_from_forwarded(forwarded, get_config().trusted_proxy_hops)
+    return client_key or rate_limit.UNKNOWN_CLIENT_KEY
+
+# ユーザーごとに読み込んだ内容を保持しているセッションのキー
+USER_CACHE_KEYS = ('meeting_list',)
+USER_CACHE_PREFIXES = ('chat_history_', 'chat_thread_')
+
+def clear_user_caches():
+    """ログイン・ログアウト時に、前のユーザーの一覧やチャット履歴のキャッシュを破棄"""
+    for key in list(st.session_state.keys()):
+        if key in USER_CACHE_KEYS or key.startswith(USER_CACHE_PREFIXES):
+            del st.session_state[key]
+
+def start_session(user):
+    """ログイン状態を保存し、セッショントークンをCookieに書き込む"""
+    clear_user_caches()
+    st.session_state.user = user
+    token = db.create_user_session(user['id'])
+    if token:
+        st.session_state.session_token = token
+        set_session_cookie(token, db.SESSION_TTL_DAYS * 24 * 60 * 60)
+
+def end_session():
+    """ログアウト（セッショントークンを無効にしてCookieを削除）"""
+    token = st.session_state.pop('session_token', None)
+    if token:
+        db.delete_user_session(token)
+        set_session_cookie(None, 0)
+    clear_user_caches()
+    st.session_state.user = None
+
+restore_session()
+write_pending_session_cookie()
+
 # 進捗計算
 def calculate_progress(checklist_data):
     """全体の進捗とカテゴリごとの進捗を計算"""
@@ -560,6 +721,32 @@ def show_zoom_join_button(zoom_url, zoom_passcode=None):
     """, unsafe_allow_html=True)
 
 # ログイン・登録画面
+def meeting_key(meeting):
+    """ボタンのキー用の識別子（まだ作成されていない繰り返しミーティングの回はシリーズと日時から）"""
+    if meeting['id']:
+        return str(meeting['id'])
+    return f"s{meeting['series_id']}_{meeting['occurrence_ts']}"
+
+def ensure_meeting_id(meeting):
+    """ミーティングIDを取得（まだ作成されていない繰り返しミーティングの回はここで作成）"""
+    if meeting['id']:
+        return meeting['id']
+    success, message, meeting_id = db.materialize_occurrence(meeting['series_id'], meeting['occurrence_ts'])
+    if not success:
+        st.error(f"❌ {message}")
+    return meeting_id
+
+def open_meeting(meeting):
+    """ミーティング詳細ページへ移動"""
+    if meeting['id']:
+        st.session_state.selected_meeting = meeting['id']
+        st.session_state.selected_occurrence = None
+    else:
+        st.session_state.selected_meeting = None
+        st.session_state.selected_occurrence = (meeting['series_id'], meeting['occurrence_ts'])
+    st.session_state.page = 'meeting_detail'
+    st.rerun()
+
 def show_auth_page():
     st.title("✅ AI学習チェックリスト")
     st.markdown("### シニアのためのAI活用ガイド")
@@ -600,11 +787,13 @@ def show_auth_page():
 
         if st.button("🔓 ログインする", key="login_button", type="primary", use_container_width=True):
             if email and password:
-                user = db.authenticate_user(email, password)
+                user, retry_after = rate_limit.authenticate_with_rate_limit(email, password, get_client_key())
                 if user:
-                    st.session_state.user = user
+                    start_session(user)
                     st.success("✅ ログインしました！画面が切り替わります...")
                     st.rerun()
+                elif retry_after > 0:
+                    st.error(f"❌ ログインの試行が多すぎます。{math.ceil(retry_after / 60)}分ほど待ってから、もう一度お試しください")
                 else:
                     st.error("❌ メールアドレスまたはパスワードが間違っています")
             else:
@@ -767,9 +956,6 @@ def show_dashboard():
 
     # ホストの場合：リマインダー送信が必要なミーティングをチェック
     if user['role'] == 'host':
-        # リマインダーテーブルを初期化
-        db.init_reminder_table()
-
         meetings_needing_reminder = db.get_meetings_needing_reminder(user['id'], hours_before=24)
 
         if meetings_needing_reminder:
@@ -789,15 +975,11 @@ def show_dashboard():
             """, unsafe_allow_html=True)
 
             for meeting in meetings_needing_reminder:
-                # scheduled_atがNoneの場合はスキップ
-                if not meeting.get('scheduled_at'):
-                    continue
-                    
-                try:
-                    scheduled_dt = datetime.fromisoformat(meeting['scheduled_at'])
-                    hours_until = (scheduled_dt - datetime.now()).total_seconds() / 3600
-                except:
+                # 開催日時が未定の場合はスキップ
+                scheduled_dt = db.get_meeting_datetime(meeting)
+                if scheduled_dt is None:
                     continue
+                hours_until = (scheduled_dt.timestamp() - time.time()) / 3600
 
                 st.markdown(f"""
                 <div class="group-card" style="border: 4px solid #ff9800; background-color: #fff3e0;">
@@ -810,14 +992,16 @@ def show_dashboard():
 
                 col1, col2 = st.columns(2)
                 with col1:
-                    if st.button(f"📧 リマインダーを送信", key=f"send_reminder_{meeting['id']}", type="primary", use_container_width=True):
+                    if st.button(f"📧 リマインダーを送信", key=f"send_reminder_{meeting_key(meeting)}", type="primary", use_container_width=True):
                         with st.spinner("📤 リマインダーを送信中..."):
-                            success, message, sent_count = db.send_auto_reminder(meeting['id'], 'reminder_24h')
-                            if success:
-                                st.success(f"✅ {message}")
-                                st.rerun()
-                            else:
-                                st.error(f"❌ {message}")
+                            meeting_id = ensure_meeting_id(meeting)
+                            if meeting_id:
+                                success, message, sent_count = db.send_auto_reminder(meeting_id, 'reminder_24h')
+                                if success:
+                                    st.success(f"✅ {message}")
+                                    st.rerun()
+                                else:
+                                    st.error(f"❌ {message}")
                 with col2:
                     if meeting.get('zoom_url'):
                         st.info(f"📹 Zoom設定済み")
@@ -833,7 +1017,10 @@ def show_dashboard():
                     with st.spinner("📤 リマインダーを一括送信中..."):
                         total_sent = 0
                         for meeting in meetings_needing_reminder:
-                            success, message, sent_count = db.send_auto_reminder(meeting['id'], 'reminder_24h')
+                            meeting_id = ensure_meeting_id(meeting)
+                            if not meeting_id:
+                                continue
+                            success, message, sent_count = db.send_auto_reminder(meeting_id, 'reminder_24h')
                             if success:
                                 total_sent += sent_count
                         st.success(f"✅ {len(meetings_needing_reminder)}件のミーティングにリマインダーを送信しました！")
@@ -851,8 +1038,8 @@ def show_dashboard():
 
         for meeting in upcoming_meetings:
             # 日数計算
-            scheduled_dt = datetime.fromisoformat(meeting['scheduled_at'])
-            now = datetime.now()
+            scheduled_dt = db.get_meeting_datetime(meeting)
+            now = datetime.now(scheduled_dt.tzinfo)
             days_until = (scheduled_dt - now).days
 
             # カードの色を日数によって変更
@@ -898,10 +1085,8 @@ def show_dashboard():
             # 詳細を見るボタン
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(f"📝 詳細を見る", key=f"view_meeting_{meeting['id']}", use_container_width=True):
-                    st.session_state.selected_meeting = meeting['id']
-                    st.session_state.page = 'meeting_detail'
-                    st.rerun()
+                if st.button(f"📝 詳細を見る", key=f"view_meeting_{meeting_key(meeting)}", use_container_width=True):
+                    open_meeting(meeting)
 
             st.markdown("---")
     else:
@@ -971,6 +1156,24 @@ def show_checklist_page():
     </div>
     """, unsafe_allow_html=True)
 
+    show_checklist_items(user)
+
+    # フッター
+    st.markdown("---")
+    st.markdown("""
+        <div style='text-align: center; color: #6c757d; font-size: 20px; padding: 25px;
+                    background-color: #f8f9fa; border-radius: 15px;'>
+            🌟 このチェックリストで、AIを楽しく学びましょう！<br>
+            わからないことがあれば、いつでも周りの人に聞いてくださいね。
+        </div>
+    """, unsafe_allow_html=True)
+
+@fragment
+def show_checklist_items(user):
+    """進捗とチェック項目（チェックしたときはこの部分だけを再実行する）"""
+    def save_item(item_id):
+        db.save_checklist_item(user['id'], item_id, st.session_state[item_id])
+
     # ユーザーのチェックリストを読み込み
     checklist_data = db.load_user_checklist(user['id'])
 
@@ -1033,11 +1236,8 @@ def show_checklist_page():
             item_id = f"{category}_{item}"
             checked = checklist_data.get(item_id, False)
 
-            new_checked = st.checkbox(item, value=checked, key=item_id)
-
-            if new_checked != checked:
-                db.save_checklist_item(user['id'], item_id, new_checked)
-                st.rerun()
+            # 変更はコールバックで保存してから、この部分だけが再実行される
+            st.checkbox(item, value=checked, key=item_id, on_change=save_item, args=(item_id,))
 
         st.markdown('</div>', unsafe_allow_html=True)
         st.markdown("")
@@ -1048,16 +1248,6 @@ def show_checklist_page():
         st.balloons()
         st.success("🎉🏆 おめでとうございます！すべての項目を達成しました！素晴らしいです！")
 
-    # フッター
-    st.markdown("---")
-    st.markdown("""
-        <div style='text-align: center; color: #6c757d; font-size: 20px; padding: 25px;
-                    background-color: #f8f9fa; border-radius: 15px;'>
-            🌟 このチェックリストで、AIを楽しく学びましょう！<br>
-            わからないことがあれば、いつでも周りの人に聞いてくださいね。
-        </div>
-    """, unsafe_allow_html=True)
-
 # グループ管理ページ
 def show_groups_page():
     user = st.session_state.user
@@ -1169,19 +1359,35 @@ def show_groups_page():
 
                     # メンバー招待
                     with st.expander("📧 メンバーを招待する"):
-                        st.markdown("招待したい方のメールアドレスを入力してください")
-                        invite_email = st.text_input(
+                        st.markdown("招待したい方のメールアドレスを入力してください（複数の場合は改行かカンマで区切ってください）")
+                        invite_emails = st.text_area(
                             "招待するメールアドレス",
                             key=f"invite_email_{group['id']}",
-                            placeholder="例: tanaka@example.com"
+                            height=120,
+                            placeholder="例: tanaka@example.com\nsuzuki@example.com"
+                        )
+                        invite_csv = st.file_uploader(
+                            "CSVファイルから読み込む（任意）",
+                            type=["csv", "txt"],
+                            key=f"invite_csv_{group['id']}"
                         )
                         if st.button("📨 招待を送る", key=f"invite_button_{group['id']}", type="primary"):
-                            if invite_email:
-                                success, message = db.invite_to_group(group['id'], invite_email, user['id'])
+                            emails_text = invite_emails or ""
+                            if invite_csv is not None:
+                                emails_text += "\n" + invite_csv.getvalue().decode("utf-8-sig", errors="ignore")
+
+                            if emails_text.strip():
+                                success, message, result = db.invite_many_to_group(group['id'], emails_text, user['id'])
                                 if success:
                                     st.success(f"✅ {message}")
                                 else:
                                     st.error(f"❌ {message}")
+                                if result['already_invited']:
+                                    st.info(f"📝 既に招待済み: {', '.join(result['already_invited'])}")
+                                if result['already_member']:
+                                    st.info(f"👥 既にメンバー: {', '.join(result['already_member'])}")
+                                if result['invalid']:
+                                    st.warning(f"⚠️ 形式が正しくないアドレス: {', '.join(result['invalid'])}")
                             else:
                                 st.warning("⚠️ メールアドレスを入力してください")
 
@@ -1287,6 +1493,7 @@ def show_meetings_page():
         with col1:
             if st.button("📋 一覧を表示", key="show_list_btn", use_container_width=True):
                 st.session_state.meeting_view = 'list'
+                st.session_state.pop('meeting_list', None)  # 一覧を読み込み直す
                 st.rerun()
         with col2:
             if st.button("➕ 新規作成する", key="show_create_btn", use_container_width=True):
@@ -1310,19 +1517,22 @@ def show_meetings_list(user):
     # 成功メッセージがあれば表示
     display_and_clear_success_message()
 
-    meetings = db.get_meetings_by_user(user['id'])
+    # 読み込み済みの行と次のページのカーソル（「もっと見る」では次の1ページだけを取得して追加する）
+    # 別のユーザーが読み込んだ一覧は使わずに読み込み直す
+    loaded = st.session_state.get('meeting_list')
+    if not loaded or loaded.get('user_id') != user['id']:
+        page, cursor = db.get_meetings_page_by_user(user['id'], MEETINGS_PAGE_SIZE)
+        st.session_state.meeting_list = {'user_id': user['id'], 'rows': page, 'cursor': cursor}
+    meetings = st.session_state.meeting_list['rows']
+    cursor = st.session_state.meeting_list['cursor']
 
     if meetings:
         for meeting in meetings:
             # 日時の処理
             date_str = ""
             if meeting['scheduled_at']:
-                from datetime import datetime
-                try:
-                    scheduled_dt = datetime.fromisoformat(meeting['scheduled_at'])
-                    date_str = scheduled_dt.strftime('%Y年%m月%d日 %H:%M')
-                except:
-                    date_str = meeting['scheduled_at']
+                scheduled_dt = db.get_meeting_datetime(meeting)
+                date_str = scheduled_dt.strftime('%Y年%m月%d日 %H:%M') if scheduled_dt else meeting['scheduled_at']
             
             # ミーティングカードを1つのmarkdownで表示
             st.markdown(f"""
@@ -1347,9 +1557,6 @@ def show_meetings_list(user):
             if meeting.get('zoom_url'):
                 show_zoom_join_button(meeting['zoom_url'], meeting.get('zoom_passcode'))
 
-            # 議事録表示
-            recording = db.get_recording_by_meeting(meeting['id'])
-
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("📝 詳細・議事録を見る", key=f"view_minutes_{meeting['id']}", type="primary", use_container_width=True):
@@ -1358,12 +1565,18 @@ def show_meetings_list(user):
                     st.rerun()
 
             with col2:
-                if recording:
+                if meeting['has_recording']:
                     st.success("✅ 議事録あり")
                 else:
                     st.info("📝 議事録なし")
 
             st.markdown("---")
+
+        if cursor is not None:
+            if st.button("⬇️ もっと見る", key="load_more_meetings", use_container_width=True):
+                page, cursor = db.get_meetings_page_by_user(user['id'], MEETINGS_PAGE_SIZE, cursor)
+                st.session_state.meeting_list = {'user_id': user['id'], 'rows': meetings + page, 'cursor': cursor}
+                st.rerun()
     else:
         st.info("📭 参加予定のミーティングはありません")
 
@@ -1424,6 +1637,16 @@ def show_create_meeting(user):
         from datetime import time as dt_time
         meeting_time = st.time_input("時刻", value=dt_time(12, 0), key="meeting_time")
 
+    # 繰り返し（各回は記録を始めたときにミーティングとして作成される）
+    col1, col2 = st.columns(2)
+    with col1:
+        meeting_repeat = st.selectbox("🔁 繰り返し", options=list(MEETING_REPEAT_OPTIONS.keys()), key="meeting_repeat")
+    repeat_count = None
+    if MEETING_REPEAT_OPTIONS[meeting_repeat]:
+        with col2:
+            repeat_count = st.number_input("回数", min_value=2, max_value=104, value=12, step=1,
+                                           key="meeting_repeat_count")
+
     st.markdown("---")
 
     # Zoom設定セクション
@@ -1476,16 +1699,39 @@ def show_create_meeting(user):
                 from datetime import datetime
                 scheduled_at = datetime.combine(meeting_date, meeting_time).isoformat()
 
-                success, message, meeting_id = db.create_meeting(
-                    meeting_title,
-                    meeting_description,
-                    selected_group_id,
-                    user['id'],
-                    scheduled_at,
-                    zoom_url if zoom_url else None,
-                    zoom_meeting_id if zoom_meeting_id else None,
-                    zoom_passcode if zoom_passcode else None
-                )
+                repeat = MEETING_REPEAT_OPTIONS[meeting_repeat]
+                recurrence = None
+                if repeat:
+                    freq, interval = repeat
+                    recurrence = db.describe_series_recurrence(freq, interval, int(repeat_count))
+                    success, message, series_id = db.create_meeting_series(
+                        meeting_title,
+                        meeting_description,
+                        selected_group_id,
+                        user['id'],
+                        scheduled_at,
+                        freq=freq,
+                        interval=interval,
+                        occurrence_count=int(repeat_count),
+                        zoom_url=zoom_url if zoom_url else None,
+                        zoom_meeting_id=zoom_meeting_id if zoom_meeting_id else None,
+                        zoom_passcode=zoom_passcode if zoom_passcode else None
+                    )
+                    meeting_id = None
+                    if success and send_invitation:
+                        # 招待メールの送信記録は初回のミーティングに残す
+                        success, message, meeting_id = db.materialize_occurrence(series_id, db.to_epoch(scheduled_at))
+                else:
+                    success, message, meeting_id = db.create_meeting(
+                        meeting_title,
+                        meeting_description,
+                        selected_group_id,
+                        user['id'],
+                        scheduled_at,
+                        zoom_url if zoom_url else None,
+                        zoom_meeting_id if zoom_meeting_id else None,
+                        zoom_passcode if zoom_passcode else None
+                    )
 
             if success:
                 # 招待メール送信
@@ -1493,8 +1739,6 @@ def show_create_meeting(user):
                 pending_email_result = ""
                 if send_invitation:
                     with st.spinner("📧 参加者に招待メールを送信中..."):
-                        # リマインダーテーブルを初期化
-                        db.init_reminder_table()
 
                         # グループ情報を取得
                         group = db.get_group_by_id(selected_group_id)
@@ -1513,7 +1757,8 @@ def show_create_meeting(user):
                                 group_name=group['name'] if group else '',
                                 recipients=recipients,
                                 zoom_url=zoom_url if zoom_url else None,
-                                zoom_passcode=zoom_passcode if zoom_passcode else None
+                                zoom_passcode=zoom_passcode if zoom_passcode else None,
+                                recurrence=recurrence
                             )
 
                             if email_success:
@@ -1524,8 +1769,8 @@ def show_create_meeting(user):
                         pending_emails = [inv['email'] for inv in pending_invitations]
 
                         if pending_emails:
-                            # アプリのURLを取得（Streamlit Cloud用）
-                            app_url = "https://ai-literacy-app-9wdvlbxqk77oscqse9rpkq.streamlit.app"
+                            # アプリのURLを取得（Streamlit Cloud用、APP_URLで変更可能）
+                            app_url = get_config().app_url
 
                             pending_success, pending_message, pending_success_list, pending_failed_list = db.send_meeting_invitation_to_pending(
                                 meeting_title=meeting_title,
@@ -1536,7 +1781,8 @@ def show_create_meeting(user):
                                 pending_emails=pending_emails,
                                 app_url=app_url,
                                 zoom_url=zoom_url if zoom_url else None,
-                                zoom_passcode=zoom_passcode if zoom_passcode else None
+                                zoom_passcode=zoom_passcode if zoom_passcode else None,
+                                recurrence=recurrence
                             )
 
                             if pending_success and pending_success_list:
@@ -1564,7 +1810,7 @@ def show_create_meeting(user):
                         {combined_email_result}
                     </p>
                     <p style="font-size: 22px; color: #155724; margin-top: 15px;">
-                        📅 「ミーティング一覧」タブで詳細を確認できます
+                        {'📆 「カレンダー」で各回の予定を確認できます' if repeat else '📅 「ミーティング一覧」タブで詳細を確認できます'}
                     </p>
                 </div>
                 """, unsafe_allow_html=True)
@@ -1580,6 +1826,7 @@ def show_create_meeting(user):
                 with col1:
                     if st.button("📅 ミーティング一覧を見る", type="primary", use_container_width=True):
                         st.session_state.meeting_view = 'list'  # 一覧ビューに切り替え
+                        st.session_state.pop('meeting_list', None)  # 一覧を読み込み直す
                         st.session_state.selected_meeting = meeting_id
                         st.rerun()
                 with col2:
@@ -1590,11 +1837,215 @@ def show_create_meeting(user):
         else:
             st.warning("⚠️ タイトルとグループを選択してください")
 
+# カレンダーページ
+def get_calendar_range(view, anchor):
+    """
+    表示する期間（開始日, 終了日（含まない））
+    月表示は、月の初日を含む週の月曜日から、末日を含む週の日曜日まで
+    """
+    if view == 'week':
+        start = anchor - timedelta(days=anchor.weekday())
+        return start, start + timedelta(days=7)
+    first = anchor.replace(day=1)
+    next_month = (first + timedelta(days=32)).replace(day=1)
+    start = first - timedelta(days=first.weekday())
+    last = next_month - timedelta(days=1)
+    return start, last + timedelta(days=7 - last.weekday())
+
+def shift_calendar_anchor(view, anchor, step):
+    """前・次の月（週）の基準日"""
+    if view == 'week':
+        return anchor + timedelta(days=7 * step)
+    first = anchor.replace(day=1)
+    if step > 0:
+        return (first + timedelta(days=32)).replace(day=1)
+    return (first - timedelta(days=1)).replace(day=1)
+
+def calendar_today():
+    """カレンダーのタイムゾーンでの今日の日付"""
+    return db.from_epoch(int(time.time()), CALENDAR_TIMEZONE).date()
+
+def group_meetings_by_day(meetings):
+    """ミーティングを開催日（カレンダーのタイムゾーンの日付）ごとにまとめる"""
+    by_day = {}
+    for meeting in meetings:
+        scheduled_dt = db.from_epoch(meeting['scheduled_ts'], CALENDAR_TIMEZONE)
+        by_day.setdefault(scheduled_dt.date(), []).append((scheduled_dt, meeting))
+    return by_day
+
+def show_calendar_page():
+    user = st.session_state.user
+
+    st.title("📆 カレンダー")
+    st.markdown("---")
+
+    # 成功メッセージがあれば表示
+    display_and_clear_success_message()
+
+    if 'calendar_view' not in st.session_state:
+        st.session_state.calendar_view = 'month'
+    if 'calendar_anchor' not in st.session_state:
+        st.session_state.calendar_anchor = calendar_today()
+    view = st.session_state.calendar_view
+    anchor = st.session_state.calendar_anchor
+
+    # 月・週の切り替え
+    col1, col2 = st.columns(2)
+    for col, (view_key, label) in zip((col1, col2), CALENDAR_VIEWS.items()):
+        with col:
+            if st.button(label, key=f"calendar_view_{view_key}", use_container_width=True,
+                         type="primary" if view == view_key else "secondary"):
+                st.session_state.calendar_view = view_key
+                st.rerun()
+
+    # 前・今日・次
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("◀️ 前へ", key="calendar_prev", use_container_width=True):
+            st.session_state.calendar_anchor = shift_calendar_anchor(view, anchor, -1)
+            st.rerun()
+    with col2:
+        if st.button("📍 今日", key="calendar_today", use_container_width=True):
+            st.session_state.calendar_anchor = calendar_today()
+            st.rerun()
+    with col3:
+        if st.button("次へ ▶️", key="calendar_next", use_container_width=True):
+            st.session_state.calendar_anchor = shift_calendar_anchor(view, anchor, 1)
+            st.rerun()
+
+    # 表示する期間のミーティングを取得（期間の区切りも日ごとの振り分けもカレンダーのタイムゾーンで）
+    start, end = get_calendar_range(view, anchor)
+    meetings = db.get_meetings_in_range(
+        user['id'],
+        db.to_epoch(datetime.combine(start, datetime.min.time()), CALENDAR_TIMEZONE),
+        db.to_epoch(datetime.combine(end, datetime.min.time()), CALENDAR_TIMEZONE)
+    )
+    by_day = group_meetings_by_day(meetings)
+    st.caption(f"🕘 時刻は {CALENDAR_TIMEZONE} の時刻で表示しています")
+
+    if view == 'month':
+        st.markdown(f"## {anchor.year}年{anchor.month}月")
+        show_calendar_month(anchor, start, end, by_day)
+    else:
+        st.markdown(f"## {start.strftime('%Y年%m月%d日')} 〜 {(end - timedelta(days=1)).strftime('%m月%d日')}")
+        show_calendar_week(start, by_day)
+
+    if not meetings:
+        st.info("📭 この期間のミーティングはありません")
+
+def show_calendar_month(anchor, start, end, by_day):
+    """月表示（1か月分のマス目）"""
+    today = calendar_today()
+    header = "".join(
+        f'<th style="padding: 8px; font-size: 18px; background-color: #e3f2fd;">{label}</th>'
+        for label in WEEKDAY_LABELS
+    )
+    rows = []
+    day = start
+    while day < end:
+        cells = []
+        for _ in range(7):
+            color = "#333" if day.month == anchor.month else "#aaa"
+            border = "3px solid #1976d2" if day == today else "1px solid #ddd"
+            items = "".join(
+                f'<div style="font-size: 15px; background-color: #fff3e0; border-radius: 6px; padding: 2px 4px; margin-top: 4px;">'
+                f'{"🔁 " if meeting["series_id"] else ""}{scheduled_dt.strftime("%H:%M")} {html.escape(meeting["title"])}</div>'
+                for scheduled_dt, meeting in by_day.get(day, [])
+            )
+            cells.append(
+                f'<td style="vertical-align: top; height: 90px; padding: 6px; border: {border}; color: {color};">'
+                f'<div style="font-size: 18px; font-weight: bold;">{day.day}</div>{items}</td>'
+            )
+            day += timedelta(days=1)
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+
+    st.markdown(f"""
+    <table style="width: 100%; table-layout: fixed; border-collapse: collapse;">
+        <tr>{header}</tr>
+        {''.join(rows)}
+    </table>
+    """, unsafe_allow_html=True)
+
+    # この月のミーティング（詳細ページへ移動するボタン）
+    month_days = sorted(day for day in by_day if day.month == anchor.month)
+    if month_days:
+        st.markdown("### 📋 この月のミーティング")
+    for day in month_days:
+        for scheduled_dt, meeting in by_day[day]:
+            label = f"{scheduled_dt.strftime('%m月%d日 %H:%M')}　{meeting['title']}（{meeting['group_name']}）"
+            if st.button(label, key=f"calendar_meeting_{meeting_key(meeting)}", use_container_width=True):
+                open_meeting(meeting)
+
+def show_calendar_week(start, by_day):
+    """週表示（曜日ごとの列）"""
+    today = calendar_today()
+    columns = st.columns(7)
+    for offset, col in enumerate(columns):
+        day = start + timedelta(days=offset)
+        with col:
+            title = f"{WEEKDAY_LABELS[offset]} {day.month}/{day.day}"
+            st.markdown(f"**{'📍 ' if day == today else ''}{title}**")
+            for scheduled_dt, meeting in by_day.get(day, []):
+                label = f"{scheduled_dt.strftime('%H:%M')} {meeting['title']}"
+                if st.button(label, key=f"calendar_meeting_{meeting_key(meeting)}", help=meeting['group_name'],
+                             use_container_width=True):
+                    open_meeting(meeting)
+
+def show_occurrence_detail(user, meeting):
+    """まだ記録のない繰り返しミーティングの回（記録を始めるとミーティングとして作成される）"""
+    scheduled_dt = db.get_meeting_datetime(meeting)
+
+    st.title(f"📹 {meeting['title']}")
+    st.markdown(f"**グループ:** {meeting['group_name']}")
+    st.markdown(f"**ホスト:** {meeting['host_name']}")
+    st.markdown(f"**日時:** {scheduled_dt.strftime('%Y年%m月%d日 %H:%M')}（🔁 繰り返し）")
+
+    if meeting.get('zoom_url'):
+        st.markdown("---")
+        show_zoom_join_button(meeting['zoom_url'], meeting.get('zoom_passcode'))
+
+    st.markdown("---")
+    st.info("📝 この回の議事録・学んだこと・AIへの質問は、「記録を始める」を押すと使えるようになります")
+
+    if st.button("✍️ この回の記録を始める", type="primary", use_container_width=True, key="start_occurrence"):
+        meeting_id = ensure_meeting_id(meeting)
+        if meeting_id:
+            st.session_state.selected_meeting = meeting_id
+            st.session_state.selected_occurrence = None
+            st.rerun()
+
+    if user['id'] == meeting['host_id']:
+        if st.button("🛑 この回以降の繰り返しを終了", use_container_width=True, key="end_series"):
+            success, message = db.end_meeting_series(meeting['series_id'], meeting['occurrence_ts'])
+            if success:
+                st.session_state.success_message = f"✅ 「{meeting['title']}」の繰り返しを終了しました"
+                st.session_state.success_type = "success"
+                st.session_state.selected_occurrence = None
+                st.session_state.page = 'calendar'
+                st.rerun()
+            else:
+                st.error(f"❌ {message}")
+
+    st.markdown("---")
+    if st.button("⬅️ カレンダーに戻る", use_container_width=True, key="back_to_calendar"):
+        st.session_state.selected_occurrence = None
+        st.session_state.page = 'calendar'
+        st.rerun()
+
 # ミーティング詳細・議事録ページ
 def show_meeting_detail_page():
     user = st.session_state.user
     meeting_id = st.session_state.get('selected_meeting')
 
+    # 繰り返しミーティングの回（まだ作成されていなければ予定だけを表示）
+    occurrence = st.session_state.get('selected_occurrence')
+    if not meeting_id and occurrence:
+        meeting = db.get_series_occurrence(*occurrence)
+        if meeting and meeting['id'] is None:
+            show_occurrence_detail(user, meeting)
+            return
+        meeting_id = meeting['id'] if meeting else None
+
     if not meeting_id:
         st.error("❌ ミーティングが選択されていません")
         return
@@ -1609,11 +2060,10 @@ def show_meeting_detail_page():
     st.markdown(f"**ホスト:** {meeting['host_name']}")
 
     if meeting['scheduled_at']:
-        from datetime import datetime
-        try:
-            scheduled_dt = datetime.fromisoformat(meeting['scheduled_at'])
+        scheduled_dt = db.get_meeting_datetime(meeting)
+        if scheduled_dt:
             st.markdown(f"**日時:** {scheduled_dt.strftime('%Y年%m月%d日 %H:%M')}")
-        except:
+        else:
             st.markdown(f"**日時:** {meeting['scheduled_at']}")
 
     # Zoom参加ボタン（大きく目立つように）
@@ -1634,8 +2084,8 @@ def show_meeting_detail_page():
 
     st.markdown("---")
 
-    # 参加者リスト
-    with st.expander("👥 参加者一覧"):
+    # 参加者リスト（開いたときだけ読み込む）
+    if st.toggle(f"👥 参加者一覧を表示（{meeting['participant_count']}名）", key="show_participants"):
         participants = db.get_meeting_participants(meeting_id)
         for participant in participants:
             role_text = "👑 ホスト" if participant['role'] == 'host' else "👤 参加者"
@@ -1697,8 +2147,8 @@ def show_meeting_detail_page():
             else:
                 st.warning("⚠️ Zoom URLが設定されていません")
 
-        # 参加者全員に招待メールを送信
-        with st.expander("📧 参加者全員に招待メールを送信"):
+        # 参加者全員に招待メールを送信（開いたときだけ参加者を読み込む）
+        if st.toggle("📧 参加者全員に招待メールを送信", key="show_invitation_sender"):
             st.markdown("グループのメンバー全員にミーティングの招待メールを送信できます。")
             
             # 参加者一覧を表示
@@ -1715,12 +2165,8 @@ def show_meeting_detail_page():
                 # 日時の整形
                 formatted_date = "日時未定"
                 if meeting.get('scheduled_at'):
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(meeting['scheduled_at'])
-                        formatted_date = dt.strftime('%Y年%m月%d日 %H:%M')
-                    except:
-                        formatted_date = meeting['scheduled_at']
+                    dt = db.get_meeting_datetime(meeting)
+                    formatted_date = dt.strftime('%Y年%m月%d日 %H:%M') if dt else meeting['scheduled_at']
                 
                 if st.button("📨 招待メールを送信", type="primary", key="send_invitation_btn"):
                     with st.spinner("📤 メールを送信中..."):
@@ -1753,21 +2199,36 @@ def show_meeting_detail_page():
     st.markdown("---")
 
     # 録音・議事録セクション
-    recording = db.get_recording_by_meeting(meeting_id)
-
-    tab1, tab2, tab3, tab4 = st.tabs(["📝 議事録", "🤖 AIに質問", "📚 学んだこと", "🎤 録音"])
-
-    with tab1:
-        show_minutes_tab(user, meeting, meeting_id, recording)
-
-    with tab2:
-        show_ai_chat_tab(user, meeting_id, recording)
+    # 選んだタブの内容だけを読み込んで表示する（選択中のタブはセッションに保持）
+    if st.session_state.get('meeting_detail_tab') not in MEETING_DETAIL_TABS:
+        st.session_state.meeting_detail_tab = 'minutes'
+
+    def select_tab(tab_name):
+        st.session_state.meeting_detail_tab = tab_name
+
+    tab_columns = st.columns(len(MEETING_DETAIL_TABS))
+    for column, (tab_name, tab_label) in zip(tab_columns, MEETING_DETAIL_TABS.items()):
+        with column:
+            st.button(
+                tab_label,
+                key=f"meeting_tab_{tab_name}",
+                type="primary" if st.session_state.meeting_detail_tab == tab_name else "secondary",
+                on_click=select_tab,
+                args=(tab_name,),
+                use_container_width=True
+            )
 
-    with tab3:
+    active_tab = st.session_state.meeting_detail_tab
+    if active_tab == 'learning_notes':
         show_learning_notes_tab(user, meeting_id)
-
-    with tab4:
-        show_recording_tab(user, meeting, meeting_id, recording)
+    else:
+        recording = db.get_recording_by_meeting(meeting_id)
+        if active_tab == 'minutes':
+            show_minutes_tab(user, meeting, meeting_id, recording)
+        elif active_tab == 'ai_chat':
+            show_ai_chat_tab(user, meeting_id, recording)
+        elif active_tab == 'recording':
+            show_recording_tab(user, meeting, meeting_id, recording)
 
     st.markdown("---")
 
@@ -1779,12 +2240,9 @@ def show_meeting_detail_page():
                 
                 # デフォルト日時を計算（1週間後、時刻は12:00固定）
                 from datetime import datetime, timedelta, time as dt_time
-                if meeting['scheduled_at']:
-                    try:
-                        original_dt = datetime.fromisoformat(meeting['scheduled_at'])
-                        default_date = (original_dt + timedelta(days=7)).date()
-                    except:
-                        default_date = (datetime.now() + timedelta(days=7)).date()
+                original_dt = db.get_meeting_datetime(meeting)
+                if original_dt:
+                    default_date = (original_dt + timedelta(days=7)).date()
                 else:
                     default_date = (datetime.now() + timedelta(days=7)).date()
                 
@@ -1866,6 +2324,7 @@ def show_meeting_detail_page():
 
     if st.button("← ミーティング一覧に戻る", use_container_width=True):
         st.session_state.page = 'meetings'
+        st.session_state.pop('meeting_list', None)  # 一覧を読み込み直す
         st.rerun()
 
 
@@ -1895,13 +2354,16 @@ def show_minutes_tab(user, meeting, meeting_id, recording):
 
         if st.button("✨ 議事録を自動生成する", type="primary", use_container_width=True, key="generate_minutes_btn"):
             with st.spinner("🤖 AIが議事録を生成中です。少々お待ちください..."):
-                success, message, formatted_minutes = db.generate_minutes_with_gpt4o(recording['transcript'])
+                success, message, formatted_minutes = db.generate_minutes_with_gpt4o(recording['transcript'], meeting_id)
 
                 if success:
                     # 生成された議事録を保存
                     save_success, save_message = db.save_formatted_minutes(meeting_id, formatted_minutes)
 
                     if save_success:
+                        # よくある質問への回答をバックグラウンドで用意しておく（失敗してもチャットで都度回答する）
+                        db.start_precompute_standard_answers(meeting_id)
+
                         st.success("✅ 議事録の生成が完了しました！")
                         st.balloons()
                         st.rerun()
@@ -2092,8 +2554,9 @@ def show_email_setup_guide():
         """)
 
 
+@fragment
 def show_ai_chat_tab(user, meeting_id, recording):
-    """AIチャットタブの内容"""
+    """AIチャットタブの内容（操作したときはこのタブだけを再実行する）"""
     # 高齢者向けのタイトルとスタイル
     st.markdown("""
     <div style="
@@ -2137,8 +2600,52 @@ def show_ai_chat_tab(user, meeting_id, recording):
 
     st.markdown("---")
 
-    # チャット履歴を表示
-    chat_history = db.get_chat_history(meeting_id)
+    # 自分の会話スレッドを選ぶ（他の参加者の会話とは分かれています）
+    threads = db.get_chat_threads(meeting_id, user['id'])
+    thread_ids = [t['id'] for t in threads]
+    thread_key = f"chat_thread_{meeting_id}"
+    if st.session_state.get(thread_key) not in thread_ids:
+        st.session_state[thread_key] = thread_ids[0] if thread_ids else None
+
+    def start_new_thread():
+        success, message, new_thread_id = db.create_chat_thread(meeting_id, user['id'])
+        if success:
+            st.session_state[thread_key] = new_thread_id
+
+    col_thread, col_new = st.columns([3, 1])
+    with col_thread:
+        if len(threads) > 1:
+            thread_labels = {t['id']: t['title'] or f"{t['created_at'][:16]} からの会話" for t in threads}
+            st.selectbox(
+                "会話を選ぶ",
+                options=thread_ids,
+                format_func=lambda x: thread_labels[x],
+                key=thread_key
+            )
+    with col_new:
+        if thread_ids:
+            st.button("🆕 新しい会話", key="new_chat_thread", on_click=start_new_thread, use_container_width=True)
+
+    thread_id = st.session_state[thread_key]
+
+    # チャット履歴を表示（新しい会話から順に読み込み、「以前の会話」で遡る）
+    # 読み込み済みの行は保持しておき、再実行のたびには新しく増えたメッセージだけを取得する
+    history_key = f"chat_history_{thread_id}"
+    chat_history = []
+    cursor = None
+    if thread_id is not None:
+        loaded = st.session_state.get(history_key)
+        if not loaded or not loaded['rows']:
+            page, cursor = db.get_chat_history_page(meeting_id, CHAT_PAGE_SIZE, thread_id=thread_id)
+            loaded = {'rows': page, 'cursor': cursor}
+        else:
+            newest = loaded['rows'][-1]
+            loaded['rows'] = loaded['rows'] + db.get_chat_history_since(
+                meeting_id, (newest['created_at'], newest['id']), thread_id=thread_id
+            )
+        st.session_state[history_key] = loaded
+        chat_history = loaded['rows']
+        cursor = loaded['cursor']
 
     if chat_history:
         # 履歴のヘッダーとクリアボタン
@@ -2147,13 +2654,20 @@ def show_ai_chat_tab(user, meeting_id, recording):
             st.markdown("### 💬 会話の履歴")
         with col_clear:
             if st.button("🗑️ 履歴をクリア", key="clear_chat"):
-                success, message = db.clear_chat_history(meeting_id)
+                success, message = db.clear_chat_history(meeting_id, thread_id)
                 if success:
+                    st.session_state.pop(history_key, None)
                     st.success("✅ チャット履歴をクリアしました")
-                    st.rerun()
+                    rerun_fragment()
                 else:
                     st.error(f"❌ {message}")
 
+        if cursor is not None:
+            if st.button("⬆️ 以前の会話を表示", key="load_older_chat", use_container_width=True):
+                page, cursor = db.get_chat_history_page(meeting_id, CHAT_PAGE_SIZE, cursor, thread_id=thread_id)
+                st.session_state[history_key] = {'rows': page + chat_history, 'cursor': cursor}
+                rerun_fragment()
+
         # チャット履歴を表示（高齢者向けに大きく見やすく）
         for msg in chat_history:
             if msg['is_ai']:
@@ -2213,26 +2727,45 @@ def show_ai_chat_tab(user, meeting_id, recording):
         label_visibility="collapsed"
     )
 
+    def ask_question(question, standard_question=False):
+        with st.spinner("🤖 AIが回答を作成中です。少々お待ちください..."):
+            current_thread_id = thread_id
+            if current_thread_id is None:
+                current_thread_id = db.get_or_create_chat_thread(meeting_id, user['id'])
+
+            # ユーザーのメッセージを保存
+            db.save_chat_message(meeting_id, user['id'], question, is_ai=False, thread_id=current_thread_id)
+
+            # AI応答を生成（表示中の履歴をそのまま文脈として渡す。よくある質問は用意しておいた回答を使う）
+            ai_response = db.generate_ai_response(
+                meeting_id, question, chat_history, thread_id=current_thread_id, standard_question=standard_question
+            )
+
+            # AI応答を保存
+            db.save_chat_message(meeting_id, user['id'], ai_response, is_ai=True, thread_id=current_thread_id)
+
+            # 会話が長くなったら古い部分を要約にまとめる
+            db.summarize_chat_thread_if_needed(current_thread_id)
+
+            st.success("✅ 回答が届きました！")
+            rerun_fragment()
+
     # 質問送信ボタン（大きく目立つように）
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         if st.button("💬 質問する", type="primary", key="send_question", use_container_width=True):
             if user_question:
-                with st.spinner("🤖 AIが回答を作成中です。少々お待ちください..."):
-                    # ユーザーのメッセージを保存
-                    db.save_chat_message(meeting_id, user['id'], user_question, is_ai=False)
-
-                    # AI応答を生成
-                    ai_response = db.generate_ai_response(meeting_id, user_question)
-
-                    # AI応答を保存
-                    db.save_chat_message(meeting_id, user['id'], ai_response, is_ai=True)
-
-                    st.success("✅ 回答が届きました！")
-                    st.rerun()
+                ask_question(user_question)
             else:
                 st.warning("⚠️ 質問を入力してください")
 
+    # よくある質問（議事録の作成時に回答を用意してあるので、すぐに表示されます）
+    if recording and recording['summary']:
+        st.markdown("#### 👆 よくある質問（ボタンを押すだけで質問できます）")
+        for i, standard_question in enumerate(get_config().standard_questions):
+            if st.button(f"❓ {standard_question}", key=f"standard_question_{i}", use_container_width=True):
+                ask_question(standard_question, standard_question=True)
+
     # 補足情報（高齢者向け）
     st.markdown("---")
     st.markdown("""
@@ -2253,8 +2786,9 @@ def show_ai_chat_tab(user, meeting_id, recording):
     """, unsafe_allow_html=True)
 
 
+@fragment
 def show_learning_notes_tab(user, meeting_id):
-    """学びのメモタブの内容"""
+    """学びのメモタブの内容（保存したときはこのタブだけを再実行する）"""
     st.markdown("## 📚 学んだこと")
     st.markdown("""
     <div style="
@@ -2294,7 +2828,7 @@ def show_learning_notes_tab(user, meeting_id):
             if success:
                 st.success(f"✅ {message}")
                 st.balloons()
-                st.rerun()
+                rerun_fragment()
             else:
                 st.error(f"❌ {message}")
         else:
@@ -2476,21 +3010,49 @@ def show_sidebar():
 
         if st.button("📹 ミーティング", key="nav_meetings", use_container_width=True):
             st.session_state.page = 'meetings'
+            st.session_state.pop('meeting_list', None)  # 一覧を読み込み直す
+            st.rerun()
+
+        if st.button("📆 カレンダー", key="nav_calendar", use_container_width=True):
+            st.session_state.page = 'calendar'
             st.rerun()
 
         st.markdown("---")
 
         if st.button("🚪 ログアウト", key="logout", use_container_width=True):
-            st.session_state.user = None
+            end_session()
             st.session_state.page = 'dashboard'
             st.rerun()
 
+        # SQLの計測パネル（DB_QUERY_STATSが有効なときだけ表示、中身はページの表示後に書き込む）
+        if db.QUERY_STATS_ENABLED:
+            st.markdown("---")
+            if st.checkbox("🔍 SQLの計測を表示", key="show_query_stats"):
+                return st.container()
+    return None
+
+def show_query_stats(container):
+    """この再描画で発行されたSQLの数と時間を表示（開発・運用向け）"""
+    stats = db.get_query_stats()
+    with container:
+        st.markdown(f"**SQL {stats['queries']}件 / {stats['total_ms']:.1f} ms**")
+        st.caption(f"トリガーを含む実行文: {stats['statements']}件")
+        st.dataframe(
+            [{"関数": c["caller"], "回数": c["count"], "ms": round(c["ms"], 2)} for c in stats["by_caller"]],
+            hide_index=True,
+            use_container_width=True
+        )
+        if stats["slow"]:
+            with st.expander(f"🐢 遅いSQL（{db.SLOW_QUERY_MS:.0f} ms以上）: {len(stats['slow'])}件"):
+                for record in stats["slow"]:
+                    st.code(f"{record['ms']:.1f} ms  {record['caller']}\n{record['sql']}", language="sql")
+
 # メインアプリ
 def main():
     if st.session_state.user is None:
         show_auth_page()
     else:
-        show_sidebar()
+        query_stats_container = show_sidebar()
 
         if st.session_state.page == 'dashboard':
             show_dashboard()
@@ -2500,8 +3062,16 @@ def main():
             show_groups_page()
         elif st.session_state.page == 'meetings':
             show_meetings_page()
+        elif st.session_state.page == 'calendar':
+            show_calendar_page()
         elif st.session_state.page == 'meeting_detail':
             show_meeting_detail_page()
 
+        if query_stats_container is not None:
+            show_query_stats(query_stats_container)
+
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        page_run_active = False
@@ -0,0 +1,99 @@
+"""
+AIチャット・議事録生成のスループット測定（オフライン）
+fake_openai_server.py をこのプロセス内で起動し、一時的なデータベースに対して
+generate_ai_response と generate_minutes_with_gpt4o を並列に呼び出して時間を測ります。
+
+使い方（リポジトリのルートで実行）:
+    python benchmarks/bench_ai.py --requests 200 --concurrency 8 --latency 0.2
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db
+import fake_openai_server
+from config import reload_config
+
+
+def run(label, func, requests, concurrency):
+    """funcをrequests回、concurrency並列で呼び出して結果をまとめる"""
+    latencies = []
+
+    def timed(i):
+        started = time.perf_counter()
+        func(i)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "pipeline": label,
+        "requests": requests,
+        "concurrency": concurrency,
+        "throughput_rps": round(requests / elapsed, 2),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[max(0, int(len(latencies) * 0.95) - 1)], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AIパイプラインのスループット測定（オフライン）")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="代替サーバーの応答遅延（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+
+    # Streamlitの外（ワーカースレッド）から設定を読むときの警告を抑える
+    # （Streamlitが設定を読み込むたびにログレベルを戻すため、フィルターで除外する）
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+
+    server = fake_openai_server.start_server(latency=args.latency, jitter=args.jitter)
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ["OPENAI_API_KEY"] = "fake-key"
+    reload_config()
+
+    workdir = tempfile.mkdtemp(prefix="bench_ai_")
+    try:
+        db.DB_FILE = os.path.join(workdir, "bench.db")
+        db.init_database()
+        db.create_user("ベンチ", "bench@example.com", "password", "host")
+        host = db.get_user_by_email("bench@example.com")
+        _, _, group_id = db.create_group("ベンチ用グループ", "", host['id'])
+        _, _, meeting_id = db.create_meeting("ベンチ用ミーティング", "", group_id, host['id'], "2026-01-01T10:00:00")
+        transcript = "本日はAIの使い方について学びます。" * 200
+        db.save_recording(meeting_id, None, transcript, host['id'])
+
+        results = [
+            # 毎回違う質問にして、回答キャッシュに当たらないようにする
+            run("chat", lambda i: db.generate_ai_response(meeting_id, f"質問{i}について教えて", []),
+                args.requests, args.concurrency),
+            run("chat_cached", lambda i: db.generate_ai_response(meeting_id, "質問0について教えて", []),
+                args.requests, args.concurrency),
+            run("minutes", lambda i: db.generate_minutes_with_gpt4o(transcript, meeting_id),
+                args.requests, args.concurrency),
+        ]
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
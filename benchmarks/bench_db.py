@@ -0,0 +1,162 @@
+"""
+database.pyの主な処理のベンチマーク
+規模ごとに合成データ（seed_data.py）を作成し、読み込み・書き込みの関数を繰り返し呼び出して
+所要時間（平均・p50・p95）をJSONで出力します。コミット間でJSONを比べると性能の変化がわかります。
+
+使い方（リポジトリのルートで実行）:
+    python benchmarks/bench_db.py                          # 1k / 10k / 100k ユーザー
+    python benchmarks/bench_db.py --scales 1000 --repeat 200 --output bench_1k.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db
+from benchmarks import seed_data
+
+
+def measure(func: Callable[[int], object], repeat: int) -> Dict:
+    """func(i)をrepeat回呼び出し、1回あたりの時間（ミリ秒）を集計"""
+    timings: List[float] = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        func(i)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "calls": repeat,
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[max(0, int(len(timings) * 0.95) - 1)], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+
+
+def read_benchmarks(sample: Dict, rng: random.Random) -> Dict[str, Callable[[int], object]]:
+    """読み込み系の関数（引数はサンプルから毎回選ぶ）"""
+    participants = sample["participant_ids"]
+    hosts = sample["host_ids"]
+    groups = sample["group_ids"]
+    chat_meetings = sample["chat_meeting_ids"] or sample["recorded_meeting_ids"]
+    password = sample["password"]
+
+    def participant_email(i):
+        # seed_dataではユーザーIDの順にuser0, user1, ...と作成している
+        return f"user{participants[i % len(participants)] - hosts[0]}@example.com"
+
+    return {
+        "get_meetings_by_user": lambda i: db.get_meetings_by_user(rng.choice(participants)),
+        "get_meetings_page_by_user": lambda i: db.get_meetings_page_by_user(rng.choice(participants), 10),
+        "get_upcoming_meetings": lambda i: db.get_upcoming_meetings(rng.choice(participants)),
+        "get_group_progress": lambda i: db.get_group_progress(rng.choice(groups)),
+        "get_chat_history": lambda i: db.get_chat_history(rng.choice(chat_meetings)),
+        "get_chat_history_page": lambda i: db.get_chat_history_page(rng.choice(chat_meetings), 20),
+        "authenticate_user": lambda i: db.authenticate_user(participant_email(i), password),
+        "load_user_checklist": lambda i: db.load_user_checklist(rng.choice(participants)),
+    }
+
+
+def write_benchmarks(sample: Dict, rng: random.Random, scale: int) -> Dict[str, Callable[[int], object]]:
+    """書き込み系の関数"""
+    participants = sample["participant_ids"]
+    hosts = sample["host_ids"]
+    groups = sample["group_ids"]
+    chat_meetings = sample["chat_meeting_ids"] or sample["recorded_meeting_ids"]
+    item_ids = seed_data.load_checklist_item_ids()
+    future = (datetime.now() + timedelta(days=14)).replace(minute=0, second=0, microsecond=0).isoformat()
+
+    def create_meeting(i):
+        group_id = rng.choice(groups)
+        host_id = db.get_group_by_id(group_id)["host_id"]
+        db.create_meeting("ベンチ用ミーティング", "", group_id, host_id, future)
+
+    return {
+        "create_user": lambda i: db.create_user(f"新規{i}", f"new{scale}_{i}@example.com", "password", "participant"),
+        "create_meeting": create_meeting,
+        "save_checklist_item": lambda i: db.save_checklist_item(
+            rng.choice(participants), rng.choice(item_ids), rng.random() < 0.5
+        ),
+        "save_chat_message": lambda i: db.save_chat_message(
+            rng.choice(chat_meetings), rng.choice(participants), "ベンチマークの質問です", is_ai=False
+        ),
+        "save_learning_note": lambda i: db.save_learning_note(
+            rng.choice(chat_meetings), rng.choice(participants), "今日はAIへの質問のしかたを学びました。"
+        ),
+        "invite_to_group": lambda i: db.invite_to_group(rng.choice(groups), f"bench{i}@example.com", hosts[0]),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="database.pyのベンチマーク（結果はJSON）")
+    parser.add_argument("--scales", default="1000,10000,100000", help="ユーザー数（カンマ区切り）")
+    parser.add_argument("--repeat", type=int, default=100, help="1つの関数を呼び出す回数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="結果を書き出すJSONファイル（省略時は標準出力）")
+    parser.add_argument("--keep-db", help="作成したデータベースを残すディレクトリ")
+    args = parser.parse_args()
+
+    result = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "repeat": args.repeat,
+        "scales": [],
+    }
+
+    for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+        workdir = tempfile.mkdtemp(prefix="bench_db_")
+        db_path = os.path.join(workdir, f"bench_{scale}.db")
+        try:
+            seeded = seed_data.seed(db_path, scale, args.seed)
+            sample = seeded.pop("sample")
+            rng = random.Random(args.seed)
+
+            scale_result = {"users": scale, "data": seeded, "read": {}, "write": {}}
+            for name, func in read_benchmarks(sample, rng).items():
+                scale_result["read"][name] = measure(func, args.repeat)
+            for name, func in write_benchmarks(sample, rng, scale).items():
+                scale_result["write"][name] = measure(func, args.repeat)
+            result["scales"].append(scale_result)
+            print(f"users={scale}: done", file=sys.stderr)
+
+            if args.keep_db:
+                os.makedirs(args.keep_db, exist_ok=True)
+                shutil.copy(db_path, args.keep_db)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
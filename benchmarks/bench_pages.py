@@ -0,0 +1,229 @@
+"""
+画面表示のベンチマーク（Streamlit AppTestでブラウザなしに実行）
+合成データ（seed_data.py）を入れたデータベースに、参加者・ホストとしてログインした状態で
+各ページのスクリプト実行（1回の再描画）にかかる時間と、その間に発行されたSQLの数を
+database.pyのSQL計測（configure_query_stats）で測ります。
+SQLの数が増えていれば、N+1クエリなどの劣化がひと目でわかります。
+チェックリストの操作やチャットの送信はフラグメント（@st.fragment）だけが再実行されるため、
+ページ全体の再描画とフラグメント単体の再実行を並べて比べます（interactions）。
+
+使い方（リポジトリのルートで実行）:
+    python benchmarks/bench_pages.py --users 1000 --runs 5 --output pages.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+import database as db
+from benchmarks import seed_data
+from benchmarks.bench_db import git_commit
+
+# app.pyのページ（session_state.pageの値。「/」の後はミーティング詳細のタブ）
+APP_PAGES = [
+    "dashboard", "checklist", "groups", "meetings", "calendar",
+    "meeting_detail/minutes", "meeting_detail/ai_chat", "meeting_detail/learning_notes", "meeting_detail/recording",
+]
+
+# app.py全体を実行するスクリプト
+APP_SCRIPT = f"""
+import runpy
+import streamlit as st
+import database as db
+runpy.run_path({os.path.join(ROOT, "app.py")!r}, run_name="__main__")
+st.session_state["_bench_query_stats"] = db.get_query_stats()
+"""
+
+# ページの一部だけを表示するスクリプト（関数単位で測る。フラグメントの再実行に相当）
+COMPONENT_SCRIPTS = {
+    "checklist_items": """
+import streamlit as st
+import app
+import database as db
+db.reset_query_stats()
+app.show_checklist_items(st.session_state.user)
+st.session_state["_bench_query_stats"] = db.get_query_stats()
+""",
+    "meetings_list": """
+import streamlit as st
+import app
+import database as db
+db.reset_query_stats()
+app.show_meetings_list(st.session_state.user)
+st.session_state["_bench_query_stats"] = db.get_query_stats()
+""",
+    "ai_chat_tab": """
+import streamlit as st
+import app
+import database as db
+db.reset_query_stats()
+meeting_id = st.session_state.selected_meeting
+app.show_ai_chat_tab(st.session_state.user, meeting_id, db.get_recording_by_meeting(meeting_id))
+st.session_state["_bench_query_stats"] = db.get_query_stats()
+""",
+    "learning_notes_tab": """
+import streamlit as st
+import app
+import database as db
+db.reset_query_stats()
+app.show_learning_notes_tab(st.session_state.user, st.session_state.selected_meeting)
+st.session_state["_bench_query_stats"] = db.get_query_stats()
+""",
+}
+
+# 画面の操作ごとの、ページ全体の再描画とフラグメントだけの再実行の組み合わせ
+# （AppTestはフラグメントだけの再実行を起こせないため、フラグメントの関数を単体で実行して測る）
+INTERACTIONS = {
+    "checklist_check": ("checklist", "checklist_items"),
+    "chat_send": ("meeting_detail/ai_chat", "ai_chat_tab"),
+    "learning_note_save": ("meeting_detail/learning_notes", "learning_notes_tab"),
+}
+
+
+def pick_users(db_path: str) -> List[Dict]:
+    """チャットのあるミーティングの参加者と、そのホストを選ぶ"""
+    conn = sqlite3.connect(db_path)
+    row = conn.execute("""
+        SELECT t.user_id, t.meeting_id, m.host_id
+        FROM chat_threads t JOIN meetings m ON m.id = t.meeting_id
+        ORDER BY t.id LIMIT 1
+    """).fetchone()
+    conn.close()
+    if row is None:
+        raise RuntimeError("チャットのあるミーティングがありません（--usersを増やしてください）")
+    participant_id, meeting_id, host_id = row
+    return [
+        {"role": "participant", "user": db.get_user_by_id(participant_id), "meeting_id": meeting_id},
+        {"role": "host", "user": db.get_user_by_id(host_id), "meeting_id": meeting_id},
+    ]
+
+
+def render(target: str, login: Dict) -> Dict:
+    """1回分の再描画を実行して、時間とSQLの数を返す"""
+    if target in COMPONENT_SCRIPTS:
+        at = AppTest.from_string(COMPONENT_SCRIPTS[target], default_timeout=60)
+    else:
+        at = AppTest.from_string(APP_SCRIPT, default_timeout=60)
+        page, _, tab = target.partition("/")
+        at.session_state.page = page
+        if tab:
+            at.session_state.meeting_detail_tab = tab
+    at.session_state.user = login["user"]
+    at.session_state.selected_meeting = login["meeting_id"]
+    # app.pyがimport時に初期化する値（2回目以降のimportでは実行されないため）
+    at.session_state.success_message = None
+    at.session_state.success_type = None
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    at.run()
+    cpu = (time.process_time() - cpu_started) * 1000
+    elapsed = (time.perf_counter() - started) * 1000
+
+    stats = at.session_state["_bench_query_stats"] if "_bench_query_stats" in at.session_state else None
+    return {
+        "ms": elapsed,
+        "cpu_ms": cpu,
+        "queries": stats["queries"] if stats else None,
+        "query_ms": stats["total_ms"] if stats else None,
+        "top_callers": stats["by_caller"][:5] if stats else [],
+        "errors": [str(e.value) for e in at.exception],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="画面表示のベンチマーク（結果はJSON）")
+    parser.add_argument("--users", type=int, default=1000, help="合成データのユーザー数")
+    parser.add_argument("--runs", type=int, default=5, help="1ページあたりの計測回数（別に1回ウォームアップ）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="結果を書き出すJSONファイル（省略時は標準出力）")
+    args = parser.parse_args()
+
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+
+    result = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "users": args.users,
+        "runs": args.runs,
+        "pages": [],
+        "interactions": [],
+    }
+
+    workdir = tempfile.mkdtemp(prefix="bench_pages_")
+    cwd = os.getcwd()
+    try:
+        db_path = os.path.join(workdir, "bench.db")
+        result["data"] = {k: v for k, v in seed_data.seed(db_path, args.users, args.seed).items() if k != "sample"}
+        # 録音ファイルなどの相対パスが作業ディレクトリを汚さないように移動しておく
+        os.chdir(workdir)
+        db.configure_query_stats(True)
+
+        for login in pick_users(db_path):
+            for target in APP_PAGES + list(COMPONENT_SCRIPTS):
+                render(target, login)  # ウォームアップ（importやキャッシュの作成）
+                runs = [render(target, login) for _ in range(args.runs)]
+                timings = sorted(r["ms"] for r in runs)
+                result["pages"].append({
+                    "page": target,
+                    "role": login["role"],
+                    "mean_ms": round(statistics.fmean(timings), 1),
+                    "p50_ms": round(timings[len(timings) // 2], 1),
+                    "p95_ms": round(timings[max(0, int(len(timings) * 0.95) - 1)], 1),
+                    "cpu_ms": round(statistics.fmean(r["cpu_ms"] for r in runs), 1),
+                    "queries": runs[-1]["queries"],
+                    "query_ms": round(statistics.fmean(r["query_ms"] or 0 for r in runs), 1),
+                    "top_callers": [
+                        {"caller": c["caller"], "count": c["count"], "ms": round(c["ms"], 2)}
+                        for c in runs[-1]["top_callers"]
+                    ],
+                    "errors": sorted({e for r in runs for e in r["errors"]}),
+                })
+                print(f"{login['role']} {target}: done", file=sys.stderr)
+
+        pages = {(p["role"], p["page"]): p for p in result["pages"]}
+        for login in pick_users(db_path):
+            for name, (page, fragment) in INTERACTIONS.items():
+                full, part = pages[(login["role"], page)], pages[(login["role"], fragment)]
+                result["interactions"].append({
+                    "interaction": name,
+                    "role": login["role"],
+                    "full_rerun_ms": full["mean_ms"],
+                    "fragment_ms": part["mean_ms"],
+                    "full_rerun_queries": full["queries"],
+                    "fragment_queries": part["queries"],
+                })
+    finally:
+        db.configure_query_stats(False)
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+ログイン（パスワード照合）のベンチマーク
+scryptのコスト（n・r）ごとに authenticate_user の所要時間を測り、
+1コアあたり1秒間に処理できるログイン数と使用メモリの目安を出します。
+サーバーの性能に合わせて PASSWORD_SCRYPT_N / PASSWORD_SCRYPT_R を決めるときに使います。
+
+使い方（リポジトリのルートで実行）:
+    python benchmarks/bench_passwords.py --repeat 20
+    python benchmarks/bench_passwords.py --costs 16384:8,32768:8,65536:8 --output passwords.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db
+import passwords
+from benchmarks.bench_db import git_commit, measure
+
+DEFAULT_COSTS = "4096:8,8192:8,16384:8,32768:8,65536:8"
+PASSWORD = "benchmark-password"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ログインのベンチマーク（結果はJSON）")
+    parser.add_argument("--costs", default=DEFAULT_COSTS, help="scryptのコスト n:r（カンマ区切り）")
+    parser.add_argument("--repeat", type=int, default=20, help="1つのコストあたりのログイン回数")
+    parser.add_argument("--output", help="結果を書き出すJSONファイル（省略時は標準出力）")
+    args = parser.parse_args()
+
+    result = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "costs": [],
+    }
+
+    workdir = tempfile.mkdtemp(prefix="bench_passwords_")
+    try:
+        db.DB_FILE = os.path.join(workdir, "bench.db")
+        db.init_database()
+
+        # 旧形式（SHA-256）との比較。最初のログインでscryptに作り直されるため、毎回旧形式に戻して測る
+        db.create_user("旧形式", "legacy@example.com", PASSWORD, "participant")
+        legacy_hash = passwords.LegacySHA256Hasher().hash(PASSWORD)
+
+        def legacy_login(i):
+            conn = sqlite3.connect(db.DB_FILE)
+            conn.execute("UPDATE users SET password_hash = ? WHERE email = 'legacy@example.com'", (legacy_hash,))
+            conn.commit()
+            conn.close()
+            db.authenticate_user("legacy@example.com", PASSWORD)
+
+        result["legacy_sha256_with_rehash"] = measure(legacy_login, args.repeat)
+
+        for cost in [c for c in args.costs.split(",") if c.strip()]:
+            n, r = (int(v) for v in cost.split(":"))
+            passwords.set_hasher(passwords.ScryptHasher(n=n, r=r))
+            email = f"scrypt_{n}_{r}@example.com"
+            db.create_user("ベンチ", email, PASSWORD, "participant")
+
+            login = measure(lambda i: db.authenticate_user(email, PASSWORD), args.repeat)
+            wrong = measure(lambda i: db.authenticate_user(email, "wrong-password"), args.repeat)
+            unknown = measure(lambda i: db.authenticate_user("nobody@example.com", PASSWORD), args.repeat)
+            result["costs"].append({
+                "n": n,
+                "r": r,
+                "memory_mb": round(128 * n * r / 2 ** 20, 1),
+                "login": login,
+                "wrong_password": wrong,
+                "unknown_email": unknown,
+                "logins_per_second_per_core": round(1000 / login["mean_ms"], 1),
+            })
+            print(f"n={n} r={r}: done", file=sys.stderr)
+    finally:
+        passwords.set_hasher(None)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
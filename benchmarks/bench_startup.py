@@ -0,0 +1,147 @@
+"""
+起動時間のベンチマーク
+新しいPythonプロセスで database.py の import にかかる時間（python -X importtime）と、
+プロセスの起動から最初のページ（チェックリスト）の表示が終わるまでの時間を測ります。
+openai・smtplibなどの重いモジュールが起動時に読み込まれていないかも確認できます。
+
+使い方（リポジトリのルートで実行）:
+    python benchmarks/bench_startup.py --runs 5 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_db import git_commit
+
+# 起動時に読み込まれていないことを確認するモジュール
+HEAVY_MODULES = ["openai", "httpx", "pydantic", "smtplib", "email.mime.multipart", "ai_service", "mail_service"]
+
+# 最初のページを表示するスクリプト（新しいプロセスで実行し、結果をJSONで出力）
+FIRST_PAGE_SCRIPT = """
+import json, logging, os, sys, tempfile, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+    lambda record: "missing ScriptRunContext" not in record.getMessage()
+)
+from streamlit.testing.v1 import AppTest
+import database as db
+workdir = tempfile.mkdtemp(prefix="bench_startup_")
+os.chdir(workdir)
+db.DB_FILE = os.path.join(workdir, "bench.db")
+db.init_database()
+db.create_user("ベンチ", "bench@example.com", "password", "participant")
+imported = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=60)
+at.session_state.user = db.get_user_by_email("bench@example.com")
+at.session_state.page = {page!r}
+at.run()
+finished = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "render_ms": (finished - imported) * 1000,
+    "errors": [str(e.value) for e in at.exception],
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def import_time(module: str) -> Dict:
+    """python -X importtime の出力から、moduleのimportにかかった時間（累計）と読み込まれたモジュールを取り出す"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=ROOT, check=True
+    )
+    cumulative_us = None
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if not parts[1].isdigit():
+            continue  # 見出し行
+        name = parts[2]
+        loaded.add(name.strip())
+        if name == module:
+            cumulative_us = int(parts[1])
+    return {
+        "ms": cumulative_us / 1000 if cumulative_us is not None else None,
+        "loaded": [name for name in HEAVY_MODULES if name in loaded],
+    }
+
+
+def first_page(page: str) -> Dict:
+    """新しいプロセスで最初のページを表示し、プロセス起動からの時間を測る"""
+    script = FIRST_PAGE_SCRIPT.format(
+        root=ROOT, app=os.path.join(ROOT, "app.py"), page=page, heavy=HEAVY_MODULES
+    )
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=ROOT, check=True)
+    total_ms = (time.perf_counter() - started) * 1000
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    measured["total_ms"] = total_ms
+    return measured
+
+
+def summarize(values: List[float]) -> Dict:
+    values = sorted(values)
+    return {
+        "mean_ms": round(statistics.fmean(values), 1),
+        "p50_ms": round(values[len(values) // 2], 1),
+        "min_ms": round(values[0], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="起動時間のベンチマーク（結果はJSON）")
+    parser.add_argument("--runs", type=int, default=5, help="計測回数（毎回新しいプロセスで実行）")
+    parser.add_argument("--page", default="checklist", help="最初に表示するページ")
+    parser.add_argument("--output", help="結果を書き出すJSONファイル（省略時は標準出力）")
+    args = parser.parse_args()
+
+    result = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "runs": args.runs,
+    }
+
+    imports = [import_time("database") for _ in range(args.runs)]
+    result["import_database"] = {
+        **summarize([r["ms"] for r in imports]),
+        "heavy_modules_loaded": imports[-1]["loaded"],
+    }
+    print("import database: done", file=sys.stderr)
+
+    pages = [first_page(args.page) for _ in range(args.runs)]
+    result["first_page"] = {
+        "page": args.page,
+        "total": summarize([r["total_ms"] for r in pages]),
+        "import": summarize([r["import_ms"] for r in pages]),
+        "render": summarize([r["render_ms"] for r in pages]),
+        "heavy_modules_loaded": pages[-1]["loaded"],
+        "errors": sorted({e for r in pages for e in r["errors"]}),
+    }
+    print(f"first page ({args.page}): done", file=sys.stderr)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+ベンチマーク用の合成データ生成
+ユーザー数を基準に、グループ・ミーティング・参加者・チェックリスト・チャット・議事録を
+実際の利用に近い比率で作成します。
+
+使い方（リポジトリのルートで実行）:
+    python benchmarks/seed_data.py bench.db --users 10000
+"""
+
+import argparse
+import ast
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db
+
+# 合成データの比率
+MEMBERS_PER_GROUP = 10          # 1グループあたりの参加者数（ホストは別）
+MEETINGS_PER_GROUP = 8          # 1グループあたりのミーティング数（過去60日〜今後30日）
+CHAT_MEETING_RATIO = 0.2        # チャットのあるミーティングの割合
+CHAT_MESSAGES_PER_THREAD = 10   # 1つの会話スレッドのメッセージ数
+PENDING_INVITATION_RATIO = 0.05 # 未回答の招待があるユーザーの割合
+TRANSCRIPT_LENGTH = 4000        # 文字起こしの長さ（文字数、1時間の学習会の要点程度）
+
+SEED_PASSWORD = "password"
+
+SENTENCES = [
+    "今日はスマートフォンでAIに質問する方法を練習しました。",
+    "まず画面の下にある入力欄を押して、聞きたいことを文章で書きます。",
+    "わからない言葉があれば、そのままAIに意味を聞いてみましょう。",
+    "AIの答えは間違っていることもあるので、大事なことは確認が必要です。",
+    "参加者の方から、孫とのやりとりに使いたいというお話がありました。",
+    "写真の説明をAIに頼むと、とても詳しく教えてくれました。",
+    "次回までに、家で一つ質問してみることを宿題にしました。",
+    "文字を大きくする設定も、あわせて確認しました。",
+    "個人情報は入力しないように気をつけましょう。",
+    "献立の相談や旅行の計画にも使えることがわかりました。",
+    "声で入力する方法も便利だという感想が多くありました。",
+    "最後に、今日学んだことを一人ずつ発表しました。",
+]
+
+CHAT_QUESTIONS = [
+    "この会議の重要なポイントは？",
+    "次回までにやるべきことは？",
+    "今日学んだことを簡単にまとめて",
+    "AIに写真のことを聞くにはどうすればいいですか？",
+    "個人情報とは具体的に何のことですか？",
+]
+
+
+def load_checklist_item_ids() -> List[str]:
+    """app.pyのCHECKLIST_CATEGORIESからチェック項目のIDを取り出す（Streamlitをimportせずに読む）"""
+    app_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+    with open(app_path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "CHECKLIST_CATEGORIES" for target in node.targets
+        ):
+            categories = ast.literal_eval(node.value)
+            return [f"{category}_{item}" for category, items in categories.items() for item in items]
+    return []
+
+
+def japanese_text(rng: random.Random, length: int) -> str:
+    """おおよそlength文字の日本語の文章を作る"""
+    parts = []
+    total = 0
+    while total < length:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        total += len(sentence)
+    return "".join(parts)
+
+
+def seed(db_path: str, users: int, seed: int = 0, recording_ratio: float = 0.1) -> Dict:
+    """
+    合成データを作成
+
+    Args:
+        db_path: データベースファイル（なければ作成）
+        users: ユーザー数（ホストを含む）
+        seed: 乱数のシード（同じ値なら同じデータになる）
+        recording_ratio: 過去のミーティングのうち議事録があるものの割合
+
+    Returns:
+        作成した件数と、ベンチマークで使うサンプル（ユーザーID・メールアドレスなど）
+    """
+    rng = random.Random(seed)
+    db.DB_FILE = db_path
+    db.init_database()
+    db.init_reminder_table()
+
+    now = datetime.now()
+    password_hash = db.hash_password(SEED_PASSWORD)
+    checklist_item_ids = load_checklist_item_ids()
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA synchronous = OFF")
+    started = time.perf_counter()
+
+    # ユーザー（11人に1人がホスト）
+    group_count = max(1, users // (MEMBERS_PER_GROUP + 1))
+    user_rows = []
+    for i in range(users):
+        role = "host" if i < group_count else "participant"
+        user_rows.append((f"ユーザー{i}", f"user{i}@example.com", password_hash, role))
+    cursor.executemany("INSERT INTO users (name, email, password_hash, role) VALUES (?, ?, ?, ?)", user_rows)
+    first_user_id = cursor.execute("SELECT MIN(id) FROM users WHERE email = 'user0@example.com'").fetchone()[0]
+    host_ids = list(range(first_user_id, first_user_id + group_count))
+    participant_ids = list(range(first_user_id + group_count, first_user_id + users))
+
+    # グループとメンバー（ミーティングより先に入れて、参加者数はトリガーに計算させる）
+    cursor.executemany(
+        "INSERT INTO groups (name, description, host_id) VALUES (?, ?, ?)",
+        [(f"AI学習会 {i}", "スマホでAIを使ってみる会", host_id) for i, host_id in enumerate(host_ids)]
+    )
+    first_group_id = cursor.execute("SELECT MAX(id) FROM groups").fetchone()[0] - group_count + 1
+    group_ids = list(range(first_group_id, first_group_id + group_count))
+    member_rows = [
+        (group_ids[i % group_count], user_id) for i, user_id in enumerate(participant_ids)
+    ]
+    cursor.executemany("INSERT INTO group_members (group_id, user_id) VALUES (?, ?)", member_rows)
+
+    # ミーティング（過去60日〜今後30日に散らばる）
+    meeting_rows = []
+    for group_id, host_id in zip(group_ids, host_ids):
+        for _ in range(MEETINGS_PER_GROUP):
+            scheduled = now + timedelta(days=rng.randint(-60, 30), hours=rng.randint(9, 17) - now.hour)
+            scheduled = scheduled.replace(minute=0, second=0, microsecond=0)
+            meeting_rows.append((
+                "AI学習会", "スマホでAIに質問してみましょう", group_id, host_id,
+                scheduled.isoformat(), db.to_epoch(scheduled), "https://zoom.us/j/123456789"
+            ))
+    cursor.executemany("""
+        INSERT INTO meetings (title, description, group_id, host_id, scheduled_at, scheduled_ts, zoom_url)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, meeting_rows)
+    meetings = cursor.execute(
+        "SELECT id, group_id, host_id, scheduled_at FROM meetings WHERE group_id >= ?", (first_group_id,)
+    ).fetchall()
+    members_by_group: Dict[int, List[int]] = {}
+    for group_id, user_id in member_rows:
+        members_by_group.setdefault(group_id, []).append(user_id)
+
+    # チェックリスト（参加者ごとに一部の項目を記録）
+    checklist_rows = []
+    for user_id in participant_ids:
+        for item_id in rng.sample(checklist_item_ids, k=rng.randint(0, len(checklist_item_ids))):
+            checked = rng.random() < 0.7
+            checklist_rows.append((user_id, item_id, checked, now.isoformat() if checked else None))
+    cursor.executemany(
+        "INSERT INTO user_checklists (user_id, item_id, checked, checked_at) VALUES (?, ?, ?, ?)", checklist_rows
+    )
+
+    # 議事録（過去のミーティングの一部）
+    past_meetings = [m for m in meetings if m[3] < now.isoformat()]
+    recorded = rng.sample(past_meetings, k=int(len(past_meetings) * recording_ratio))
+    cursor.executemany("""
+        INSERT INTO recordings (meeting_id, transcript, summary, created_by)
+        VALUES (?, ?, ?, ?)
+    """, [
+        (meeting_id, japanese_text(rng, TRANSCRIPT_LENGTH), japanese_text(rng, TRANSCRIPT_LENGTH // 8), host_id)
+        for meeting_id, _, host_id, _ in recorded
+    ])
+
+    # AIチャット（議事録のあるミーティングの一部で、参加者ごとに1スレッド）
+    chat_count = 0
+    chat_meetings = rng.sample(recorded, k=min(len(recorded), int(len(meetings) * CHAT_MEETING_RATIO)))
+    for meeting_id, group_id, _, _ in chat_meetings:
+        for user_id in rng.sample(members_by_group.get(group_id, []), k=min(3, len(members_by_group.get(group_id, [])))):
+            cursor.execute("INSERT INTO chat_threads (meeting_id, user_id) VALUES (?, ?)", (meeting_id, user_id))
+            thread_id = cursor.lastrowid
+            messages = []
+            for turn in range(CHAT_MESSAGES_PER_THREAD):
+                if turn % 2 == 0:
+                    messages.append((meeting_id, user_id, rng.choice(CHAT_QUESTIONS), False, thread_id))
+                else:
+                    messages.append((meeting_id, user_id, japanese_text(rng, 300), True, thread_id))
+            cursor.executemany("""
+                INSERT INTO chat_history (meeting_id, user_id, message, is_ai, thread_id)
+                VALUES (?, ?, ?, ?, ?)
+            """, messages)
+            chat_count += len(messages)
+
+    # 学びのメモ（議事録のあるミーティングの参加者の一部）
+    note_rows = []
+    for meeting_id, group_id, _, _ in recorded:
+        for user_id in members_by_group.get(group_id, [])[:3]:
+            note_rows.append((meeting_id, user_id, japanese_text(rng, 100)))
+    cursor.executemany("INSERT INTO learning_notes (meeting_id, user_id, note) VALUES (?, ?, ?)", note_rows)
+
+    # 未回答の招待
+    invitation_rows = [
+        (rng.choice(group_ids), f"invitee{i}@example.com", rng.choice(host_ids))
+        for i in range(int(users * PENDING_INVITATION_RATIO))
+    ]
+    cursor.executemany(
+        "INSERT OR IGNORE INTO group_invitations (group_id, email, invited_by) VALUES (?, ?, ?)", invitation_rows
+    )
+
+    conn.commit()
+    cursor.execute("ANALYZE")
+    conn.close()
+
+    return {
+        "users": users,
+        "groups": group_count,
+        "meetings": len(meetings),
+        "checklist_rows": len(checklist_rows),
+        "recordings": len(recorded),
+        "chat_messages": chat_count,
+        "learning_notes": len(note_rows),
+        "seconds": round(time.perf_counter() - started, 2),
+        "sample": {
+            "host_ids": host_ids[:50],
+            "participant_ids": participant_ids[:: max(1, len(participant_ids) // 200)],
+            "group_ids": group_ids[:: max(1, len(group_ids) // 100)],
+            "chat_meeting_ids": [m[0] for m in chat_meetings[:100]],
+            "recorded_meeting_ids": [m[0] for m in recorded[:100]],
+            "password": SEED_PASSWORD,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ベンチマーク用の合成データを作成します")
+    parser.add_argument("db_path", help="作成するデータベースファイル")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--recording-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    result = seed(args.db_path, args.users, args.seed, args.recording_ratio)
+    result.pop("sample")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+リスト型攻撃（クレデンシャルスタッフィング）のシミュレーション
+一時的なデータベースに対して、少数の接続元から大量のメールアドレス・パスワードの組を試す攻撃と、
+多数の接続元から1つのアカウントを狙う攻撃、X-Forwarded-Forの先頭を毎回書き換えるリスト型攻撃を、
+時計を進めながら流します。
+同時に正規のユーザーがログインし続け、次のことを確認します（満たさなければ終了コード1）。
+  - 制限にかかった試行が、パスワードの照合（authenticate_user）まで届いていない
+  - X-Forwarded-Forを書き換えても、接続元ごとの制限から逃れられない
+  - 正規のユーザーはログインできる
+  - メモリに保持するバケットの数が上限を超えない
+  - RATE_LIMIT_DB を使うと、2つのプロセス（制限のインスタンス）で記録を共有できる
+
+使い方（リポジトリのルートで実行）:
+    python benchmarks/simulate_login_burst.py --attempts 3000 --clients 5
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db
+import passwords
+import rate_limit
+
+PASSWORD = "correct-password"
+
+
+class FakeClock:
+    """シミュレーション用の時計（実際には待たずに時間を進める）"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+def make_limiters(clock, max_keys, db_path=None):
+    return (
+        rate_limit.RateLimiter("login_email", rate_limit.EMAIL_BUCKET_CAPACITY, rate_limit.EMAIL_REFILL_PER_SECOND,
+                               max_keys=max_keys, db_path=db_path, clock=clock),
+        rate_limit.RateLimiter("login_client", rate_limit.CLIENT_BUCKET_CAPACITY, rate_limit.CLIENT_REFILL_PER_SECOND,
+                               max_keys=max_keys, db_path=db_path, clock=clock),
+    )
+
+
+def run_scenario(name, attempts, clock, limiter_sets, legit_email, rate_per_second, clients, seed):
+    """
+    attempts件の攻撃を、1秒あたりrate_per_second件の速さで流す
+    limiter_setsが複数あるときは、プロセスを順番に切り替えて試行する
+    """
+    rng = random.Random(seed)
+    counts = {"attempts": 0, "reached_auth": 0, "blocked": 0, "legit_ok": 0, "legit_total": 0}
+    original = db.authenticate_user
+
+    def counting_authenticate(email, password):
+        counts["reached_auth"] += 1
+        return original(email, password)
+
+    db.authenticate_user = counting_authenticate
+    started = time.perf_counter()
+    try:
+        for i in range(attempts):
+            if limiter_sets:
+                rate_limit.set_login_limiters(*limiter_sets[i % len(limiter_sets)])
+                login = rate_limit.authenticate_with_rate_limit
+            else:
+                login = lambda email, password, client: (db.authenticate_user(email, password), 0.0)
+
+            attack = make_attack(name, i, rng, clients)
+            user, retry_after = login(attack["email"], attack["password"], attack["client"])
+            counts["attempts"] += 1
+            if retry_after > 0:
+                counts["blocked"] += 1
+
+            # 正規のユーザーは10秒に1回ログインする
+            clock.advance(1 / rate_per_second)
+            if i % int(rate_per_second * 10) == 0:
+                counts["legit_total"] += 1
+                user, _ = login(legit_email, PASSWORD, "198.51.100.7")
+                counts["legit_ok"] += 1 if user else 0
+    finally:
+        db.authenticate_user = original
+        rate_limit.set_login_limiters(None)
+
+    counts["seconds"] = round(time.perf_counter() - started, 2)
+    return counts
+
+
+def make_attack(name, i, rng, clients):
+    if name == "stuffing":
+        # 少数の接続元から、たくさんのメールアドレスを1〜2回ずつ試す
+        return {
+            "email": f"user{rng.randrange(2000)}@example.com",
+            "password": f"leaked-{rng.randrange(10 ** 6)}",
+            "client": f"203.0.113.{rng.randrange(clients)}",
+        }
+    if name == "rotating_xff":
+        # 1つの接続元が、X-Forwarded-Forの先頭を毎回書き換えてリスト型攻撃をする
+        # （アプリの前のプロキシが、本当の接続元を末尾に追記する）
+        spoofed = ".".join(str(rng.randrange(256)) for _ in range(4))
+        return {
+            "email": f"user{rng.randrange(2000)}@example.com",
+            "password": f"leaked-{rng.randrange(10 ** 6)}",
+            "client": rate_limit.client_key_from_forwarded(f"{spoofed}, 203.0.113.9", trusted_hops=1),
+        }
+    # 多数の接続元から、1つのアカウントを狙う
+    return {
+        "email": "user0@example.com",
+        "password": f"guess-{i}",
+        "client": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ログイン回数制限のシミュレーション")
+    parser.add_argument("--attempts", type=int, default=2000, help="1つのシナリオの攻撃の試行数")
+    parser.add_argument("--clients", type=int, default=5, help="リスト型攻撃の接続元の数")
+    parser.add_argument("--rate", type=float, default=50.0, help="1秒あたりの試行数（シミュレーション上の時間）")
+    parser.add_argument("--max-keys", type=int, default=500, help="メモリに保持するバケットの上限")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # 照合のコストはシミュレーションの時間に関係しないため、軽くしておく
+    passwords.set_hasher(passwords.ScryptHasher(n=2 ** 10, r=8))
+    workdir = tempfile.mkdtemp(prefix="simulate_login_")
+    results = {}
+    failures = []
+    try:
+        db.DB_FILE = os.path.join(workdir, "app.db")
+        db.init_database()
+        for i in range(200):
+            db.create_user(f"ユーザー{i}", f"user{i}@example.com", PASSWORD, "participant")
+        db.create_user("正規ユーザー", "legit@example.com", PASSWORD, "participant")
+
+        for scenario in ("stuffing", "rotating_xff", "single_account"):
+            clock = FakeClock()
+            baseline = run_scenario(scenario, args.attempts, clock, [], "legit@example.com", args.rate, args.clients, args.seed)
+
+            clock = FakeClock()
+            limiters = make_limiters(clock, args.max_keys)
+            limited = run_scenario(scenario, args.attempts, clock, [limiters], "legit@example.com", args.rate, args.clients, args.seed)
+            limited["buckets"] = {"email": len(limiters[0]), "client": len(limiters[1])}
+
+            clock = FakeClock()
+            shared_db = os.path.join(workdir, f"rate_limit_{scenario}.db")
+            processes = [make_limiters(clock, args.max_keys, shared_db) for _ in range(2)]
+            shared = run_scenario(scenario, args.attempts, clock, processes, "legit@example.com", args.rate, args.clients, args.seed)
+
+            results[scenario] = {"no_limit": baseline, "in_memory": limited, "shared_sqlite_2_processes": shared}
+
+            attack_seconds = args.attempts / args.rate
+            for label, counts in (("in_memory", limited), ("shared_sqlite_2_processes", shared)):
+                legit_attempts = counts["legit_total"]
+                attack_reached = counts["reached_auth"] - legit_attempts
+                if scenario in ("stuffing", "rotating_xff"):
+                    # 接続元ごとに、最初の容量と回復した分だけしか照合に届かない
+                    clients = args.clients if scenario == "stuffing" else 1
+                    bound = clients * (rate_limit.CLIENT_BUCKET_CAPACITY
+                                       + attack_seconds * rate_limit.CLIENT_REFILL_PER_SECOND)
+                else:
+                    bound = rate_limit.EMAIL_BUCKET_CAPACITY + attack_seconds * rate_limit.EMAIL_REFILL_PER_SECOND
+                if attack_reached > bound + 1:
+                    failures.append(f"{scenario}/{label}: 照合に届いた攻撃 {attack_reached} 件 > 上限 {bound:.0f} 件")
+                if counts["legit_ok"] != legit_attempts:
+                    failures.append(f"{scenario}/{label}: 正規ユーザーのログイン {counts['legit_ok']}/{legit_attempts}")
+            if max(limited["buckets"].values()) > args.max_keys:
+                failures.append(f"{scenario}: バケット数 {limited['buckets']} > 上限 {args.max_keys}")
+            print(f"{scenario}: done", file=sys.stderr)
+    finally:
+        passwords.set_hasher(None)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results["failures"] = failures
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+設定管理モジュール
+OpenAI API・メール送信・データベースなどの設定を1回だけ読み込んで保持
+優先順位：
+1. st.secrets (Streamlit Cloud用)
+2. os.environ (ローカル.env用)
+3. 既定値
+
+設定を変えたとき（テストで環境変数を差し替えたときなど）は reload_config() で読み直します。
+"""
+
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Optional, Dict, Tuple
+from dotenv import load_dotenv
+
+
+# 議事録の作成後に、あらかじめ回答を用意しておくよくある質問（既定値）
+DEFAULT_STANDARD_QUESTIONS = (
+    "この会議の重要なポイントは？",
+    "次回までにやるべきことは？",
+    "今日学んだことを簡単にまとめて",
+)
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    """アプリ全体の設定（読み込み後は変更しない）"""
+    # OpenAI API
+    openai_api_key: Optional[str]
+    openai_base_url: Optional[str]
+    chat_model: str
+    summary_model: str
+    minutes_model: str
+    transcription_model: str
+    # AIチャットのよくある質問（回答を議事録の作成後に用意しておく）
+    standard_questions: Tuple[str, ...]
+    # メール送信
+    email_address: Optional[str]
+    email_password: Optional[str]
+    smtp_host: str
+    smtp_port: int
+    app_url: str
+    # パスワードのハッシュ（scryptのコスト）
+    password_scrypt_n: int
+    password_scrypt_r: int
+    password_scrypt_p: int
+    # ログイン回数制限を複数のプロセスで共有するSQLiteファイル（Noneならプロセス内のみ）
+    rate_limit_db: Optional[str]
+    # アプリの前にあり、X-Forwarded-Forに接続元を追記するプロキシの数
+    trusted_proxy_hops: int
+    # データベース
+    db_file: str
+    query_stats_enabled: bool
+    query_log_file: Optional[str]
+    slow_query_ms: float
+
+
+_config: Optional[AppConfig] = None
+_config_lock = threading.Lock()
+
+
+def _read_secrets() -> Dict:
+    """
+    st.secretsの内容を取得
+    streamlitが読み込み済みのときだけ読む（CLIやベンチマークでstreamlitを読み込まないため）。
+    secrets.tomlがないときにst.secretsがエラー表示を出さないよう、load_if_toml_existsで確認してから読む。
+    """
+    if "streamlit" not in sys.modules:
+        return {}
+    try:
+        import streamlit as st
+        if not st.secrets.load_if_toml_exists():
+            return {}
+        return st.secrets.to_dict()
+    except Exception:
+        # secrets.tomlの書式が正しくない場合など
+        return {}
+
+
+def load_config() -> AppConfig:
+    """st.secrets・環境変数から設定を読み込む（キャッシュせずに毎回読む）"""
+    load_dotenv()
+    secrets = _read_secrets()
+
+    def get(key: str, default: Optional[str] = None) -> Optional[str]:
+        value = secrets.get(key)
+        if value in (None, ""):
+            value = os.getenv(key)
+        return value if value not in (None, "") else default
+
+    def get_bool(key: str, default: bool = False) -> bool:
+        # secrets.tomlでは真偽値のまま、環境変数では "1" "true" "yes" "on" などの文字列で指定される
+        value = get(key)
+        if value is None:
+            return default
+        return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+    def get_list(key: str, default: Tuple[str, ...]) -> Tuple[str, ...]:
+        # secrets.tomlでは配列のまま、環境変数では「|」区切りの文字列で指定される
+        value = get(key)
+        if value is None:
+            return default
+        items = value if isinstance(value, (list, tuple)) else str(value).split("|")
+        return tuple(item.strip() for item in map(str, items) if item.strip())
+
+    return AppConfig(
+        openai_api_key=get('OPENAI_API_KEY'),
+        openai_base_url=get('OPENAI_BASE_URL'),
+        chat_model=get('OPENAI_CHAT_MODEL', "gpt-4o"),
+        summary_model=get('OPENAI_SUMMARY_MODEL', "gpt-4o-mini"),
+        minutes_model=get('OPENAI_MINUTES_MODEL', "gpt-4o"),
+        transcription_model=get('OPENAI_TRANSCRIPTION_MODEL', "whisper-1"),
+        standard_questions=get_list('STANDARD_QUESTIONS', DEFAULT_STANDARD_QUESTIONS),
+        email_address=get('EMAIL_ADDRESS'),
+        email_password=get('EMAIL_PASSWORD'),
+        smtp_host=get('SMTP_HOST', "smtp.gmail.com"),
+        smtp_port=int(get('SMTP_PORT', "587")),
+        app_url=get('APP_URL', "https://ai-literacy-app-9wdvlbxqk77oscqse9rpkq.streamlit.app"),
+        password_scrypt_n=int(get('PASSWORD_SCRYPT_N', "16384")),
+        password_scrypt_r=int(get('PASSWORD_SCRYPT_R', "8")),
+        password_scrypt_p=int(get('PASSWORD_SCRYPT_P', "1")),
+        rate_limit_db=get('RATE_LIMIT_DB'),
+        trusted_proxy_hops=int(get('TRUSTED_PROXY_HOPS', "0")),
+        db_file=get('DB_FILE', "ai_literacy.db"),
+        query_stats_enabled=get_bool('DB_QUERY_STATS') or bool(get('DB_QUERY_LOG')),
+        query_log_file=get('DB_QUERY_LOG'),
+        slow_query_ms=float(get('DB_SLOW_QUERY_MS', "50")),
+    )
+
+
+def get_config() -> AppConfig:
+    """設定を取得（初回だけ読み込み、以降は同じものを返す）"""
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                _config = load_config()
+    return _config
+
+
+def reload_config() -> AppConfig:
+    """設定を読み直す"""
+    global _config
+    with _config_lock:
+        _config = load_config()
+    return _config
@@ -6,41 +6,221 @@ Zoom連携機能追加版
 
 import sqlite3
 import hashlib
-import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from datetime import datetime
-from typing import Optional, List, Dict, Tuple
-from dotenv import load_dotenv
-from openai import OpenAI
+import re
+import json
+import unicodedata
+import time
+import sys
+import logging
+import threading
+import importlib
+import secrets
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Optional, List, Dict, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from config import get_config
+import passwords
+
+# 設定（st.secrets・環境変数）を読み込み
+DB_FILE = get_config().db_file
+
+# AIへの文脈として渡すチャット履歴の件数
+CHAT_CONTEXT_TURNS = 10
+
+# ログイン状態を保つ期間（セッショントークンの有効期限）
+SESSION_TTL_DAYS = 30
+
+# ミーティングの開催日時のタイムゾーン（タイムゾーンなしで入力された日時はこの時刻として扱う）
+DEFAULT_TIMEZONE = "Asia/Tokyo"
+# 旧データに見られる、ISO形式以外の日時の書式
+_SCHEDULED_AT_FORMATS = ("%Y/%m/%d %H:%M:%S", "%Y/%m/%d %H:%M", "%Y/%m/%d", "%Y年%m月%d日 %H:%M")
+
+# 繰り返しミーティングの頻度（RRULEのFREQと同じ名前）
+SERIES_FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+# 回数・終了日を指定しない繰り返しで、一度に展開する回数の上限
+SERIES_MAX_OCCURRENCES = 1000
+
+# AI回答キャッシュ：ミーティングごとに保持する件数（古いものから削除）
+ANSWER_CACHE_MAX_PER_MEETING = 50
+
+# AI機能（ai_service.py）とメール送信（mail_service.py）は、openai・smtplibなどの読み込みに
+# 時間がかかるため別モジュールにして、db.generate_ai_response などが初めて使われたときに読み込む
+_LAZY_MODULE_ATTRIBUTES = {
+    "ai_service": (
+        "CHAT_HISTORY_TOKEN_BUDGET", "CHAT_KEEP_RECENT_TURNS",
+        "get_openai_api_key", "get_openai_base_url", "get_openai_client",
+        "generate_ai_response_with_gpt4o", "precompute_standard_answers", "start_precompute_standard_answers",
+        "generate_ai_response",
+        "estimate_tokens", "summarize_conversation_with_gpt4o", "summarize_chat_thread_if_needed",
+        "transcribe_audio_with_whisper", "save_audio_and_transcribe", "generate_minutes_with_gpt4o",
+    ),
+    "mail_service": (
+        "get_email_config", "send_minutes_email", "send_zoom_reminder_email",
+        "send_meeting_invitation_email", "send_meeting_invitation_to_pending",
+        "send_auto_reminder", "send_single_meeting_invitation",
+    ),
+}
+_LAZY_ATTRIBUTES = {
+    name: module_name for module_name, names in _LAZY_MODULE_ATTRIBUTES.items() for name in names
+}
+
+def __getattr__(name: str):
+    """モジュールにない名前は、AI機能・メール送信のモジュールを読み込んで返す（PEP 562）"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+# SQLの計測（DB_QUERY_STATS=1 または DB_QUERY_LOG=ログファイル で有効）
+QUERY_STATS_ENABLED = get_config().query_stats_enabled
+QUERY_LOG_FILE = get_config().query_log_file
+# この時間（ミリ秒）以上かかったSQLを遅いクエリとして扱う
+SLOW_QUERY_MS = get_config().slow_query_ms
+# 1回の再描画で記録するSQLの上限
+MAX_QUERY_RECORDS = 5000
+
+_query_stats = threading.local()
+_query_logger = logging.getLogger("database.queries")
+
+def configure_query_stats(enabled: bool = True, log_file: Optional[str] = None,
+                          slow_query_ms: Optional[float] = None):
+    """SQLの計測を有効・無効にする（ベンチマークなど、環境変数以外から切り替えるとき用）"""
+    global QUERY_STATS_ENABLED, QUERY_LOG_FILE, SLOW_QUERY_MS
+    QUERY_STATS_ENABLED = enabled
+    QUERY_LOG_FILE = log_file
+    if slow_query_ms is not None:
+        SLOW_QUERY_MS = slow_query_ms
+    _setup_query_log()
+
+def _setup_query_log():
+    """QUERY_LOG_FILEが設定されていれば、SQLのログをそのファイルに書き出す"""
+    for handler in list(_query_logger.handlers):
+        _query_logger.removeHandler(handler)
+        handler.close()
+    if QUERY_LOG_FILE:
+        handler = logging.FileHandler(QUERY_LOG_FILE, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        _query_logger.addHandler(handler)
+        _query_logger.setLevel(logging.INFO)
+        _query_logger.propagate = False
+
+def reset_query_stats():
+    """このスレッド（Streamlitでは1回の再描画）のSQLの記録を空にする"""
+    _query_stats.records = []
+    _query_stats.traced = 0
+
+def _query_caller() -> str:
+    """SQLを発行した関数名（計測用のラッパーは飛ばす）"""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename == __file__ and frame.f_code.co_name in _QUERY_WRAPPER_NAMES:
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    module = frame.f_globals.get("__name__", "")
+    if module == __name__:
+        return frame.f_code.co_name
+    return f"{module}.{frame.f_code.co_name}"
+
+def _record_query(sql: str, started: float, traced_before: int):
+    """SQL 1回分の所要時間と呼び出し元を記録"""
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not hasattr(_query_stats, "records"):
+        reset_query_stats()
+    record = {
+        "sql": " ".join(sql.split())[:300],
+        "ms": elapsed_ms,
+        "caller": _query_caller(),
+        # トリガーなどを含め、SQLiteが実際に実行した文の数
+        "statements": _query_stats.traced - traced_before,
+    }
+    if len(_query_stats.records) < MAX_QUERY_RECORDS:
+        _query_stats.records.append(record)
+    if QUERY_LOG_FILE:
+        _query_logger.info("%.2fms %s %s", elapsed_ms, record["caller"], record["sql"])
+
+def _count_traced_statement(statement: str):
+    """set_trace_callbackから呼ばれる（実行された文を数える）"""
+    _query_stats.traced = getattr(_query_stats, "traced", 0) + 1
+
+class _TimedCursor(sqlite3.Cursor):
+    """実行時間を記録するカーソル"""
+
+    def execute(self, sql, parameters=()):
+        started, traced = time.perf_counter(), getattr(_query_stats, "traced", 0)
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _record_query(sql, started, traced)
 
-# 環境変数を読み込み
-load_dotenv()
+    def executemany(self, sql, seq_of_parameters):
+        started, traced = time.perf_counter(), getattr(_query_stats, "traced", 0)
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _record_query(sql, started, traced)
 
-DB_FILE = "ai_literacy.db"
+    def executescript(self, sql_script):
+        started, traced = time.perf_counter(), getattr(_query_stats, "traced", 0)
+        try:
+            return super().executescript(sql_script)
+        finally:
+            _record_query(sql_script, started, traced)
 
-def get_openai_api_key() -> Optional[str]:
-    """
-    OpenAI APIキーを取得
-    優先順位：
-    1. st.secrets (Streamlit Cloud用)
-    2. os.environ (ローカル.env用)
+class _TimedConnection(sqlite3.Connection):
+    """カーソルとコミットの実行時間を記録する接続"""
+
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        started, traced = time.perf_counter(), getattr(_query_stats, "traced", 0)
+        try:
+            return super().commit()
+        finally:
+            _record_query("COMMIT", started, traced)
+
+_QUERY_WRAPPER_NAMES = {"execute", "executemany", "executescript", "commit", "_record_query"}
+
+def get_query_stats() -> Dict:
     """
-    # Streamlit Cloudの場合
-    try:
-        import streamlit as st
-        if hasattr(st, 'secrets') and 'OPENAI_API_KEY' in st.secrets:
-            return st.secrets['OPENAI_API_KEY']
-    except (ImportError, Exception):
-        pass
+    このスレッド（1回の再描画）で記録したSQLの集計
 
-    # ローカル環境の場合
-    return os.getenv('OPENAI_API_KEY')
+    Returns:
+        queries（SQLの数）、total_ms（合計時間）、statements（トリガーを含む実行文の数）、
+        by_caller（呼び出し元の関数ごとの回数と時間、時間の長い順）、slow（SLOW_QUERY_MS以上のSQL）
+    """
+    records = getattr(_query_stats, "records", [])
+    by_caller: Dict[str, Dict] = {}
+    for record in records:
+        caller = by_caller.setdefault(record["caller"], {"caller": record["caller"], "count": 0, "ms": 0.0})
+        caller["count"] += 1
+        caller["ms"] += record["ms"]
+    return {
+        "queries": len(records),
+        "total_ms": sum(record["ms"] for record in records),
+        "statements": sum(record["statements"] for record in records),
+        "by_caller": sorted(by_caller.values(), key=lambda c: c["ms"], reverse=True),
+        "slow": [record for record in records if record["ms"] >= SLOW_QUERY_MS],
+    }
+
+_setup_query_log()
 
 def get_connection():
-    """データベース接続を取得"""
-    conn = sqlite3.connect(DB_FILE)
+    """データベース接続を取得（SQLの計測が有効なら、実行時間を記録する接続を返す）"""
+    if QUERY_STATS_ENABLED:
+        conn = sqlite3.connect(DB_FILE, factory=_TimedConnection)
+        conn.set_trace_callback(_count_traced_statement)
+    else:
+        conn = sqlite3.connect(DB_FILE)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -86,6 +266,35 @@ def init_database():
         )
     """)
 
+    # 参加した時刻（エポック秒）と、その時点で作成済みだった最後のミーティングID
+    # 参加した時点で開催済みだったミーティングの参加者には含めない
+    # （これらの列より前からのメンバーはNULLで、すべてのミーティングの参加者に含める）
+    try:
+        cursor.execute("ALTER TABLE group_members ADD COLUMN joined_ts INTEGER")
+    except sqlite3.OperationalError:
+        pass  # 既に存在する場合はスキップ
+    try:
+        cursor.execute("ALTER TABLE group_members ADD COLUMN joined_after_meeting_id INTEGER")
+    except sqlite3.OperationalError:
+        pass  # 既に存在する場合はスキップ
+
+    # 退会したメンバーの在籍期間（退会した時点で開催済みだったミーティングの参加者として残す）
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS group_membership_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            group_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            joined_at TIMESTAMP,
+            joined_ts INTEGER,
+            joined_after_meeting_id INTEGER,
+            left_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            left_ts INTEGER NOT NULL,
+            left_after_meeting_id INTEGER NOT NULL,
+            FOREIGN KEY (group_id) REFERENCES groups(id),
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    """)
+
     # ユーザーチェックリストテーブル
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS user_checklists (
@@ -114,6 +323,12 @@ def init_database():
         )
     """)
 
+    # 招待のメールアドレスは小文字で保存する（UNIQUE(group_id, email)のインデックスで重複を判定できるように）
+    cursor.execute("""
+        UPDATE OR IGNORE group_invitations SET email = lower(trim(email))
+        WHERE email != lower(trim(email))
+    """)
+
     # ミーティングテーブル（Zoom URL追加）
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS meetings (
@@ -123,9 +338,14 @@ def init_database():
             group_id INTEGER NOT NULL,
             host_id INTEGER NOT NULL,
             scheduled_at TIMESTAMP,
+            scheduled_ts INTEGER,
+            timezone TEXT NOT NULL DEFAULT 'Asia/Tokyo',
+            series_id INTEGER,
+            occurrence_ts INTEGER,
             zoom_url TEXT,
             zoom_meeting_id TEXT,
             zoom_passcode TEXT,
+            participant_count INTEGER NOT NULL DEFAULT 0,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (group_id) REFERENCES groups(id),
             FOREIGN KEY (host_id) REFERENCES users(id)
@@ -148,19 +368,99 @@ def init_database():
     except sqlite3.OperationalError:
         pass
 
-    # ミーティング参加者テーブル
+    participant_count_added = False
+    try:
+        cursor.execute("ALTER TABLE meetings ADD COLUMN participant_count INTEGER NOT NULL DEFAULT 0")
+        participant_count_added = True
+    except sqlite3.OperationalError:
+        pass
+
+    # 開催日時（UTCのエポック秒）とタイムゾーン。範囲の検索・並べ替えはscheduled_tsで行う
+    try:
+        cursor.execute("ALTER TABLE meetings ADD COLUMN scheduled_ts INTEGER")
+    except sqlite3.OperationalError:
+        pass
+
+    try:
+        cursor.execute(f"ALTER TABLE meetings ADD COLUMN timezone TEXT NOT NULL DEFAULT '{DEFAULT_TIMEZONE}'")
+    except sqlite3.OperationalError:
+        pass
+
+    _migrate_scheduled_ts(cursor)
+
+    # 繰り返しミーティングから作られた回（series_id）と、その回の本来の開催日時（occurrence_ts）
+    try:
+        cursor.execute("ALTER TABLE meetings ADD COLUMN series_id INTEGER REFERENCES meeting_series(id)")
+    except sqlite3.OperationalError:
+        pass
+
+    try:
+        cursor.execute("ALTER TABLE meetings ADD COLUMN occurrence_ts INTEGER")
+    except sqlite3.OperationalError:
+        pass
+
+    # 繰り返しミーティングテーブル（RRULEのFREQ・INTERVAL・COUNT・UNTILに相当）
+    # 各回は表示のたびに期間内だけ計算し、録音・学んだこと・チャットなどが追加されたときに
+    # はじめてmeetingsに1行作る（materialize_occurrence）
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS meeting_series (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            group_id INTEGER NOT NULL,
+            host_id INTEGER NOT NULL,
+            start_ts INTEGER NOT NULL,
+            timezone TEXT NOT NULL DEFAULT 'Asia/Tokyo',
+            freq TEXT NOT NULL,
+            interval INTEGER NOT NULL DEFAULT 1,
+            occurrence_count INTEGER,
+            until_ts INTEGER,
+            zoom_url TEXT,
+            zoom_meeting_id TEXT,
+            zoom_passcode TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (group_id) REFERENCES groups(id),
+            FOREIGN KEY (host_id) REFERENCES users(id)
+        )
+    """)
+
+    # ミーティング参加者の例外テーブル
+    # 参加者は基本的にグループメンバーから決まり、ここには例外（追加・除外）だけを記録する
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS meeting_participants (
+        CREATE TABLE IF NOT EXISTS meeting_participant_overrides (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             meeting_id INTEGER NOT NULL,
             user_id INTEGER NOT NULL,
-            joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            included BOOLEAN NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (meeting_id) REFERENCES meetings(id),
             FOREIGN KEY (user_id) REFERENCES users(id),
             UNIQUE(meeting_id, user_id)
         )
     """)
 
+    # 旧形式（参加者を1行ずつコピーしていたテーブル）からの移行
+    cursor.execute("SELECT type FROM sqlite_master WHERE name = 'meeting_participants'")
+    existing = cursor.fetchone()
+    if existing and existing['type'] == 'table':
+        _migrate_meeting_participants_table(cursor)
+        participant_count_added = True
+
+    # ミーティング参加者ビュー（在籍期間から決まるメンバー＋例外）と、参加者数を更新するトリガー
+    # 定義が変わっていれば作り直し、参加者数も数え直す
+    for object_sql in (MEETING_PARTICIPANTS_VIEW, *PARTICIPANT_COUNT_TRIGGERS):
+        if _create_or_replace_schema_object(cursor, object_sql):
+            participant_count_added = True
+
+    # 参加者数の初期値を設定（列やトリガーを追加したときのみ）
+    if participant_count_added:
+        cursor.execute("""
+            UPDATE meetings
+            SET participant_count = (
+                SELECT COUNT(*) FROM meeting_participants mp WHERE mp.meeting_id = meetings.id
+            )
+        """)
+
     # 録音・議事録テーブル
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS recordings (
@@ -186,11 +486,59 @@ def init_database():
             message TEXT NOT NULL,
             is_ai BOOLEAN DEFAULT 0,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            thread_id INTEGER,
+            FOREIGN KEY (meeting_id) REFERENCES meetings(id),
+            FOREIGN KEY (user_id) REFERENCES users(id),
+            FOREIGN KEY (thread_id) REFERENCES chat_threads(id)
+        )
+    """)
+
+    # AI対話スレッドテーブル（ユーザーごとの会話のまとまり）
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chat_threads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            meeting_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            title TEXT,
+            summary TEXT,
+            summarized_until_id INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (meeting_id) REFERENCES meetings(id),
             FOREIGN KEY (user_id) REFERENCES users(id)
         )
     """)
 
+    # 既存のchat_threadsテーブルに要約列がない場合は追加
+    try:
+        cursor.execute("ALTER TABLE chat_threads ADD COLUMN summary TEXT")
+    except sqlite3.OperationalError:
+        pass
+
+    try:
+        cursor.execute("ALTER TABLE chat_threads ADD COLUMN summarized_until_id INTEGER NOT NULL DEFAULT 0")
+    except sqlite3.OperationalError:
+        pass
+
+    # 既存のchat_historyテーブルにthread_id列がない場合は追加し、
+    # これまでの履歴をミーティング×ユーザーごとのスレッドにまとめる
+    try:
+        cursor.execute("ALTER TABLE chat_history ADD COLUMN thread_id INTEGER REFERENCES chat_threads(id)")
+        cursor.execute("""
+            INSERT INTO chat_threads (meeting_id, user_id, created_at)
+            SELECT meeting_id, user_id, MIN(created_at)
+            FROM chat_history
+            GROUP BY meeting_id, user_id
+        """)
+        cursor.execute("""
+            UPDATE chat_history
+            SET thread_id = (
+                SELECT t.id FROM chat_threads t
+                WHERE t.meeting_id = chat_history.meeting_id AND t.user_id = chat_history.user_id
+            )
+        """)
+    except sqlite3.OperationalError:
+        pass
+
     # 学びのメモテーブル
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS learning_notes (
@@ -218,12 +566,344 @@ def init_database():
         )
     """)
 
+    # AI利用状況テーブル（OpenAI APIの呼び出しごとに記録）
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ai_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            feature TEXT NOT NULL,
+            model TEXT NOT NULL,
+            meeting_id INTEGER,
+            latency_ms REAL NOT NULL,
+            prompt_tokens INTEGER,
+            completion_tokens INTEGER,
+            audio_seconds REAL,
+            success INTEGER NOT NULL DEFAULT 1,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (meeting_id) REFERENCES meetings(id)
+        )
+    """)
+
+    # AI回答キャッシュテーブル（同じ質問への回答を再利用する）
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ai_answer_cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            meeting_id INTEGER NOT NULL,
+            question_key TEXT NOT NULL,
+            question TEXT NOT NULL,
+            source_hash TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (meeting_id) REFERENCES meetings(id),
+            UNIQUE(meeting_id, question_key)
+        )
+    """)
+
+    # セッショントークンテーブル（ブラウザを開き直してもログイン状態を保つ、トークンはハッシュで保存）
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS user_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            token_hash TEXT NOT NULL UNIQUE,
+            user_id INTEGER NOT NULL,
+            expires_at TIMESTAMP NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    """)
+
+    # インデックス
+    cursor.execute("DROP INDEX IF EXISTS idx_meetings_group_scheduled")
+    cursor.execute("DROP INDEX IF EXISTS idx_meetings_host_scheduled")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_group_scheduled_ts ON meetings(group_id, scheduled_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_host_scheduled_ts ON meetings(host_id, scheduled_ts)")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_meetings_series_occurrence ON meetings(series_id, occurrence_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meeting_series_group ON meeting_series(group_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meeting_series_host ON meeting_series(host_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_group_members_user ON group_members(user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_participant_overrides_user ON meeting_participant_overrides(user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_membership_history_user ON group_membership_history(user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_membership_history_group ON group_membership_history(group_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_recordings_meeting ON recordings(meeting_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_learning_notes_meeting_user ON learning_notes(meeting_id, user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_history_meeting_created ON chat_history(meeting_id, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_history_thread_created ON chat_history(thread_id, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_threads_meeting_user ON chat_threads(meeting_id, user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_metrics_created ON ai_metrics(created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_expires ON user_sessions(expires_at)")
+
     conn.commit()
     conn.close()
 
+def _member_rule(member: str, meeting: str) -> str:
+    """
+    グループメンバーがミーティングの参加者になる条件（SQL）
+    参加した時点で開催済みだったミーティング（参加より前に作成され、参加より前に開催）には含めない
+    """
+    return f"""({member}.joined_ts IS NULL OR {meeting}.scheduled_ts IS NULL
+        OR {meeting}.scheduled_ts >= {member}.joined_ts OR {meeting}.id > {member}.joined_after_meeting_id)"""
+
+def _former_member_rule(history: str, meeting: str) -> str:
+    """退会したメンバーが参加者として残る条件（SQL）：在籍中で、退会した時点で開催済みだったミーティング"""
+    return f"""{_member_rule(history, meeting)}
+        AND {meeting}.scheduled_ts < {history}.left_ts AND {meeting}.id <= {history}.left_after_meeting_id"""
+
+def _base_participant(meeting_id: str, user_id: str) -> str:
+    """例外がなくても参加者になるか（SQL）：グループメンバーか、在籍中に開催されたミーティング"""
+    return f"""(
+        EXISTS (
+            SELECT 1 FROM meetings m
+            JOIN group_members gm ON gm.group_id = m.group_id
+            WHERE m.id = {meeting_id} AND gm.user_id = {user_id} AND {_member_rule('gm', 'm')}
+        )
+        OR EXISTS (
+            SELECT 1 FROM meetings m
+            JOIN group_membership_history h ON h.group_id = m.group_id
+            WHERE m.id = {meeting_id} AND h.user_id = {user_id} AND {_former_member_rule('h', 'm')}
+        )
+    )"""
+
+def _override_delta(row: str) -> str:
+    """例外1件がミーティングの参加者数に与える影響（メンバーの除外は-1、メンバー以外の追加は+1、それ以外は0）"""
+    return f"""
+    CASE WHEN {_base_participant(f'{row}.meeting_id', f'{row}.user_id')}
+    THEN CASE WHEN {row}.included THEN 0 ELSE -1 END
+    ELSE CASE WHEN {row}.included THEN 1 ELSE 0 END
+    END
+"""
+
+def _no_override(meeting_id: str, user_id: str) -> str:
+    """例外が記録されていない（SQL）"""
+    return f"""NOT EXISTS (
+              SELECT 1 FROM meeting_participant_overrides o
+              WHERE o.meeting_id = {meeting_id} AND o.user_id = {user_id}
+          )"""
+
+# ミーティング参加者ビュー（在籍期間から決まるメンバー＋元メンバー＋例外）
+MEETING_PARTICIPANTS_VIEW = f"""
+    CREATE VIEW IF NOT EXISTS meeting_participants AS
+    SELECT m.id AS meeting_id, gm.user_id AS user_id, gm.joined_at AS joined_at
+    FROM meetings m
+    JOIN group_members gm ON gm.group_id = m.group_id
+    LEFT JOIN meeting_participant_overrides o
+           ON o.meeting_id = m.id AND o.user_id = gm.user_id
+    WHERE (o.included IS NULL AND {_member_rule('gm', 'm')}) OR o.included = 1
+    UNION ALL
+    SELECT m.id, h.user_id, h.joined_at
+    FROM group_membership_history h
+    JOIN meetings m ON m.group_id = h.group_id
+    WHERE {_former_member_rule('h', 'm')}
+      AND {_no_override('m.id', 'h.user_id')}
+    UNION ALL
+    SELECT o.meeting_id, o.user_id, o.created_at AS joined_at
+    FROM meeting_participant_overrides o
+    JOIN meetings m ON m.id = o.meeting_id
+    WHERE o.included = 1
+      AND NOT EXISTS (
+          SELECT 1 FROM group_members gm
+          WHERE gm.group_id = m.group_id AND gm.user_id = o.user_id
+      )
+"""
+
+PARTICIPANT_COUNT_TRIGGERS = [
+    # 新規ミーティング：グループメンバー数で初期化（作成後に参加した扱いになるため全員が参加者）
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_participant_count_meeting_insert
+    AFTER INSERT ON meetings
+    BEGIN
+        UPDATE meetings
+        SET participant_count = (SELECT COUNT(*) FROM group_members WHERE group_id = NEW.group_id)
+        WHERE id = NEW.id;
+    END
+    """,
+    # 開催日時の変更：在籍期間との関係が変わるため数え直す
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_participant_count_meeting_reschedule
+    AFTER UPDATE OF scheduled_ts ON meetings
+    WHEN OLD.scheduled_ts IS NOT NEW.scheduled_ts
+    BEGIN
+        UPDATE meetings
+        SET participant_count = (SELECT COUNT(*) FROM meeting_participants mp WHERE mp.meeting_id = NEW.id)
+        WHERE id = NEW.id;
+    END
+    """,
+    # メンバー追加：例外がなく、参加者になるミーティングで+1
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_participant_count_member_insert
+    AFTER INSERT ON group_members
+    BEGIN
+        UPDATE meetings
+        SET participant_count = participant_count + 1
+        WHERE group_id = NEW.group_id
+          AND {_member_rule('NEW', 'meetings')}
+          AND {_no_override('meetings.id', 'NEW.user_id')};
+    END
+    """,
+    # メンバー削除：例外がなく、参加者だったミーティングで-1
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_participant_count_member_delete
+    AFTER DELETE ON group_members
+    BEGIN
+        UPDATE meetings
+        SET participant_count = participant_count - 1
+        WHERE group_id = OLD.group_id
+          AND {_member_rule('OLD', 'meetings')}
+          AND {_no_override('meetings.id', 'OLD.user_id')};
+    END
+    """,
+    # 在籍期間の記録（退会）：例外がなく、在籍中に開催されたミーティングで+1
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_participant_count_history_insert
+    AFTER INSERT ON group_membership_history
+    BEGIN
+        UPDATE meetings
+        SET participant_count = participant_count + 1
+        WHERE group_id = NEW.group_id
+          AND {_former_member_rule('NEW', 'meetings')}
+          AND {_no_override('meetings.id', 'NEW.user_id')};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_participant_count_history_delete
+    AFTER DELETE ON group_membership_history
+    BEGIN
+        UPDATE meetings
+        SET participant_count = participant_count - 1
+        WHERE group_id = OLD.group_id
+          AND {_former_member_rule('OLD', 'meetings')}
+          AND {_no_override('meetings.id', 'OLD.user_id')};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_participant_count_override_insert
+    AFTER INSERT ON meeting_participant_overrides
+    BEGIN
+        UPDATE meetings
+        SET participant_count = participant_count + ({_override_delta('NEW')})
+        WHERE id = NEW.meeting_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_participant_count_override_delete
+    AFTER DELETE ON meeting_participant_overrides
+    BEGIN
+        UPDATE meetings
+        SET participant_count = participant_count - ({_override_delta('OLD')})
+        WHERE id = OLD.meeting_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_participant_count_override_update
+    AFTER UPDATE OF included ON meeting_participant_overrides
+    BEGIN
+        UPDATE meetings
+        SET participant_count = participant_count
+            - ({_override_delta('OLD')})
+            + ({_override_delta('NEW')})
+        WHERE id = NEW.meeting_id;
+    END
+    """,
+    # ビューへの追加・削除は例外テーブルへの書き込みに変換
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_participant_count_view_insert
+    INSTEAD OF INSERT ON meeting_participants
+    BEGIN
+        DELETE FROM meeting_participant_overrides
+        WHERE meeting_id = NEW.meeting_id AND user_id = NEW.user_id;
+        INSERT INTO meeting_participant_overrides (meeting_id, user_id, included)
+        VALUES (NEW.meeting_id, NEW.user_id, 1);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_participant_count_view_delete
+    INSTEAD OF DELETE ON meeting_participants
+    BEGIN
+        DELETE FROM meeting_participant_overrides
+        WHERE meeting_id = OLD.meeting_id AND user_id = OLD.user_id;
+        INSERT INTO meeting_participant_overrides (meeting_id, user_id, included)
+        SELECT OLD.meeting_id, OLD.user_id, 0
+        WHERE {_base_participant('OLD.meeting_id', 'OLD.user_id')};
+    END
+    """,
+]
+
+def _create_or_replace_schema_object(cursor, create_sql: str) -> bool:
+    """
+    ビュー・トリガーを作成（既にあって定義が違えば削除して作り直す）
+
+    Returns:
+        作成・作り直しをしたらTrue（定義が同じで何もしなかったらFalse）
+    """
+    kind, name = re.match(r"\s*CREATE (VIEW|TRIGGER) IF NOT EXISTS (\w+)", create_sql).groups()
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = ? AND name = ?", (kind.lower(), name))
+    existing = cursor.fetchone()
+    expected = " ".join(create_sql.replace(" IF NOT EXISTS", "", 1).split())
+    if existing and " ".join(existing['sql'].split()) == expected:
+        return False
+    if existing:
+        cursor.execute(f"DROP {kind} {name}")
+    cursor.execute(create_sql)
+    return True
+
+def _migrate_scheduled_ts(cursor):
+    """
+    scheduled_tsが未設定のミーティングに、scheduled_at（文字列）から計算した値を設定
+    （列の追加前に作成されたミーティング、旧バージョンのアプリで作成されたミーティング）
+    """
+    cursor.execute("""
+        SELECT id, scheduled_at, timezone FROM meetings
+        WHERE scheduled_ts IS NULL AND scheduled_at IS NOT NULL AND scheduled_at != ''
+    """)
+    updates = []
+    for row in cursor.fetchall():
+        ts = to_epoch(row['scheduled_at'], row['timezone'])
+        if ts is not None:
+            updates.append((ts, row['id']))
+    if updates:
+        cursor.executemany("UPDATE meetings SET scheduled_ts = ? WHERE id = ?", updates)
+
+def _migrate_meeting_participants_table(cursor):
+    """
+    旧meeting_participantsテーブルを例外テーブルに移行して削除
+
+    過去のミーティングは作成時の参加者のまま残るよう、
+    グループメンバーとの差分だけを例外として記録します。
+    今後のミーティングは現在のグループメンバーに従います。
+    """
+    now = int(time.time())
+
+    # 過去のミーティングに参加していなかったメンバー → 除外
+    cursor.execute("""
+        INSERT OR IGNORE INTO meeting_participant_overrides (meeting_id, user_id, included)
+        SELECT m.id, gm.user_id, 0
+        FROM meetings m
+        JOIN group_members gm ON gm.group_id = m.group_id
+        WHERE m.scheduled_ts < ?
+          AND NOT EXISTS (
+              SELECT 1 FROM meeting_participants lp
+              WHERE lp.meeting_id = m.id AND lp.user_id = gm.user_id
+          )
+    """, (now,))
+
+    # 過去のミーティングに参加していたが、今はメンバーでない人 → 追加
+    cursor.execute("""
+        INSERT OR IGNORE INTO meeting_participant_overrides (meeting_id, user_id, included, created_at)
+        SELECT lp.meeting_id, lp.user_id, 1, lp.joined_at
+        FROM meeting_participants lp
+        JOIN meetings m ON m.id = lp.meeting_id
+        WHERE m.scheduled_ts < ?
+          AND NOT EXISTS (
+              SELECT 1 FROM group_members gm
+              WHERE gm.group_id = m.group_id AND gm.user_id = lp.user_id
+          )
+    """, (now,))
+
+    cursor.execute("DROP TABLE meeting_participants")
+
 def hash_password(password: str) -> str:
-    """パスワードをハッシュ化"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """パスワードをハッシュ化（方式とコストはpasswords.pyの設定）"""
+    return passwords.hash_password(password)
 
 # ユーザー関連の関数
 
@@ -247,21 +927,27 @@ def create_user(name: str, email: str, password: str, role: str) -> Tuple[bool,
         return False, f"エラーが発生しました: {str(e)}"
 
 def authenticate_user(email: str, password: str) -> Optional[Dict]:
-    """ユーザー認証"""
+    """
+    ユーザー認証
+    メールアドレスでユーザーを取得してからパスワードを照合する。
+    旧形式（SHA-256）や古いコストのハッシュは、ログインに成功したときに作り直す。
+    """
     conn = get_connection()
     cursor = conn.cursor()
-    password_hash = hash_password(password)
-
-    cursor.execute(
-        "SELECT * FROM users WHERE email = ? AND password_hash = ?",
-        (email, password_hash)
-    )
+    cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
     user = cursor.fetchone()
-    conn.close()
 
-    if user:
-        return dict(user)
-    return None
+    if not passwords.verify_password(password, user['password_hash'] if user else None):
+        conn.close()
+        return None
+
+    user = dict(user)
+    if passwords.needs_rehash(user['password_hash']):
+        user['password_hash'] = hash_password(password)
+        cursor.execute("UPDATE users SET password_hash = ? WHERE id = ?", (user['password_hash'], user['id']))
+        conn.commit()
+    conn.close()
+    return user
 
 def get_user_by_id(user_id: int) -> Optional[Dict]:
     """ユーザーIDからユーザー情報を取得"""
@@ -287,6 +973,72 @@ def get_user_by_email(email: str) -> Optional[Dict]:
         return dict(user)
     return None
 
+# セッショントークン関連の関数
+
+def _hash_session_token(token: str) -> str:
+    """セッショントークンのハッシュ（データベースにはトークンそのものを保存しない）"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def create_user_session(user_id: int, ttl_days: int = SESSION_TTL_DAYS) -> Optional[str]:
+    """
+    ログイン状態を保つセッショントークンを発行
+
+    Args:
+        user_id: ユーザーID
+        ttl_days: 有効期間（日）
+
+    Returns:
+        セッショントークン（失敗時はNone）
+    """
+    try:
+        token = secrets.token_urlsafe(32)
+        now = datetime.now()
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        # 期限切れのトークンを片付ける
+        cursor.execute("DELETE FROM user_sessions WHERE expires_at <= ?", (now.isoformat(),))
+        cursor.execute(
+            "INSERT INTO user_sessions (token_hash, user_id, expires_at) VALUES (?, ?, ?)",
+            (_hash_session_token(token), user_id, (now + timedelta(days=ttl_days)).isoformat())
+        )
+        conn.commit()
+        conn.close()
+        return token
+    except Exception:
+        return None
+
+def get_user_by_session_token(token: str) -> Optional[Dict]:
+    """セッショントークンからユーザー情報を取得（期限切れ・無効なトークンはNone）"""
+    if not token:
+        return None
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT u.*
+        FROM user_sessions s
+        JOIN users u ON u.id = s.user_id
+        WHERE s.token_hash = ? AND s.expires_at > ?
+    """, (_hash_session_token(token), datetime.now().isoformat()))
+    user = cursor.fetchone()
+    conn.close()
+
+    if user:
+        return dict(user)
+    return None
+
+def delete_user_session(token: str) -> bool:
+    """セッショントークンを無効にする（ログアウト）"""
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM user_sessions WHERE token_hash = ?", (_hash_session_token(token),))
+        conn.commit()
+        conn.close()
+        return True
+    except Exception:
+        return False
+
 # グループ関連の関数
 
 def create_group(name: str, description: str, host_id: int) -> Tuple[bool, str, Optional[int]]:
@@ -302,10 +1054,7 @@ def create_group(name: str, description: str, host_id: int) -> Tuple[bool, str,
         group_id = cursor.lastrowid
 
         # ホストを自動的にグループメンバーに追加
-        cursor.execute(
-            "INSERT INTO group_members (group_id, user_id) VALUES (?, ?)",
-            (group_id, host_id)
-        )
+        _insert_group_member(cursor, group_id, host_id, int(time.time()))
 
         conn.commit()
         conn.close()
@@ -348,7 +1097,6 @@ def get_groups_by_member(user_id: int) -> List[Dict]:
     return groups
 
 
-
 def leave_group(group_id: int, user_id: int) -> Tuple[bool, str]:
     """グループから退会する（ホストは退会不可）"""
     try:
@@ -367,15 +1115,26 @@ def leave_group(group_id: int, user_id: int) -> Tuple[bool, str]:
             conn.close()
             return False, "ホストはグループから退会できません"
         
-        # グループメンバーから削除
+        # 在籍期間を記録してからグループメンバーから削除
+        # （過去のミーティングの参加記録は在籍期間から決まり、今後のミーティングからは外れる）
+        now = int(time.time())
+        cursor.execute("""
+            INSERT INTO group_membership_history
+                (group_id, user_id, joined_at, joined_ts, joined_after_meeting_id, left_ts, left_after_meeting_id)
+            SELECT group_id, user_id, joined_at, joined_ts, joined_after_meeting_id,
+                   ?, (SELECT COALESCE(MAX(id), 0) FROM meetings)
+            FROM group_members WHERE group_id = ? AND user_id = ?
+        """, (now, group_id, user_id))
+
+        if cursor.rowcount == 0:
+            conn.close()
+            return False, "このグループに参加していません"
+
         cursor.execute(
             "DELETE FROM group_members WHERE group_id = ? AND user_id = ?",
             (group_id, user_id)
         )
-        
-        if cursor.rowcount == 0:
-            conn.close()
-            return False, "このグループに参加していません"
+        _clear_future_overrides(cursor, group_id, user_id, now)
         
         conn.commit()
         conn.close()
@@ -383,6 +1142,26 @@ def leave_group(group_id: int, user_id: int) -> Tuple[bool, str]:
     except Exception as e:
         return False, f"エラーが発生しました: {str(e)}"
 
+def _insert_group_member(cursor, group_id: int, user_id: int, now: int):
+    """グループメンバーを追加（参加した時刻と、その時点で作成済みだった最後のミーティングIDを記録）"""
+    cursor.execute("""
+        INSERT INTO group_members (group_id, user_id, joined_ts, joined_after_meeting_id)
+        VALUES (?, ?, ?, (SELECT COALESCE(MAX(id), 0) FROM meetings))
+    """, (group_id, user_id, now))
+
+def _clear_future_overrides(cursor, group_id: int, user_id: int, now: int):
+    """
+    メンバーの参加・退会時に、今後のミーティングの例外を削除して在籍状況に従わせる
+    （過去のミーティングは在籍期間から決まるため何もしない。呼び出し側のトランザクション内で実行）
+    """
+    cursor.execute("""
+        DELETE FROM meeting_participant_overrides
+        WHERE user_id = ? AND meeting_id IN (
+            SELECT id FROM meetings
+            WHERE group_id = ? AND (scheduled_ts IS NULL OR scheduled_ts >= ?)
+        )
+    """, (user_id, group_id, now))
+
 def get_group_by_id(group_id: int) -> Optional[Dict]:
     """グループIDからグループ情報を取得"""
     conn = get_connection()
@@ -423,7 +1202,7 @@ def invite_to_group(group_id: int, email: str, invited_by: int) -> Tuple[bool, s
 
         cursor.execute(
             "INSERT INTO group_invitations (group_id, email, invited_by) VALUES (?, ?, ?)",
-            (group_id, email, invited_by)
+            (group_id, email.strip().lower(), invited_by)
         )
         conn.commit()
         conn.close()
@@ -433,6 +1212,107 @@ def invite_to_group(group_id: int, email: str, invited_by: int) -> Tuple[bool, s
     except Exception as e:
         return False, f"エラーが発生しました: {str(e)}"
 
+# メールアドレスとして扱う最低限の形式（xxx@yyy.zz）
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+def parse_email_list(text: str) -> Tuple[List[str], List[str]]:
+    """
+    貼り付けたテキストやCSVの内容からメールアドレスを取り出して正規化
+
+    カンマ・セミコロン・改行・空白（全角を含む）で区切り、
+    全角英数字を半角に、英字を小文字に揃えて重複を除きます。
+    「@」を含まない項目（CSVの見出しや氏名など）は無視します。
+
+    Args:
+        text: 貼り付けられたテキスト、またはCSVファイルの内容
+
+    Returns:
+        (正規化済みメールアドレスのリスト（入力順）, 形式が正しくない項目のリスト)
+    """
+    emails = []
+    invalid = []
+    seen = set()
+
+    normalized_text = unicodedata.normalize('NFKC', text or "")
+    for token in re.split(r"[,;、\s]+", normalized_text):
+        token = token.strip().strip('"\'<>').lower()
+        if '@' not in token:
+            continue
+        if not EMAIL_PATTERN.match(token):
+            invalid.append(token)
+            continue
+        if token not in seen:
+            seen.add(token)
+            emails.append(token)
+
+    return emails, invalid
+
+def invite_many_to_group(group_id: int, emails_text: str, invited_by: int) -> Tuple[bool, str, Dict[str, List[str]]]:
+    """
+    複数のメールアドレスをまとめてグループに招待
+
+    既に招待済み・既にメンバーのアドレスは1回のクエリでまとめて判定し、
+    残りを1つのトランザクションで一括登録します。
+
+    Args:
+        group_id: グループID
+        emails_text: 貼り付けたメールアドレス一覧、またはCSVの内容
+        invited_by: 招待者のユーザーID
+
+    Returns:
+        (成功, メッセージ, 結果の内訳)
+        内訳のキー: invited / already_invited / already_member / invalid
+    """
+    emails, invalid = parse_email_list(emails_text)
+    result = {'invited': [], 'already_invited': [], 'already_member': [], 'invalid': invalid}
+
+    if not emails:
+        return False, "有効なメールアドレスが見つかりません", result
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        # 招待済み・メンバー済みのアドレスを一括で判定
+        # （parse_email_listで小文字に揃えてあるので、招待は(group_id, email)のインデックスで引ける。
+        #   ユーザーのメールアドレスは登録時の大文字・小文字のままなので、グループのメンバーの中で比較する）
+        cursor.execute("""
+            SELECT c.value AS email,
+                   EXISTS(
+                       SELECT 1 FROM group_invitations gi
+                       WHERE gi.group_id = ? AND gi.email = c.value
+                   ) AS is_invited,
+                   EXISTS(
+                       SELECT 1 FROM group_members gm
+                       JOIN users u ON gm.user_id = u.id
+                       WHERE gm.group_id = ? AND lower(u.email) = c.value
+                   ) AS is_member
+            FROM json_each(?) c
+        """, (group_id, group_id, json.dumps(emails)))
+
+        for row in cursor.fetchall():
+            if row['is_member']:
+                result['already_member'].append(row['email'])
+            elif row['is_invited']:
+                result['already_invited'].append(row['email'])
+            else:
+                result['invited'].append(row['email'])
+
+        # 残りを一括で登録
+        if result['invited']:
+            cursor.execute("""
+                INSERT OR IGNORE INTO group_invitations (group_id, email, invited_by)
+                SELECT ?, value, ? FROM json_each(?)
+            """, (group_id, invited_by, json.dumps(result['invited'])))
+
+        conn.commit()
+        conn.close()
+
+        message = f"{len(result['invited'])}名に招待を送信しました"
+        return True, message, result
+    except Exception as e:
+        return False, f"エラーが発生しました: {str(e)}", result
+
 def get_user_invitations(email: str) -> List[Dict]:
     """ユーザーへの招待一覧を取得"""
     conn = get_connection()
@@ -444,7 +1324,7 @@ def get_user_invitations(email: str) -> List[Dict]:
         JOIN users u ON gi.invited_by = u.id
         WHERE gi.email = ? AND gi.status = 'pending'
         ORDER BY gi.created_at DESC
-    """, (email,))
+    """, (email.strip().lower(),))
     invitations = [dict(row) for row in cursor.fetchall()]
     conn.close()
     return invitations
@@ -482,11 +1362,10 @@ def accept_invitation(invitation_id: int, user_id: int) -> Tuple[bool, str]:
         if invitation['status'] != 'pending':
             return False, "この招待は既に処理されています"
 
-        # グループメンバーに追加
-        cursor.execute(
-            "INSERT INTO group_members (group_id, user_id) VALUES (?, ?)",
-            (invitation['group_id'], user_id)
-        )
+        # グループメンバーに追加（参加した時点で開催済みのミーティングには含めず、今後のミーティングに反映）
+        now = int(time.time())
+        _insert_group_member(cursor, invitation['group_id'], user_id, now)
+        _clear_future_overrides(cursor, invitation['group_id'], user_id, now)
 
         # 招待ステータスを更新
         cursor.execute(
@@ -578,27 +1457,86 @@ def get_group_progress(group_id: int) -> List[Dict]:
     conn.close()
     return progress
 
-# ミーティング関連の関数（Zoom連携追加）
+# 開催日時の変換
 
-def create_meeting(title: str, description: str, group_id: int, host_id: int, scheduled_at: str,
-                   zoom_url: str = None, zoom_meeting_id: str = None, zoom_passcode: str = None) -> Tuple[bool, str, Optional[int]]:
-    """新規ミーティングを作成（Zoom情報含む）"""
+def _get_zone(timezone_name: Optional[str]) -> tzinfo:
+    """タイムゾーン名からtzinfoを取得（タイムゾーンのデータがない環境では日本時間の固定オフセット）"""
+    try:
+        return ZoneInfo(timezone_name or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone(timedelta(hours=9))
+
+def to_epoch(value: Union[str, datetime, None], timezone_name: str = DEFAULT_TIMEZONE) -> Optional[int]:
+    """
+    開催日時をUTCのエポック秒に変換
+
+    Args:
+        value: 日時（isoformat()の文字列、日付と時刻の間が空白・秒なし・オフセット付きなども可）
+        timezone_name: タイムゾーンなしの日時をどのタイムゾーンの時刻とみなすか
+
+    Returns:
+        エポック秒（空・解釈できない場合はNone）
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text = str(value).strip()
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        try:
+            dt = datetime.fromisoformat(text)
+        except ValueError:
+            for fmt in _SCHEDULED_AT_FORMATS:
+                try:
+                    dt = datetime.strptime(text, fmt)
+                    break
+                except ValueError:
+                    continue
+            else:
+                return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=_get_zone(timezone_name))
+    return int(dt.timestamp())
+
+def from_epoch(ts: Optional[int], timezone_name: str = DEFAULT_TIMEZONE) -> Optional[datetime]:
+    """エポック秒を、指定したタイムゾーンの日時（タイムゾーン付き）に変換"""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, _get_zone(timezone_name))
+
+def get_meeting_datetime(meeting: Dict) -> Optional[datetime]:
+    """ミーティングの開催日時を、ミーティングのタイムゾーンの日時（タイムゾーン付き）で取得"""
+    timezone_name = meeting.get('timezone') or DEFAULT_TIMEZONE
+    ts = meeting.get('scheduled_ts')
+    if ts is None:
+        ts = to_epoch(meeting.get('scheduled_at'), timezone_name)
+    return from_epoch(ts, timezone_name)
+
+# ミーティング関連の関数（Zoom連携追加）
+
+def create_meeting(title: str, description: str, group_id: int, host_id: int, scheduled_at: str,
+                   zoom_url: str = None, zoom_meeting_id: str = None, zoom_passcode: str = None,
+                   timezone_name: str = DEFAULT_TIMEZONE) -> Tuple[bool, str, Optional[int]]:
+    """
+    新規ミーティングを作成（Zoom情報含む）
+    scheduled_atはtimezone_nameの時刻として解釈し、UTCのエポック秒（scheduled_ts）も保存する
+    """
     try:
         conn = get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
-            """INSERT INTO meetings (title, description, group_id, host_id, scheduled_at, zoom_url, zoom_meeting_id, zoom_passcode)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (title, description, group_id, host_id, scheduled_at, zoom_url, zoom_meeting_id, zoom_passcode)
+            """INSERT INTO meetings (title, description, group_id, host_id, scheduled_at, scheduled_ts, timezone,
+                                     zoom_url, zoom_meeting_id, zoom_passcode)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (title, description, group_id, host_id, scheduled_at, to_epoch(scheduled_at, timezone_name), timezone_name,
+             zoom_url, zoom_meeting_id, zoom_passcode)
         )
         meeting_id = cursor.lastrowid
 
-        # グループメンバーを自動的に参加者に追加
-        cursor.execute("""
-            INSERT INTO meeting_participants (meeting_id, user_id)
-            SELECT ?, user_id FROM group_members WHERE group_id = ?
-        """, (meeting_id, group_id))
+        # 参加者はグループメンバーから自動的に決まる（人数はトリガーで記録）
 
         conn.commit()
         conn.close()
@@ -629,13 +1567,11 @@ def get_meetings_by_group(group_id: int) -> List[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("""
-        SELECT m.*, u.name as host_name, COUNT(mp.user_id) as participant_count
+        SELECT m.*, u.name as host_name
         FROM meetings m
         JOIN users u ON m.host_id = u.id
-        LEFT JOIN meeting_participants mp ON m.id = mp.meeting_id
         WHERE m.group_id = ?
-        GROUP BY m.id
-        ORDER BY m.scheduled_at DESC, m.created_at DESC
+        ORDER BY m.scheduled_ts DESC, m.id DESC
     """, (group_id,))
     meetings = [dict(row) for row in cursor.fetchall()]
     conn.close()
@@ -646,20 +1582,94 @@ def get_meetings_by_user(user_id: int) -> List[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("""
-        SELECT m.*, u.name as host_name, g.name as group_name, COUNT(mp2.user_id) as participant_count
+        SELECT m.*, u.name as host_name, g.name as group_name
         FROM meetings m
-        JOIN meeting_participants mp ON m.id = mp.meeting_id
         JOIN users u ON m.host_id = u.id
         JOIN groups g ON m.group_id = g.id
-        LEFT JOIN meeting_participants mp2 ON m.id = mp2.meeting_id
-        WHERE mp.user_id = ?
-        GROUP BY m.id
-        ORDER BY m.scheduled_at DESC, m.created_at DESC
+        WHERE m.id IN (SELECT meeting_id FROM meeting_participants WHERE user_id = ?)
+        ORDER BY m.scheduled_ts DESC, m.id DESC
     """, (user_id,))
     meetings = [dict(row) for row in cursor.fetchall()]
     conn.close()
     return meetings
 
+def _keyset_before(column: str, id_column: str, cursor: Optional[Tuple]) -> Tuple[str, tuple]:
+    """
+    (column DESC, id DESC) 順のキーセットページング条件を作成
+    columnがNULLの行は末尾に並ぶ（SQLiteの降順の並び）ものとして扱う
+    """
+    if cursor is None:
+        return "1 = 1", ()
+    value, last_id = cursor
+    if value is None:
+        return f"({column} IS NULL AND {id_column} < ?)", (last_id,)
+    return f"(({column}, {id_column}) < (?, ?) OR {column} IS NULL)", (value, last_id)
+
+def _next_cursor(rows: List[Dict], limit: int, column: str) -> Tuple[List[Dict], Optional[Tuple]]:
+    """limit+1件取得した結果から、表示する行と次ページのカーソルを返す"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, (rows[-1][column], rows[-1]['id'])
+
+def get_meetings_page_by_user(user_id: int, limit: int = 20, cursor: Optional[Tuple] = None) -> Tuple[List[Dict], Optional[Tuple]]:
+    """
+    ユーザーが参加するミーティングをページ単位で取得（開催日時の新しい順）
+
+    Args:
+        user_id: ユーザーID
+        limit: 1ページの件数
+        cursor: 前のページで返されたカーソル（最初のページはNone）
+
+    Returns:
+        (ミーティングのリスト, 次のページのカーソル（最後のページはNone）)
+    """
+    condition, params = _keyset_before("m.scheduled_ts", "m.id", cursor)
+    conn = get_connection()
+    db_cursor = conn.cursor()
+    db_cursor.execute(f"""
+        SELECT m.*, u.name as host_name, g.name as group_name,
+               EXISTS(SELECT 1 FROM recordings r WHERE r.meeting_id = m.id) as has_recording
+        FROM meetings m
+        JOIN users u ON m.host_id = u.id
+        JOIN groups g ON m.group_id = g.id
+        WHERE m.id IN (SELECT meeting_id FROM meeting_participants WHERE user_id = ?)
+          AND {condition}
+        ORDER BY m.scheduled_ts DESC, m.id DESC
+        LIMIT ?
+    """, (user_id, *params, limit + 1))
+    meetings = [dict(row) for row in db_cursor.fetchall()]
+    conn.close()
+    return _next_cursor(meetings, limit, 'scheduled_ts')
+
+def get_meetings_page_by_group(group_id: int, limit: int = 20, cursor: Optional[Tuple] = None) -> Tuple[List[Dict], Optional[Tuple]]:
+    """
+    グループのミーティングをページ単位で取得（開催日時の新しい順）
+
+    Args:
+        group_id: グループID
+        limit: 1ページの件数
+        cursor: 前のページで返されたカーソル（最初のページはNone）
+
+    Returns:
+        (ミーティングのリスト, 次のページのカーソル（最後のページはNone）)
+    """
+    condition, params = _keyset_before("m.scheduled_ts", "m.id", cursor)
+    conn = get_connection()
+    db_cursor = conn.cursor()
+    db_cursor.execute(f"""
+        SELECT m.*, u.name as host_name
+        FROM meetings m
+        JOIN users u ON m.host_id = u.id
+        WHERE m.group_id = ?
+          AND {condition}
+        ORDER BY m.scheduled_ts DESC, m.id DESC
+        LIMIT ?
+    """, (group_id, *params, limit + 1))
+    meetings = [dict(row) for row in db_cursor.fetchall()]
+    conn.close()
+    return _next_cursor(meetings, limit, 'scheduled_ts')
+
 def get_meeting_by_id(meeting_id: int) -> Optional[Dict]:
     """ミーティングIDからミーティング情報を取得"""
     conn = get_connection()
@@ -693,6 +1703,39 @@ def get_meeting_participants(meeting_id: int) -> List[Dict]:
     conn.close()
     return participants
 
+def set_meeting_participant(meeting_id: int, user_id: int, included: bool) -> Tuple[bool, str]:
+    """
+    ミーティングの参加者を個別に追加・除外（グループメンバー以外の招待や欠席者の除外用）
+
+    Args:
+        meeting_id: ミーティングID
+        user_id: ユーザーID
+        included: Trueで参加者に追加、Falseで参加者から除外
+
+    Returns:
+        (成功, メッセージ)
+    """
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT id FROM meetings WHERE id = ?", (meeting_id,))
+        if not cursor.fetchone():
+            conn.close()
+            return False, "ミーティングが見つかりません"
+
+        cursor.execute("""
+            INSERT INTO meeting_participant_overrides (meeting_id, user_id, included)
+            VALUES (?, ?, ?)
+            ON CONFLICT(meeting_id, user_id) DO UPDATE SET included = excluded.included
+        """, (meeting_id, user_id, included))
+
+        conn.commit()
+        conn.close()
+        return True, "参加者を追加しました" if included else "参加者から除外しました"
+    except Exception as e:
+        return False, f"エラーが発生しました: {str(e)}"
+
 def save_recording(meeting_id: int, audio_file_path: Optional[str], transcript: str, created_by: int) -> Tuple[bool, str, Optional[int]]:
     """録音・議事録を保存"""
     try:
@@ -721,6 +1764,9 @@ def save_recording(meeting_id: int, audio_file_path: Optional[str], transcript:
             recording_id = cursor.lastrowid
             message = "議事録を保存しました"
 
+        # 議事録が変わったので、キャッシュした回答は使えない
+        cursor.execute("DELETE FROM ai_answer_cache WHERE meeting_id = ?", (meeting_id,))
+
         conn.commit()
         conn.close()
         return True, message, recording_id
@@ -754,22 +1800,189 @@ def update_recording_summary(meeting_id: int, summary: str) -> Tuple[bool, str]:
             SET summary = ?, updated_at = CURRENT_TIMESTAMP
             WHERE meeting_id = ?
         """, (summary, meeting_id))
+        cursor.execute("DELETE FROM ai_answer_cache WHERE meeting_id = ?", (meeting_id,))
         conn.commit()
         conn.close()
         return True, "サマリーを更新しました"
     except Exception as e:
         return False, f"エラーが発生しました: {str(e)}"
 
+# AI利用状況の計測
+
+# モデルごとの料金（USD）：チャットは100万トークンあたりの[入力, 出力]、Whisperは1分あたり
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+WHISPER_PRICE_PER_MINUTE = 0.006
+
+def record_ai_metric(feature: str, model: str, meeting_id: Optional[int], latency_ms: float,
+                     prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None,
+                     audio_seconds: Optional[float] = None, success: bool = True, error: str = None) -> bool:
+    """OpenAI APIの呼び出し1回分の計測結果を記録（記録に失敗しても本来の処理は止めない）"""
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO ai_metrics
+                (feature, model, meeting_id, latency_ms, prompt_tokens, completion_tokens, audio_seconds, success, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (feature, model, meeting_id, latency_ms, prompt_tokens, completion_tokens,
+              audio_seconds, 1 if success else 0, error))
+        conn.commit()
+        conn.close()
+        return True
+    except Exception:
+        return False
+
+
+def _estimate_cost(model: str, prompt_tokens: Optional[int], completion_tokens: Optional[int],
+                   audio_seconds: Optional[float]) -> float:
+    """1回の呼び出しのおおよその料金（USD）"""
+    if audio_seconds:
+        return audio_seconds / 60 * WHISPER_PRICE_PER_MINUTE
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return ((prompt_tokens or 0) * input_price + (completion_tokens or 0) * output_price) / 1_000_000
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """並べ替え済みの値からパーセンタイル（最近傍順位法）を求める"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+def get_ai_usage_report(group_by: str = "feature", since: Optional[str] = None) -> List[Dict]:
+    """
+    AI利用状況の集計
+
+    Args:
+        group_by: 集計の単位（"feature"、"meeting"、"model"）
+        since: この日時（'YYYY-MM-DD HH:MM:SS'）以降の記録だけを集計
+
+    Returns:
+        集計単位ごとの呼び出し回数・失敗数・レイテンシ（p50/p95）・トークン数・音声秒数・推定料金
+    """
+    group_columns = {"feature": "feature", "meeting": "meeting_id", "model": "model"}
+    if group_by not in group_columns:
+        raise ValueError(f"group_by must be one of {sorted(group_columns)}")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    query = "SELECT * FROM ai_metrics"
+    params = ()
+    if since:
+        query += " WHERE created_at >= ?"
+        params = (since,)
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    conn.close()
+
+    groups: Dict = {}
+    for row in rows:
+        key = row[group_columns[group_by]]
+        group = groups.setdefault(key, {
+            group_by: key, "calls": 0, "failures": 0, "latencies": [],
+            "prompt_tokens": 0, "completion_tokens": 0, "audio_seconds": 0.0, "cost_usd": 0.0
+        })
+        group["calls"] += 1
+        group["failures"] += 0 if row["success"] else 1
+        group["latencies"].append(row["latency_ms"])
+        group["prompt_tokens"] += row["prompt_tokens"] or 0
+        group["completion_tokens"] += row["completion_tokens"] or 0
+        group["audio_seconds"] += row["audio_seconds"] or 0.0
+        group["cost_usd"] += _estimate_cost(row["model"], row["prompt_tokens"],
+                                            row["completion_tokens"], row["audio_seconds"])
+
+    report = []
+    for group in groups.values():
+        latencies = sorted(group.pop("latencies"))
+        group["p50_ms"] = _percentile(latencies, 50)
+        group["p95_ms"] = _percentile(latencies, 95)
+        report.append(group)
+
+    report.sort(key=lambda g: g["cost_usd"], reverse=True)
+    return report
+
 # AI対話関連の関数
 
-def save_chat_message(meeting_id: int, user_id: int, message: str, is_ai: bool = False) -> Tuple[bool, str]:
-    """チャットメッセージを保存"""
+def create_chat_thread(meeting_id: int, user_id: int, title: str = None) -> Tuple[bool, str, Optional[int]]:
+    """新しい会話スレッドを作成"""
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO chat_threads (meeting_id, user_id, title) VALUES (?, ?, ?)",
+            (meeting_id, user_id, title)
+        )
+        thread_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return True, "新しい会話を始めました", thread_id
+    except Exception as e:
+        return False, f"エラーが発生しました: {str(e)}", None
+
+def get_chat_threads(meeting_id: int, user_id: int) -> List[Dict]:
+    """ユーザーの会話スレッド一覧を取得（新しい順）"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT * FROM chat_threads
+        WHERE meeting_id = ? AND user_id = ?
+        ORDER BY created_at DESC, id DESC
+    """, (meeting_id, user_id))
+    threads = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return threads
+
+def get_chat_thread(thread_id: int) -> Optional[Dict]:
+    """会話スレッドの情報（要約を含む）を取得"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM chat_threads WHERE id = ?", (thread_id,))
+    thread = cursor.fetchone()
+    conn.close()
+
+    if thread:
+        return dict(thread)
+    return None
+
+def get_or_create_chat_thread(meeting_id: int, user_id: int) -> int:
+    """ユーザーの最新の会話スレッドを取得（なければ作成）してIDを返す"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id FROM chat_threads
+        WHERE meeting_id = ? AND user_id = ?
+        ORDER BY created_at DESC, id DESC
+        LIMIT 1
+    """, (meeting_id, user_id))
+    thread = cursor.fetchone()
+
+    if thread:
+        thread_id = thread['id']
+    else:
+        cursor.execute(
+            "INSERT INTO chat_threads (meeting_id, user_id) VALUES (?, ?)",
+            (meeting_id, user_id)
+        )
+        thread_id = cursor.lastrowid
+        conn.commit()
+
+    conn.close()
+    return thread_id
+
+def save_chat_message(meeting_id: int, user_id: int, message: str, is_ai: bool = False,
+                      thread_id: int = None) -> Tuple[bool, str]:
+    """チャットメッセージを保存（thread_idを省略するとユーザーの最新スレッドに保存）"""
     try:
+        if thread_id is None:
+            thread_id = get_or_create_chat_thread(meeting_id, user_id)
+
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute(
-            "INSERT INTO chat_history (meeting_id, user_id, message, is_ai) VALUES (?, ?, ?, ?)",
-            (meeting_id, user_id, message, is_ai)
+            "INSERT INTO chat_history (meeting_id, user_id, message, is_ai, thread_id) VALUES (?, ?, ?, ?, ?)",
+            (meeting_id, user_id, message, is_ai, thread_id)
         )
         conn.commit()
         conn.close()
@@ -777,6 +1990,12 @@ def save_chat_message(meeting_id: int, user_id: int, message: str, is_ai: bool =
     except Exception as e:
         return False, f"エラーが発生しました: {str(e)}"
 
+def _chat_scope(meeting_id: int, thread_id: Optional[int]) -> Tuple[str, tuple]:
+    """チャット履歴の絞り込み条件（スレッド指定時はスレッドのインデックスを使う）"""
+    if thread_id is not None:
+        return "ch.thread_id = ?", (thread_id,)
+    return "ch.meeting_id = ?", (meeting_id,)
+
 def get_chat_history(meeting_id: int) -> List[Dict]:
     """チャット履歴を取得"""
     conn = get_connection()
@@ -792,114 +2011,219 @@ def get_chat_history(meeting_id: int) -> List[Dict]:
     conn.close()
     return history
 
-def generate_ai_response_with_gpt4o(meeting_id: int, user_message: str, chat_history: List[Dict] = None) -> Tuple[bool, str, str]:
+def get_chat_history_page(meeting_id: int, limit: int = 20, cursor: Optional[Tuple] = None,
+                          thread_id: Optional[int] = None) -> Tuple[List[Dict], Optional[Tuple]]:
     """
-    GPT-4oを使って議事録に基づいたAI応答を生成
+    チャット履歴をページ単位で取得（新しいものから遡る）
 
     Args:
         meeting_id: ミーティングID
-        user_message: ユーザーの質問
-        chat_history: 過去のチャット履歴
+        limit: 1ページの件数
+        cursor: 前のページで返されたカーソル（最初のページはNone）
+        thread_id: 会話スレッドID（指定するとそのスレッドの履歴だけを取得）
 
     Returns:
-        (成功, メッセージ, AI応答)
+        (古い順に並べたメッセージのリスト, さらに古いページのカーソル（最後のページはNone）)
     """
-    try:
-        # APIキーを取得
-        api_key = get_openai_api_key()
-        if not api_key:
-            return False, "OPENAI_API_KEYが設定されていません。", ""
-
-        # OpenAIクライアントを初期化
-        client = OpenAI(api_key=api_key)
-
-        # 議事録を取得
-        recording = get_recording_by_meeting(meeting_id)
-        transcript = recording['transcript'] if recording and recording['transcript'] else ""
-        summary = recording['summary'] if recording and recording['summary'] else ""
-
-        # システムプロンプトを構築（シニア向け、議事録コンテキスト付き）
-        system_prompt = f"""あなたは高齢者向けのAI学習会をサポートする優しいアシスタントです。
-以下の議事録の内容に基づいて、ユーザーの質問に答えてください。
+    scope, scope_params = _chat_scope(meeting_id, thread_id)
+    condition, params = _keyset_before("ch.created_at", "ch.id", cursor)
+    conn = get_connection()
+    db_cursor = conn.cursor()
+    db_cursor.execute(f"""
+        SELECT ch.*, u.name as user_name
+        FROM chat_history ch
+        JOIN users u ON ch.user_id = u.id
+        WHERE {scope}
+          AND {condition}
+        ORDER BY ch.created_at DESC, ch.id DESC
+        LIMIT ?
+    """, (*scope_params, *params, limit + 1))
+    history = [dict(row) for row in db_cursor.fetchall()]
+    conn.close()
+    history, next_cursor = _next_cursor(history, limit, 'created_at')
+    history.reverse()
+    return history, next_cursor
 
-【重要な注意点】
-- 高齢者にもわかりやすい、丁寧で優しい言葉を使ってください
-- 専門用語は避け、必要な場合は簡単な説明を添えてください
-- 回答は簡潔にまとめ、箇条書きなどを活用して見やすくしてください
-- 議事録に関係ない質問でも、親切に対応してください
-- 励ましの言葉を適度に入れてください
+def get_chat_history_since(meeting_id: int, cursor: Tuple,
+                           thread_id: Optional[int] = None) -> List[Dict]:
+    """
+    表示中の履歴より新しいメッセージを取得（読み込み済みのページを取り直さずに追記するため）
 
-【議事録の内容】
-{summary if summary else transcript if transcript else '（議事録はまだ作成されていません）'}
+    Args:
+        meeting_id: ミーティングID
+        cursor: 表示中の最も新しいメッセージの (created_at, id)
+        thread_id: 会話スレッドID（指定するとそのスレッドの履歴だけを取得）
 
-【文字起こしテキスト】
-{transcript[:2000] if transcript else '（文字起こしはまだありません）'}
-"""
+    Returns:
+        古い順に並べたメッセージのリスト
+    """
+    scope, scope_params = _chat_scope(meeting_id, thread_id)
+    conn = get_connection()
+    db_cursor = conn.cursor()
+    db_cursor.execute(f"""
+        SELECT ch.*, u.name as user_name
+        FROM chat_history ch
+        JOIN users u ON ch.user_id = u.id
+        WHERE {scope}
+          AND (ch.created_at, ch.id) > (?, ?)
+        ORDER BY ch.created_at ASC, ch.id ASC
+    """, (*scope_params, *cursor))
+    history = [dict(row) for row in db_cursor.fetchall()]
+    conn.close()
+    return history
 
-        # メッセージを構築
-        messages = [{"role": "system", "content": system_prompt}]
+def get_recent_chat_history(meeting_id: int, limit: int = CHAT_CONTEXT_TURNS,
+                            thread_id: Optional[int] = None) -> List[Dict]:
+    """
+    AIへの文脈として使う直近のチャット履歴を取得（古い順）
 
-        # チャット履歴があれば追加（最新10件まで）
-        if chat_history:
-            for msg in chat_history[-10:]:
-                role = "assistant" if msg.get('is_ai') else "user"
-                messages.append({"role": role, "content": msg['message']})
+    インデックス (meeting_id, created_at) または (thread_id, created_at) を
+    新しい順にたどり、必要な件数だけを読み込みます。
 
-        # ユーザーの新しい質問を追加
-        messages.append({"role": "user", "content": user_message})
+    Args:
+        meeting_id: ミーティングID
+        limit: 取得する件数
+        thread_id: 会話スレッドID（指定するとそのスレッドの履歴だけを取得）
 
-        # GPT-4oで応答を生成
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-            temperature=0.7,
-            max_tokens=1000
-        )
+    Returns:
+        メッセージのリスト（message, is_ai を含む）
+    """
+    scope, scope_params = _chat_scope(meeting_id, thread_id)
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT ch.id, ch.message, ch.is_ai, ch.created_at
+        FROM chat_history ch
+        WHERE {scope}
+        ORDER BY ch.created_at DESC, ch.id DESC
+        LIMIT ?
+    """, (*scope_params, limit))
+    history = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    history.reverse()
+    return history
 
-        ai_response = response.choices[0].message.content.strip()
 
-        return True, "応答を生成しました", ai_response
+# AI回答キャッシュ関連の関数
 
-    except Exception as e:
-        error_msg = str(e)
-        if "api_key" in error_msg.lower():
-            return False, "OpenAI APIキーが無効です。設定を確認してください。", ""
-        return False, f"エラーが発生しました: {error_msg}", ""
+# 質問の最後につく依頼の言い回し（取り除いてから比べる）
+_QUESTION_SUFFIXES = ("を教えてください", "を教えて", "教えてください", "教えて", "ですか", "ますか", "は")
+# 文末の句読点（NFKC後の形。「+」「-」「#」などの記号は意味が変わるため残す）
+_QUESTION_TRAILING_PUNCTUATION = "?!.。、…"
 
+def normalize_question(question: str) -> str:
+    """
+    キャッシュのキーにするため質問を正規化
+    （全角・半角と大文字・小文字をそろえ、空白と文末の句読点・語尾の言い回しを取り除く）
+    """
+    text = unicodedata.normalize("NFKC", question).lower()
+    text = "".join(ch for ch in text if not ch.isspace())
+    text = text.rstrip(_QUESTION_TRAILING_PUNCTUATION)
+    for suffix in _QUESTION_SUFFIXES:
+        if text.endswith(suffix) and len(text) > len(suffix):
+            text = text[:-len(suffix)]
+            break
+    return text
+
+def _answer_source_hash(recording: Optional[Dict]) -> str:
+    """回答のもとになる議事録（サマリーと文字起こし）のハッシュ"""
+    summary = recording['summary'] if recording and recording['summary'] else ""
+    transcript = recording['transcript'] if recording and recording['transcript'] else ""
+    return hashlib.sha256(f"{summary}\0{transcript}".encode("utf-8")).hexdigest()
 
-def generate_ai_response(meeting_id: int, user_message: str) -> str:
+def get_cached_answer(meeting_id: int, question: str, recording: Optional[Dict] = None) -> Optional[str]:
     """
-    AI応答を生成（後方互換性のためのラッパー関数）
-    GPT-4oを使用し、失敗した場合はフォールバック応答を返す
+    キャッシュから回答を取得（なければNone）
+
+    同じ議事録に対する、正規化後に同じ質問の回答だけを返します。
+    （似ているだけの質問は、聞いている内容が違うことがあるため使いません）
     """
-    # チャット履歴を取得
-    chat_history = get_chat_history(meeting_id)
+    question_key = normalize_question(question)
+    if not question_key:
+        return None
+    if recording is None:
+        recording = get_recording_by_meeting(meeting_id)
 
-    # GPT-4oで応答を生成
-    success, message, ai_response = generate_ai_response_with_gpt4o(meeting_id, user_message, chat_history)
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, answer FROM ai_answer_cache
+        WHERE meeting_id = ? AND question_key = ? AND source_hash = ?
+    """, (meeting_id, question_key, _answer_source_hash(recording)))
+    entry = cursor.fetchone()
+    if entry is None:
+        conn.close()
+        return None
 
-    if success:
-        return ai_response
+    cursor.execute("""
+        UPDATE ai_answer_cache
+        SET hits = hits + 1, last_used_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """, (entry['id'],))
+    conn.commit()
+    conn.close()
+    return entry['answer']
 
-    # フォールバック応答（API接続失敗時）
-    recording = get_recording_by_meeting(meeting_id)
-    transcript = recording['transcript'] if recording and recording['transcript'] else ""
+def save_cached_answer(meeting_id: int, question: str, answer: str, recording: Optional[Dict] = None) -> bool:
+    """
+    回答をキャッシュに保存
+    ミーティングごとにANSWER_CACHE_MAX_PER_MEETING件を超えたら、最も長く使われていないものから削除します。
+    """
+    question_key = normalize_question(question)
+    if not question_key:
+        return False
+    if recording is None:
+        recording = get_recording_by_meeting(meeting_id)
 
-    fallback_responses = [
-        f"申し訳ありません。現在AIとの接続に問題が発生しています。\n\n議事録の内容を確認したいときは、「📝 議事録」タブをご覧ください。\n\n({message})",
-        f"ただいまAIが応答できない状態です。しばらくお待ちいただいてから、もう一度お試しください。\n\n({message})"
-    ]
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO ai_answer_cache (meeting_id, question_key, question, source_hash, answer)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(meeting_id, question_key) DO UPDATE SET
+                question = excluded.question,
+                source_hash = excluded.source_hash,
+                answer = excluded.answer,
+                hits = 0,
+                created_at = CURRENT_TIMESTAMP,
+                last_used_at = CURRENT_TIMESTAMP
+        """, (meeting_id, question_key, question, _answer_source_hash(recording), answer))
+        cursor.execute("""
+            DELETE FROM ai_answer_cache
+            WHERE meeting_id = ? AND id NOT IN (
+                SELECT id FROM ai_answer_cache
+                WHERE meeting_id = ?
+                ORDER BY last_used_at DESC, id DESC
+                LIMIT ?
+            )
+        """, (meeting_id, meeting_id, ANSWER_CACHE_MAX_PER_MEETING))
+        conn.commit()
+        conn.close()
+        return True
+    except Exception:
+        return False
 
-    import random
-    return random.choice(fallback_responses)
+def clear_answer_cache(meeting_id: int) -> bool:
+    """ミーティングの回答キャッシュを削除"""
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM ai_answer_cache WHERE meeting_id = ?", (meeting_id,))
+        conn.commit()
+        conn.close()
+        return True
+    except Exception:
+        return False
 
 
-def clear_chat_history(meeting_id: int) -> Tuple[bool, str]:
+def clear_chat_history(meeting_id: int, thread_id: Optional[int] = None) -> Tuple[bool, str]:
     """
-    ミーティングのチャット履歴をクリア
+    チャット履歴をクリア
 
     Args:
         meeting_id: ミーティングID
+        thread_id: 会話スレッドID（指定するとそのスレッドだけをクリア）
 
     Returns:
         (成功, メッセージ)
@@ -907,8 +2231,20 @@ def clear_chat_history(meeting_id: int) -> Tuple[bool, str]:
     try:
         conn = get_connection()
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM chat_history WHERE meeting_id = ?", (meeting_id,))
-        deleted_count = cursor.rowcount
+        if thread_id is not None:
+            cursor.execute("DELETE FROM chat_history WHERE thread_id = ?", (thread_id,))
+            deleted_count = cursor.rowcount
+            cursor.execute(
+                "UPDATE chat_threads SET summary = NULL, summarized_until_id = 0 WHERE id = ?",
+                (thread_id,)
+            )
+        else:
+            cursor.execute("DELETE FROM chat_history WHERE meeting_id = ?", (meeting_id,))
+            deleted_count = cursor.rowcount
+            cursor.execute(
+                "UPDATE chat_threads SET summary = NULL, summarized_until_id = 0 WHERE meeting_id = ?",
+                (meeting_id,)
+            )
         conn.commit()
         conn.close()
         return True, f"チャット履歴をクリアしました（{deleted_count}件削除）"
@@ -1040,204 +2376,380 @@ def get_original_meeting(follow_up_meeting_id: int) -> Optional[Dict]:
         return dict(meeting)
     return None
 
+def _participant_meeting_ids_in_range(user_id: int, start_ts: int, end_ts: int) -> Tuple[str, tuple]:
+    """
+    ユーザーが参加する、開催日時が[start_ts, end_ts]のミーティングIDを返すサブクエリ
+    meeting_participantsビューと同じ条件を、所属グループ（退会したグループを含む）ごとの
+    (group_id, scheduled_ts)の範囲検索で求める（ビュー経由だと全期間のミーティングを列挙してから絞り込むため）
+    """
+    return f"""
+        SELECT rm.id
+        FROM group_members gm
+        JOIN meetings rm ON rm.group_id = gm.group_id AND rm.scheduled_ts BETWEEN ? AND ?
+        WHERE gm.user_id = ?
+          AND {_member_rule('gm', 'rm')}
+          AND NOT EXISTS (
+              SELECT 1 FROM meeting_participant_overrides o
+              WHERE o.meeting_id = rm.id AND o.user_id = gm.user_id AND o.included = 0
+          )
+        UNION ALL
+        SELECT rm.id
+        FROM group_membership_history h
+        JOIN meetings rm ON rm.group_id = h.group_id AND rm.scheduled_ts BETWEEN ? AND ?
+        WHERE h.user_id = ?
+          AND {_former_member_rule('h', 'rm')}
+          AND NOT EXISTS (
+              SELECT 1 FROM meeting_participant_overrides o
+              WHERE o.meeting_id = rm.id AND o.user_id = h.user_id AND o.included = 0
+          )
+        UNION ALL
+        SELECT o.meeting_id
+        FROM meeting_participant_overrides o
+        JOIN meetings rm ON rm.id = o.meeting_id
+        WHERE o.user_id = ? AND o.included = 1 AND rm.scheduled_ts BETWEEN ? AND ?
+    """, (start_ts, end_ts, user_id, start_ts, end_ts, user_id, user_id, start_ts, end_ts)
+
 def get_upcoming_meetings(user_id: int, days_ahead: int = 7) -> List[Dict]:
     """今後のミーティングを取得"""
-    from datetime import datetime, timedelta
-
     conn = get_connection()
     cursor = conn.cursor()
 
-    # 現在時刻とN日後の時刻
-    now = datetime.now().isoformat()
-    future = (datetime.now() + timedelta(days=days_ahead)).isoformat()
+    # 現在時刻とN日後の時刻（エポック秒）
+    now = int(time.time())
+    future = now + days_ahead * 86400
+    participant_sql, participant_params = _participant_meeting_ids_in_range(user_id, now, future)
 
-    cursor.execute("""
-        SELECT m.*, u.name as host_name, g.name as group_name,
-               COUNT(mp2.user_id) as participant_count
+    cursor.execute(f"""
+        SELECT m.*, u.name as host_name, g.name as group_name
         FROM meetings m
-        JOIN meeting_participants mp ON m.id = mp.meeting_id
         JOIN users u ON m.host_id = u.id
         JOIN groups g ON m.group_id = g.id
-        LEFT JOIN meeting_participants mp2 ON m.id = mp2.meeting_id
-        WHERE mp.user_id = ?
-          AND m.scheduled_at IS NOT NULL
-          AND m.scheduled_at >= ?
-          AND m.scheduled_at <= ?
-        GROUP BY m.id
-        ORDER BY m.scheduled_at ASC
-    """, (user_id, now, future))
+        WHERE m.id IN ({participant_sql})
+        ORDER BY m.scheduled_ts ASC
+    """, participant_params)
     meetings = [dict(row) for row in cursor.fetchall()]
+    meetings.extend(_series_occurrences_in_range(cursor, user_id, now, future + 1))
     conn.close()
+    meetings.sort(key=lambda m: m['scheduled_ts'])
     return meetings
 
-def transcribe_audio_with_whisper(audio_file_path: str) -> Tuple[bool, str, Optional[str]]:
+def get_meetings_in_range(user_id: int, start: Union[int, datetime], end: Union[int, datetime]) -> List[Dict]:
     """
-    Whisper APIを使って音声ファイルを文字起こし
+    期間内のミーティングを取得（カレンダー表示用）
+    ユーザーが参加するミーティングと、ホストとして開催するミーティングを開催日時の順に返す
 
     Args:
-        audio_file_path: 音声ファイルのパス
+        user_id: ユーザーID
+        start: 期間の開始（エポック秒、またはdatetime）
+        end: 期間の終了（この日時は含まない）
 
     Returns:
-        (成功, メッセージ, 文字起こしテキスト)
+        ミーティングのリスト（id, title, group_id, group_name, host_id, scheduled_ts, timezone, participant_count,
+        series_id, occurrence_ts）。まだ作成されていない繰り返しミーティングの回はidがNone
     """
-    try:
-        # APIキーを取得（Streamlit Cloud優先）
-        api_key = get_openai_api_key()
-        if not api_key:
-            return False, "OPENAI_API_KEYが設定されていません。Streamlit Cloudの場合はSecretsに、ローカルの場合は.envファイルに設定してください。", None
-
-        # OpenAIクライアントを初期化
-        client = OpenAI(api_key=api_key)
-
-        # ファイルサイズチェック（25MB = 26,214,400 bytes）
-        file_size = os.path.getsize(audio_file_path)
-        max_size = 25 * 1024 * 1024  # 25MB
-
-        if file_size > max_size:
-            return False, f"ファイルサイズが大きすぎます（上限25MB）。現在のサイズ: {file_size / (1024*1024):.1f}MB", None
-
-        # 音声ファイルを開いて文字起こし
-        with open(audio_file_path, "rb") as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language="ja"  # 日本語に指定
-            )
+    start_ts = start if isinstance(start, int) else to_epoch(start)
+    end_ts = end if isinstance(end, int) else to_epoch(end)
+    participant_sql, participant_params = _participant_meeting_ids_in_range(user_id, start_ts, end_ts - 1)
 
-        return True, "文字起こしが完了しました", transcript.text
+    # 作成済みのミーティング・期間にかかる繰り返しミーティング・作成済みの回を1つの文で取得
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        WITH user_series AS (
+            SELECT * FROM meeting_series
+            WHERE (host_id = ? OR group_id IN (SELECT group_id FROM group_members WHERE user_id = ?))
+              AND start_ts < ?
+              AND (until_ts IS NULL OR until_ts >= ?)
+        )
+        SELECT 'meeting' as kind, m.id, m.title, m.group_id, g.name as group_name, m.host_id,
+               m.scheduled_ts, m.timezone, m.participant_count, m.series_id, m.occurrence_ts,
+               NULL as freq, NULL as interval, NULL as occurrence_count, NULL as until_ts
+        FROM meetings m
+        JOIN groups g ON m.group_id = g.id
+        WHERE m.id IN (
+            {participant_sql}
+            UNION ALL
+            SELECT id FROM meetings WHERE host_id = ? AND scheduled_ts BETWEEN ? AND ?
+        )
+        UNION ALL
+        SELECT 'series', NULL, s.title, s.group_id, g.name, s.host_id,
+               s.start_ts, s.timezone,
+               (SELECT COUNT(*) FROM group_members gm WHERE gm.group_id = s.group_id), s.id, NULL,
+               s.freq, s.interval, s.occurrence_count, s.until_ts
+        FROM user_series s
+        JOIN groups g ON s.group_id = g.id
+        UNION ALL
+        SELECT 'materialized', NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, m.series_id, m.occurrence_ts,
+               NULL, NULL, NULL, NULL
+        FROM meetings m
+        WHERE m.series_id IN (SELECT id FROM user_series) AND m.occurrence_ts >= ? AND m.occurrence_ts < ?
+    """, (user_id, user_id, end_ts, start_ts, *participant_params, user_id, start_ts, end_ts - 1, start_ts, end_ts))
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
 
-    except FileNotFoundError:
-        return False, f"音声ファイルが見つかりません: {audio_file_path}", None
-    except Exception as e:
-        error_msg = str(e)
-        if "api_key" in error_msg.lower():
-            return False, "OpenAI APIキーが無効です。.envファイルを確認してください。", None
-        return False, f"文字起こし中にエラーが発生しました: {error_msg}", None
+    meetings = [{column: row[column] for column in _CALENDAR_COLUMNS} for row in rows if row['kind'] == 'meeting']
+    # 作成済みの回（記録が追加された回）はmeetingsの方を使う
+    materialized = {(row['series_id'], row['occurrence_ts']) for row in rows if row['kind'] == 'materialized'}
+    for row in rows:
+        if row['kind'] != 'series':
+            continue
+        series = dict(row, id=row['series_id'], start_ts=row['scheduled_ts'])
+        for ts in expand_series_occurrences(series, start_ts, end_ts):
+            if (series['id'], ts) not in materialized:
+                meetings.append(dict({column: row[column] for column in _CALENDAR_COLUMNS},
+                                     scheduled_ts=ts, occurrence_ts=ts))
+    meetings.sort(key=lambda m: (m['scheduled_ts'], m['id'] or 0))
+    return meetings
 
-def save_audio_and_transcribe(meeting_id: int, audio_file, created_by: int) -> Tuple[bool, str, Optional[str]]:
+# 繰り返しミーティング
+
+_CALENDAR_COLUMNS = (
+    'id', 'title', 'group_id', 'group_name', 'host_id',
+    'scheduled_ts', 'timezone', 'participant_count', 'series_id', 'occurrence_ts',
+)
+
+def _series_occurrence_local(first: datetime, freq: str, interval: int, index: int) -> datetime:
+    """繰り返しのindex回目（0始まり）の開催日時（タイムゾーンなしの現地時刻）"""
+    if freq == 'MONTHLY':
+        month_index = first.month - 1 + index * interval
+        return first.replace(year=first.year + month_index // 12, month=month_index % 12 + 1)
+    return first + timedelta(days=index * interval * (7 if freq == 'WEEKLY' else 1))
+
+def describe_series_recurrence(freq: str, interval: int = 1, occurrence_count: Optional[int] = None,
+                               until_ts: Optional[int] = None, timezone_name: str = DEFAULT_TIMEZONE) -> str:
+    """繰り返しの説明（招待メールなどに表示する。例：「毎週・全12回」「2週間ごと・2026年12月31日まで」）"""
+    every, unit = {'DAILY': ("毎日", "日"), 'WEEKLY': ("毎週", "週間"), 'MONTHLY': ("毎月", "か月")}[freq]
+    interval = max(1, interval or 1)
+    description = every if interval == 1 else f"{interval}{unit}ごと"
+    if occurrence_count is not None:
+        description += f"・全{occurrence_count}回"
+    elif until_ts is not None:
+        description += f"・{from_epoch(until_ts, timezone_name).strftime('%Y年%m月%d日')}まで"
+    return description
+
+def expand_series_occurrences(series: Dict, start_ts: int, end_ts: int) -> List[int]:
     """
-    音声ファイルを保存してWhisper APIで文字起こし、議事録として保存
+    繰り返しミーティングのうち、開催日時が[start_ts, end_ts)の回を計算
 
-    Args:
-        meeting_id: ミーティングID
-        audio_file: Streamlitのアップロードファイルオブジェクト
-        created_by: 作成者のユーザーID
+    日付の計算はミーティングのタイムゾーンの現地時刻で行う（夏時間のある地域でも同じ時刻に開催）。
+    期間の前の回は、開始からの経過時間で読み飛ばす。
 
     Returns:
-        (成功, メッセージ, 文字起こしテキスト)
+        各回の開催日時（エポック秒）のリスト
     """
-    try:
-        # アップロードディレクトリを作成
-        upload_dir = "audio_uploads"
-        os.makedirs(upload_dir, exist_ok=True)
-
-        # ファイル名を生成（ミーティングID + タイムスタンプ + 元のファイル名）
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_extension = os.path.splitext(audio_file.name)[1]
-        safe_filename = f"meeting_{meeting_id}_{timestamp}{file_extension}"
-        file_path = os.path.join(upload_dir, safe_filename)
-
-        # ファイルを保存
-        with open(file_path, "wb") as f:
-            f.write(audio_file.getbuffer())
-
-        # Whisper APIで文字起こし
-        success, message, transcript = transcribe_audio_with_whisper(file_path)
+    timezone_name = series['timezone'] or DEFAULT_TIMEZONE
+    first = from_epoch(series['start_ts'], timezone_name).replace(tzinfo=None)
+    freq = series['freq']
+    interval = max(1, series['interval'] or 1)
+    if series['until_ts'] is not None:
+        end_ts = min(end_ts, series['until_ts'] + 1)
+
+    # 期間の直前の回から数え始める（1回分手前から始めて、夏時間などのずれを吸収）
+    if freq == 'MONTHLY':
+        window_start = from_epoch(start_ts, timezone_name)
+        months = (window_start.year - first.year) * 12 + window_start.month - first.month
+        index = max(0, months // interval - 1)
+    else:
+        step_seconds = interval * (7 if freq == 'WEEKLY' else 1) * 86400
+        index = max(0, (start_ts - series['start_ts']) // step_seconds - 1)
+
+    limit = series['occurrence_count'] if series['occurrence_count'] is not None else index + SERIES_MAX_OCCURRENCES
+    occurrences = []
+    while index < limit:
+        ts = to_epoch(_series_occurrence_local(first, freq, interval, index), timezone_name)
+        if ts >= end_ts:
+            break
+        if ts >= start_ts:
+            occurrences.append(ts)
+        index += 1
+    return occurrences
+
+def _occurrence_row(series: Dict, occurrence_ts: int) -> Dict:
+    """まだmeetingsに作成されていない回を、ミーティングと同じ形の辞書で表す（idはNone）"""
+    timezone_name = series['timezone'] or DEFAULT_TIMEZONE
+    return {
+        'id': None,
+        'series_id': series['id'],
+        'occurrence_ts': occurrence_ts,
+        'title': series['title'],
+        'description': series['description'],
+        'group_id': series['group_id'],
+        'group_name': series['group_name'],
+        'host_id': series['host_id'],
+        'host_name': series['host_name'],
+        'scheduled_at': from_epoch(occurrence_ts, timezone_name).replace(tzinfo=None).isoformat(),
+        'scheduled_ts': occurrence_ts,
+        'timezone': timezone_name,
+        'zoom_url': series['zoom_url'],
+        'zoom_meeting_id': series['zoom_meeting_id'],
+        'zoom_passcode': series['zoom_passcode'],
+        'participant_count': series['member_count'],
+        'has_recording': 0,
+    }
+
+def _series_occurrences_in_range(cursor, user_id: int, start_ts: int, end_ts: int,
+                                 hosted_only: bool = False) -> List[Dict]:
+    """
+    ユーザーのグループ（hosted_onlyならホストとして開催する）繰り返しミーティングのうち、
+    開催日時が[start_ts, end_ts)で、まだmeetingsに作成されていない回
+    """
+    if hosted_only:
+        condition, params = "s.host_id = ?", (user_id,)
+    else:
+        condition = "(s.host_id = ? OR s.group_id IN (SELECT group_id FROM group_members WHERE user_id = ?))"
+        params = (user_id, user_id)
+    cursor.execute(f"""
+        SELECT s.*, g.name as group_name, u.name as host_name,
+               (SELECT COUNT(*) FROM group_members gm WHERE gm.group_id = s.group_id) as member_count
+        FROM meeting_series s
+        JOIN groups g ON s.group_id = g.id
+        JOIN users u ON s.host_id = u.id
+        WHERE {condition}
+          AND s.start_ts < ?
+          AND (s.until_ts IS NULL OR s.until_ts >= ?)
+    """, (*params, end_ts, start_ts))
+    series_list = [dict(row) for row in cursor.fetchall()]
+    if not series_list:
+        return []
+
+    # 作成済みの回（記録が追加された回）はmeetingsの方を使う
+    placeholders = ",".join("?" * len(series_list))
+    cursor.execute(f"""
+        SELECT series_id, occurrence_ts FROM meetings
+        WHERE series_id IN ({placeholders}) AND occurrence_ts >= ? AND occurrence_ts < ?
+    """, (*[series['id'] for series in series_list], start_ts, end_ts))
+    materialized = {(row['series_id'], row['occurrence_ts']) for row in cursor.fetchall()}
+
+    return [
+        _occurrence_row(series, ts)
+        for series in series_list
+        for ts in expand_series_occurrences(series, start_ts, end_ts)
+        if (series['id'], ts) not in materialized
+    ]
 
-        if not success:
-            # エラーの場合、保存したファイルを削除
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            return False, message, None
+def create_meeting_series(title: str, description: str, group_id: int, host_id: int, scheduled_at: str,
+                          freq: str = 'WEEKLY', interval: int = 1, occurrence_count: Optional[int] = None,
+                          until: Optional[str] = None, zoom_url: str = None, zoom_meeting_id: str = None,
+                          zoom_passcode: str = None, timezone_name: str = DEFAULT_TIMEZONE) -> Tuple[bool, str, Optional[int]]:
+    """
+    繰り返しミーティングを作成（各回はmeetingsに作らず、表示のたびに計算する）
 
-        # 議事録としてデータベースに保存
-        save_success, save_message, _ = save_recording(meeting_id, file_path, transcript, created_by)
+    Args:
+        scheduled_at: 初回の開催日時（timezone_nameの時刻）
+        freq: 頻度（DAILY・WEEKLY・MONTHLY）
+        interval: 間隔（WEEKLYで2なら隔週）
+        occurrence_count: 回数（Noneなら回数の制限なし）
+        until: この日時までの回を開催（Noneなら終了日なし）
 
-        if not save_success:
-            # データベース保存失敗の場合、ファイルを削除
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            return False, f"議事録の保存に失敗しました: {save_message}", None
+    Returns:
+        (成功, メッセージ, 繰り返しミーティングID)
+    """
+    if freq not in SERIES_FREQUENCIES:
+        return False, "繰り返しの頻度が正しくありません", None
+    start_ts = to_epoch(scheduled_at, timezone_name)
+    if start_ts is None:
+        return False, "初回の日時を設定してください", None
+    if freq == 'MONTHLY' and from_epoch(start_ts, timezone_name).day > 28:
+        return False, "毎月の繰り返しは、1日〜28日の日付で設定してください", None
+    until_ts = to_epoch(until, timezone_name) if until else None
 
-        return True, "音声ファイルの文字起こしと議事録保存が完了しました", transcript
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO meeting_series (title, description, group_id, host_id, start_ts, timezone, freq, interval,
+                                        occurrence_count, until_ts, zoom_url, zoom_meeting_id, zoom_passcode)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (title, description, group_id, host_id, start_ts, timezone_name, freq, max(1, interval),
+              occurrence_count, until_ts, zoom_url, zoom_meeting_id, zoom_passcode))
+        series_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return True, "繰り返しミーティングを作成しました", series_id
+    except Exception as e:
+        return False, f"エラーが発生しました: {str(e)}", None
 
+def end_meeting_series(series_id: int, from_ts: int) -> Tuple[bool, str]:
+    """繰り返しミーティングを、開催日時がfrom_ts以降の回から終了する（作成済みの回は残す）"""
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("UPDATE meeting_series SET until_ts = ? WHERE id = ?", (from_ts - 1, series_id))
+        conn.commit()
+        conn.close()
+        return True, "繰り返しを終了しました"
     except Exception as e:
-        return False, f"処理中にエラーが発生しました: {str(e)}", None
+        return False, f"エラーが発生しました: {str(e)}"
 
-def generate_minutes_with_gpt4o(transcript: str) -> Tuple[bool, str, Optional[str]]:
+def get_series_occurrence(series_id: int, occurrence_ts: int) -> Optional[Dict]:
+    """
+    繰り返しミーティングの1回分を取得
+    作成済みならmeetingsの行（get_meeting_by_idと同じ形）、まだならidがNoneの辞書
     """
-    GPT-4oを使って文字起こしから議事録を自動生成
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT id FROM meetings WHERE series_id = ? AND occurrence_ts = ?", (series_id, occurrence_ts)
+    )
+    existing = cursor.fetchone()
+    if existing:
+        conn.close()
+        return get_meeting_by_id(existing['id'])
 
-    Args:
-        transcript: 文字起こしテキスト
+    cursor.execute("""
+        SELECT s.*, g.name as group_name, u.name as host_name,
+               (SELECT COUNT(*) FROM group_members gm WHERE gm.group_id = s.group_id) as member_count
+        FROM meeting_series s
+        JOIN groups g ON s.group_id = g.id
+        JOIN users u ON s.host_id = u.id
+        WHERE s.id = ?
+    """, (series_id,))
+    series = cursor.fetchone()
+    conn.close()
+    if not series or occurrence_ts not in expand_series_occurrences(dict(series), occurrence_ts, occurrence_ts + 1):
+        return None
+    return _occurrence_row(dict(series), occurrence_ts)
+
+def materialize_occurrence(series_id: int, occurrence_ts: int) -> Tuple[bool, str, Optional[int]]:
+    """
+    繰り返しミーティングの1回分をmeetingsに作成（作成済みならそのID）
+    録音・学んだこと・チャットなど、その回の記録を追加する前に呼ぶ
+    参加者はほかのミーティングと同じくグループメンバーから決まる
 
     Returns:
-        (成功, メッセージ, 整形された議事録)
+        (成功, メッセージ, ミーティングID)
     """
     try:
-        # APIキーを取得（Streamlit Cloud優先）
-        api_key = get_openai_api_key()
-        if not api_key:
-            return False, "OPENAI_API_KEYが設定されていません。Streamlit Cloudの場合はSecretsに、ローカルの場合は.envファイルに設定してください。", None
-
-        # OpenAIクライアントを初期化
-        client = OpenAI(api_key=api_key)
-
-        # プロンプトを構築（シニア向けにわかりやすく）
-        prompt = f"""
-以下は会議の文字起こしテキストです。このテキストから、高齢者にもわかりやすい議事録を作成してください。
-
-【文字起こし】
-{transcript}
-
-【議事録フォーマット】
-以下の形式で議事録を作成してください：
-
-## 📝 会議の要約
-（会議の内容を3-5文で簡潔にまとめてください。高齢者にもわかりやすい言葉を使用してください。）
-
-## 📌 主要なトピック
-- （重要なトピック1）
-- （重要なトピック2）
-- （重要なトピック3）
-（必要に応じて追加してください）
-
-## ✅ 決定事項
-- （決定事項1）
-- （決定事項2）
-（決定事項がない場合は「特になし」と記載してください）
-
-## 🔄 次回への申し送り事項
-- （申し送り事項1）
-- （申し送り事項2）
-（申し送り事項がない場合は「特になし」と記載してください）
-
-重要：
-- 専門用語は避け、平易な日本語を使用してください
-- 箇条書きは簡潔にまとめてください
-- 高齢者の方々が読みやすいように配慮してください
-"""
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM meeting_series WHERE id = ?", (series_id,))
+        series = cursor.fetchone()
+        if not series:
+            conn.close()
+            return False, "繰り返しミーティングが見つかりません", None
+        series = dict(series)
+        if occurrence_ts not in expand_series_occurrences(series, occurrence_ts, occurrence_ts + 1):
+            conn.close()
+            return False, "この日時は繰り返しミーティングの予定にありません", None
 
-        # GPT-4oで議事録を生成
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "あなたは高齢者向けのAI学習会の議事録作成アシスタントです。わかりやすく、丁寧な言葉で議事録を作成してください。"},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=2000
+        scheduled_at = from_epoch(occurrence_ts, series['timezone']).replace(tzinfo=None).isoformat()
+        cursor.execute("""
+            INSERT OR IGNORE INTO meetings (title, description, group_id, host_id, scheduled_at, scheduled_ts, timezone,
+                                            zoom_url, zoom_meeting_id, zoom_passcode, series_id, occurrence_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (series['title'], series['description'], series['group_id'], series['host_id'], scheduled_at,
+              occurrence_ts, series['timezone'], series['zoom_url'], series['zoom_meeting_id'],
+              series['zoom_passcode'], series_id, occurrence_ts))
+        cursor.execute(
+            "SELECT id FROM meetings WHERE series_id = ? AND occurrence_ts = ?", (series_id, occurrence_ts)
         )
-
-        formatted_minutes = response.choices[0].message.content.strip()
-
-        return True, "議事録の生成が完了しました", formatted_minutes
-
+        meeting_id = cursor.fetchone()['id']
+        conn.commit()
+        conn.close()
+        return True, "ミーティングを作成しました", meeting_id
     except Exception as e:
-        error_msg = str(e)
-        if "api_key" in error_msg.lower():
-            return False, "OpenAI APIキーが無効です。.envファイルを確認してください。", None
-        return False, f"議事録生成中にエラーが発生しました: {error_msg}", None
+        return False, f"エラーが発生しました: {str(e)}", None
+
 
 def save_formatted_minutes(meeting_id: int, formatted_minutes: str) -> Tuple[bool, str]:
     """
@@ -1260,6 +2772,9 @@ def save_formatted_minutes(meeting_id: int, formatted_minutes: str) -> Tuple[boo
             WHERE meeting_id = ?
         """, (formatted_minutes, meeting_id))
 
+        # 議事録が変わったので、キャッシュした回答は使えない
+        cursor.execute("DELETE FROM ai_answer_cache WHERE meeting_id = ?", (meeting_id,))
+
         conn.commit()
         conn.close()
 
@@ -1267,392 +2782,6 @@ def save_formatted_minutes(meeting_id: int, formatted_minutes: str) -> Tuple[boo
     except Exception as e:
         return False, f"エラーが発生しました: {str(e)}"
 
-# メール送信関連の関数
-
-def get_email_config() -> Tuple[Optional[str], Optional[str]]:
-    """
-    メール設定を取得
-    優先順位：
-    1. st.secrets (Streamlit Cloud用)
-    2. os.environ (ローカル.env用)
-
-    Returns:
-        (メールアドレス, アプリパスワード)
-    """
-    email_address = None
-    email_password = None
-
-    # Streamlit Cloudの場合
-    try:
-        import streamlit as st
-        if hasattr(st, 'secrets'):
-            if 'EMAIL_ADDRESS' in st.secrets:
-                email_address = st.secrets['EMAIL_ADDRESS']
-            if 'EMAIL_PASSWORD' in st.secrets:
-                email_password = st.secrets['EMAIL_PASSWORD']
-    except (ImportError, Exception):
-        pass
-
-    # ローカル環境の場合（未設定の場合のみ）
-    if not email_address:
-        email_address = os.getenv('EMAIL_ADDRESS')
-    if not email_password:
-        email_password = os.getenv('EMAIL_PASSWORD')
-
-    return email_address, email_password
-
-def send_minutes_email(
-    meeting_id: int,
-    meeting_title: str,
-    scheduled_at: str,
-    minutes_content: str,
-    recipients: List[Dict],
-    zoom_url: str = None,
-    zoom_passcode: str = None
-) -> Tuple[bool, str, List[str], List[str]]:
-    """
-    議事録をメールで参加者に送信（Zoom情報含む）
-
-    Args:
-        meeting_id: ミーティングID
-        meeting_title: ミーティングタイトル
-        scheduled_at: 開催日時
-        minutes_content: 議事録の内容
-        recipients: 送信先リスト [{'name': '名前', 'email': 'メールアドレス'}, ...]
-        zoom_url: ZoomミーティングURL（オプション）
-        zoom_passcode: Zoomパスコード（オプション）
-
-    Returns:
-        (成功, メッセージ, 送信成功リスト, 送信失敗リスト)
-    """
-    # メール設定を取得
-    sender_email, sender_password = get_email_config()
-
-    if not sender_email or not sender_password:
-        return False, "メール設定が見つかりません。EMAIL_ADDRESS と EMAIL_PASSWORD を設定してください。", [], []
-
-    # 日時の整形
-    try:
-        dt = datetime.fromisoformat(scheduled_at)
-        formatted_date = dt.strftime('%Y年%m月%d日 %H:%M')
-    except:
-        formatted_date = scheduled_at
-
-    # 送信結果を追跡
-    success_list = []
-    failed_list = []
-
-    # Gmail SMTPサーバーに接続
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, sender_password)
-    except smtplib.SMTPAuthenticationError:
-        return False, "メールの認証に失敗しました。EMAIL_ADDRESS と EMAIL_PASSWORD（Gmailアプリパスワード）を確認してください。", [], []
-    except Exception as e:
-        return False, f"メールサーバーへの接続に失敗しました: {str(e)}", [], []
-
-    # Zoom情報のテキスト
-    zoom_info_text = ""
-    zoom_info_html = ""
-    if zoom_url:
-        zoom_info_text = f"""
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📹 Zoomミーティング情報
-URL: {zoom_url}
-"""
-        if zoom_passcode:
-            zoom_info_text += f"パスコード: {zoom_passcode}\n"
-        zoom_info_text += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-
-        zoom_info_html = f"""
-    <div style="background-color: #e3f2fd; padding: 25px; border-radius: 10px; border-left: 5px solid #2196f3; margin: 20px 0;">
-        <h3 style="color: #1565c0; margin-top: 0;">📹 Zoomミーティング情報</h3>
-        <p style="font-size: 20px; margin: 10px 0;"><strong>URL:</strong> <a href="{zoom_url}" style="color: #1976d2;">{zoom_url}</a></p>
-"""
-        if zoom_passcode:
-            zoom_info_html += f'        <p style="font-size: 20px; margin: 10px 0;"><strong>パスコード:</strong> {zoom_passcode}</p>\n'
-        zoom_info_html += "    </div>"
-
-    # 各受信者にメールを送信
-    for recipient in recipients:
-        try:
-            # メールを作成
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"【議事録】{meeting_title}"
-            msg['From'] = sender_email
-            msg['To'] = recipient['email']
-
-            # プレーンテキスト版のメール本文（高齢者向けにわかりやすく）
-            text_body = f"""
-{recipient['name']} 様
-
-お疲れ様です。
-以下のミーティングの議事録をお送りいたします。
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📅 ミーティング名：{meeting_title}
-📆 開催日時：{formatted_date}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{zoom_info_text}
-{minutes_content}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-このメールは自動送信されています。
-ご不明な点がございましたら、ホストにお問い合わせください。
-
-AI学習チェックリスト
-            """
-
-            # HTML版のメール本文（より見やすいフォーマット）
-            html_body = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <style>
-        body {{
-            font-family: 'メイリオ', 'ヒラギノ角ゴ Pro W3', sans-serif;
-            font-size: 18px;
-            line-height: 1.8;
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 15px;
-            margin-bottom: 30px;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 28px;
-        }}
-        .meeting-info {{
-            background-color: #f8f9fa;
-            padding: 25px;
-            border-radius: 10px;
-            border-left: 5px solid #007bff;
-            margin-bottom: 30px;
-        }}
-        .meeting-info p {{
-            margin: 10px 0;
-            font-size: 20px;
-        }}
-        .minutes-content {{
-            background-color: #fff;
-            padding: 30px;
-            border-radius: 15px;
-            border: 2px solid #dee2e6;
-            margin-bottom: 30px;
-        }}
-        .footer {{
-            text-align: center;
-            color: #6c757d;
-            font-size: 16px;
-            padding-top: 20px;
-            border-top: 1px solid #dee2e6;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>📝 議事録のお知らせ</h1>
-    </div>
-
-    <p style="font-size: 22px;"><strong>{recipient['name']}</strong> 様</p>
-    <p>お疲れ様です。<br>以下のミーティングの議事録をお送りいたします。</p>
-
-    <div class="meeting-info">
-        <p>📅 <strong>ミーティング名：</strong>{meeting_title}</p>
-        <p>📆 <strong>開催日時：</strong>{formatted_date}</p>
-    </div>
-
-    {zoom_info_html}
-
-    <div class="minutes-content">
-        {minutes_content.replace(chr(10), '<br>')}
-    </div>
-
-    <div class="footer">
-        <p>このメールは自動送信されています。<br>
-        ご不明な点がございましたら、ホストにお問い合わせください。</p>
-        <p><strong>AI学習チェックリスト</strong></p>
-    </div>
-</body>
-</html>
-            """
-
-            # プレーンテキストとHTMLを追加
-            part1 = MIMEText(text_body, 'plain', 'utf-8')
-            part2 = MIMEText(html_body, 'html', 'utf-8')
-            msg.attach(part1)
-            msg.attach(part2)
-
-            # メール送信
-            server.send_message(msg)
-            success_list.append(recipient['email'])
-
-        except Exception as e:
-            failed_list.append(f"{recipient['email']} ({str(e)})")
-
-    # サーバー接続を閉じる
-    server.quit()
-
-    # 結果メッセージを作成
-    if len(failed_list) == 0:
-        result_message = f"✅ {len(success_list)}名全員にメールを送信しました！"
-        return True, result_message, success_list, failed_list
-    elif len(success_list) == 0:
-        result_message = f"❌ メールの送信に失敗しました"
-        return False, result_message, success_list, failed_list
-    else:
-        result_message = f"⚠️ {len(success_list)}名に送信成功、{len(failed_list)}名に送信失敗"
-        return True, result_message, success_list, failed_list
-
-
-def send_zoom_reminder_email(
-    meeting_title: str,
-    scheduled_at: str,
-    recipients: List[Dict],
-    zoom_url: str,
-    zoom_passcode: str = None,
-    is_followup: bool = False
-) -> Tuple[bool, str, List[str], List[str]]:
-    """
-    Zoomミーティングのリマインダーメールを送信
-
-    Args:
-        meeting_title: ミーティングタイトル
-        scheduled_at: 開催日時
-        recipients: 送信先リスト
-        zoom_url: ZoomミーティングURL
-        zoom_passcode: Zoomパスコード（オプション）
-        is_followup: フォローアップミーティングかどうか
-
-    Returns:
-        (成功, メッセージ, 送信成功リスト, 送信失敗リスト)
-    """
-    # メール設定を取得
-    sender_email, sender_password = get_email_config()
-
-    if not sender_email or not sender_password:
-        return False, "メール設定が見つかりません。", [], []
-
-    # 日時の整形
-    try:
-        dt = datetime.fromisoformat(scheduled_at)
-        formatted_date = dt.strftime('%Y年%m月%d日 %H:%M')
-    except:
-        formatted_date = scheduled_at
-
-    success_list = []
-    failed_list = []
-
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, sender_password)
-    except Exception as e:
-        return False, f"メールサーバーへの接続に失敗しました: {str(e)}", [], []
-
-    # フォローアップの場合はタイトルを変更
-    if is_followup or "フォローアップ" in meeting_title:
-        subject_prefix = "【フォローアップリマインダー】"
-        header_text = "🔄 フォローアップミーティングリマインダー"
-        intro_text = "フォローアップミーティングがまもなく始まります！"
-    else:
-        subject_prefix = "【リマインダー】"
-        header_text = "🔔 ミーティングリマインダー"
-        intro_text = "まもなくミーティングが始まります！"
-
-    for recipient in recipients:
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"{subject_prefix}{meeting_title} - Zoomミーティングのお知らせ"
-            msg['From'] = sender_email
-            msg['To'] = recipient['email']
-
-            passcode_text = f"\n🔑 パスコード：{zoom_passcode}" if zoom_passcode else ""
-            passcode_html = f'<p style="font-size: 24px; margin: 15px 0;">🔑 <strong>パスコード：</strong>{zoom_passcode}</p>' if zoom_passcode else ""
-
-            text_body = f"""
-{recipient['name']} 様
-
-{intro_text}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📅 ミーティング名：{meeting_title}
-📆 開催日時：{formatted_date}
-
-📹 Zoomミーティング
-URL: {zoom_url}{passcode_text}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-上記のURLをクリックするとZoomに参加できます。
-
-AI学習チェックリスト
-            """
-
-            html_body = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-</head>
-<body style="font-family: 'メイリオ', sans-serif; font-size: 20px; line-height: 1.8; color: #333; max-width: 800px; margin: 0 auto; padding: 20px;">
-    <div style="background: linear-gradient(135deg, #4CAF50 0%, #2E7D32 100%); color: white; padding: 30px; border-radius: 15px; margin-bottom: 30px; text-align: center;">
-        <h1 style="margin: 0; font-size: 32px;">{header_text}</h1>
-    </div>
-
-    <p style="font-size: 24px;"><strong>{recipient['name']}</strong> 様</p>
-    <p style="font-size: 22px;">{intro_text}</p>
-
-    <div style="background-color: #e8f5e9; padding: 30px; border-radius: 15px; border: 3px solid #4CAF50; margin: 25px 0;">
-        <p style="font-size: 24px; margin: 10px 0;">📅 <strong>{meeting_title}</strong></p>
-        <p style="font-size: 24px; margin: 10px 0;">📆 <strong>{formatted_date}</strong></p>
-    </div>
-
-    <div style="background-color: #e3f2fd; padding: 30px; border-radius: 15px; border: 3px solid #2196f3; margin: 25px 0; text-align: center;">
-        <h2 style="color: #1565c0; margin-top: 0;">📹 Zoomに参加する</h2>
-        <a href="{zoom_url}" style="display: inline-block; background-color: #2196f3; color: white; padding: 20px 40px; font-size: 24px; text-decoration: none; border-radius: 10px; font-weight: bold; margin: 15px 0;">
-            🚀 ここをクリックして参加
-        </a>
-        {passcode_html}
-    </div>
-
-    <div style="text-align: center; color: #6c757d; font-size: 16px; padding-top: 20px; border-top: 1px solid #dee2e6;">
-        <p>AI学習チェックリスト</p>
-    </div>
-</body>
-</html>
-            """
-
-            part1 = MIMEText(text_body, 'plain', 'utf-8')
-            part2 = MIMEText(html_body, 'html', 'utf-8')
-            msg.attach(part1)
-            msg.attach(part2)
-
-            server.send_message(msg)
-            success_list.append(recipient['email'])
-
-        except Exception as e:
-            failed_list.append(f"{recipient['email']} ({str(e)})")
-
-    server.quit()
-
-    if len(failed_list) == 0:
-        return True, f"✅ {len(success_list)}名にリマインダーを送信しました！", success_list, failed_list
-    elif len(success_list) == 0:
-        return False, "❌ リマインダーの送信に失敗しました", success_list, failed_list
-    else:
-        return True, f"⚠️ {len(success_list)}名に送信成功、{len(failed_list)}名に送信失敗", success_list, failed_list
-
-
 # リマインダー送信記録テーブルの初期化
 def init_reminder_table():
     """リマインダー送信記録テーブルを初期化"""
@@ -1712,344 +2841,6 @@ def log_reminder_sent(meeting_id: int, reminder_type: str, recipient_count: int)
         return False
 
 
-def send_meeting_invitation_email(
-    meeting_id: int,
-    meeting_title: str,
-    meeting_description: str,
-    scheduled_at: str,
-    host_name: str,
-    group_name: str,
-    recipients: List[Dict],
-    zoom_url: str = None,
-    zoom_passcode: str = None
-) -> Tuple[bool, str, List[str], List[str]]:
-    """
-    ミーティング招待メールを送信（作成時に自動送信）
-
-    Args:
-        meeting_id: ミーティングID
-        meeting_title: ミーティングタイトル
-        meeting_description: ミーティングの説明
-        scheduled_at: 開催日時
-        host_name: ホスト名
-        group_name: グループ名
-        recipients: 送信先リスト
-        zoom_url: ZoomミーティングURL（オプション）
-        zoom_passcode: Zoomパスコード（オプション）
-
-    Returns:
-        (成功, メッセージ, 送信成功リスト, 送信失敗リスト)
-    """
-    # 既に送信済みかチェック
-    if check_reminder_sent(meeting_id, 'invitation'):
-        return True, "招待メールは既に送信済みです", [], []
-
-    # メール設定を取得
-    sender_email, sender_password = get_email_config()
-
-    if not sender_email or not sender_password:
-        return False, "メール設定が見つかりません。", [], []
-
-    # 日時の整形
-    try:
-        dt = datetime.fromisoformat(scheduled_at)
-        formatted_date = dt.strftime('%Y年%m月%d日 %H:%M')
-    except:
-        formatted_date = scheduled_at
-
-    success_list = []
-    failed_list = []
-
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, sender_password)
-    except Exception as e:
-        return False, f"メールサーバーへの接続に失敗しました: {str(e)}", [], []
-
-    # Zoom情報のHTML
-    zoom_info_html = ""
-    if zoom_url:
-        zoom_info_html = f"""
-    <div style="background-color: #e3f2fd; padding: 30px; border-radius: 15px; border: 3px solid #2196f3; margin: 25px 0; text-align: center;">
-        <h3 style="color: #1565c0; margin-top: 0; font-size: 28px;">📹 Zoomミーティング情報</h3>
-        <a href="{zoom_url}" style="display: inline-block; background-color: #2196f3; color: white; padding: 20px 40px; font-size: 24px; text-decoration: none; border-radius: 10px; font-weight: bold; margin: 15px 0;">
-            🚀 ここをクリックしてZoomに参加
-        </a>
-        <p style="font-size: 20px; margin: 15px 0;"><strong>URL:</strong> {zoom_url}</p>
-"""
-        if zoom_passcode:
-            zoom_info_html += f'        <p style="font-size: 20px; margin: 10px 0;"><strong>🔑 パスコード:</strong> {zoom_passcode}</p>\n'
-        zoom_info_html += "    </div>"
-
-    for recipient in recipients:
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"【ミーティングのお知らせ】{meeting_title}"
-            msg['From'] = sender_email
-            msg['To'] = recipient['email']
-
-            text_body = f"""
-{recipient['name']} 様
-
-新しいミーティングのお知らせです。
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📅 ミーティング名：{meeting_title}
-📆 開催日時：{formatted_date}
-👥 グループ：{group_name}
-👑 ホスト：{host_name}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-{f"📝 説明：{meeting_description}" if meeting_description else ""}
-
-{f"📹 Zoom URL：{zoom_url}" if zoom_url else ""}
-{f"🔑 パスコード：{zoom_passcode}" if zoom_passcode else ""}
-
-カレンダーに予定を追加しておいてくださいね！
-
-AI学習チェックリスト
-            """
-
-            html_body = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-</head>
-<body style="font-family: 'メイリオ', sans-serif; font-size: 20px; line-height: 1.8; color: #333; max-width: 800px; margin: 0 auto; padding: 20px;">
-    <div style="background: linear-gradient(135deg, #4CAF50 0%, #2E7D32 100%); color: white; padding: 30px; border-radius: 15px; margin-bottom: 30px; text-align: center;">
-        <h1 style="margin: 0; font-size: 32px;">📅 ミーティングのお知らせ</h1>
-    </div>
-
-    <p style="font-size: 24px;"><strong>{recipient['name']}</strong> 様</p>
-    <p style="font-size: 22px;">新しいミーティングが予定されました！<br>ぜひご参加ください。</p>
-
-    <div style="background-color: #e8f5e9; padding: 30px; border-radius: 15px; border: 3px solid #4CAF50; margin: 25px 0;">
-        <p style="font-size: 26px; margin: 10px 0;"><strong>📅 {meeting_title}</strong></p>
-        <p style="font-size: 24px; margin: 10px 0;">📆 <strong>日時：</strong>{formatted_date}</p>
-        <p style="font-size: 22px; margin: 10px 0;">👥 <strong>グループ：</strong>{group_name}</p>
-        <p style="font-size: 22px; margin: 10px 0;">👑 <strong>ホスト：</strong>{host_name}</p>
-        {f'<p style="font-size: 20px; margin: 15px 0; color: #555;">📝 {meeting_description}</p>' if meeting_description else ''}
-    </div>
-
-    {zoom_info_html}
-
-    <div style="background-color: #fff3e0; padding: 25px; border-radius: 15px; border: 3px solid #ff9800; margin: 25px 0;">
-        <p style="font-size: 22px; color: #e65100; margin: 0;">
-            📌 <strong>お願い：</strong>カレンダーに予定を追加しておいてくださいね！
-        </p>
-    </div>
-
-    <div style="text-align: center; color: #6c757d; font-size: 16px; padding-top: 20px; border-top: 1px solid #dee2e6;">
-        <p>AI学習チェックリスト</p>
-    </div>
-</body>
-</html>
-            """
-
-            part1 = MIMEText(text_body, 'plain', 'utf-8')
-            part2 = MIMEText(html_body, 'html', 'utf-8')
-            msg.attach(part1)
-            msg.attach(part2)
-
-            server.send_message(msg)
-            success_list.append(recipient['email'])
-
-        except Exception as e:
-            failed_list.append(f"{recipient['email']} ({str(e)})")
-
-    server.quit()
-
-    # 送信記録を保存
-    if success_list:
-        log_reminder_sent(meeting_id, 'invitation', len(success_list))
-
-    if len(failed_list) == 0:
-        return True, f"✅ {len(success_list)}名に招待メールを送信しました！", success_list, failed_list
-    elif len(success_list) == 0:
-        return False, "❌ 招待メールの送信に失敗しました", success_list, failed_list
-    else:
-        return True, f"⚠️ {len(success_list)}名に送信成功、{len(failed_list)}名に送信失敗", success_list, failed_list
-
-
-def send_meeting_invitation_to_pending(
-    meeting_title: str,
-    meeting_description: str,
-    scheduled_at: str,
-    host_name: str,
-    group_name: str,
-    pending_emails: List[str],
-    app_url: str,
-    zoom_url: str = None,
-    zoom_passcode: str = None
-) -> Tuple[bool, str, List[str], List[str]]:
-    """
-    未登録の招待者にミーティング招待メールを送信
-
-    Args:
-        meeting_title: ミーティングタイトル
-        meeting_description: ミーティングの説明
-        scheduled_at: 開催日時
-        host_name: ホスト名
-        group_name: グループ名
-        pending_emails: 未登録の招待者メールアドレスリスト
-        app_url: アプリのURL
-        zoom_url: ZoomミーティングURL（オプション）
-        zoom_passcode: Zoomパスコード（オプション）
-
-    Returns:
-        (成功, メッセージ, 送信成功リスト, 送信失敗リスト)
-    """
-    if not pending_emails:
-        return True, "送信対象者がいません", [], []
-
-    # メール設定を取得
-    sender_email, sender_password = get_email_config()
-
-    if not sender_email or not sender_password:
-        return False, "メール設定が見つかりません。", [], []
-
-    # 日時の整形
-    try:
-        dt = datetime.fromisoformat(scheduled_at)
-        formatted_date = dt.strftime('%Y年%m月%d日 %H:%M')
-    except:
-        formatted_date = scheduled_at
-
-    success_list = []
-    failed_list = []
-
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, sender_password)
-    except Exception as e:
-        return False, f"メールサーバーへの接続に失敗しました: {str(e)}", [], []
-
-    # Zoom情報のHTML
-    zoom_info_html = ""
-    zoom_info_text = ""
-    if zoom_url:
-        zoom_info_text = f"""
-📹 Zoom URL：{zoom_url}
-🔑 パスコード：{zoom_passcode if zoom_passcode else '（なし）'}
-"""
-        zoom_info_html = f"""
-    <div style="background-color: #e3f2fd; padding: 30px; border-radius: 15px; border: 3px solid #2196f3; margin: 25px 0; text-align: center;">
-        <h3 style="color: #1565c0; margin-top: 0; font-size: 28px;">📹 Zoomミーティング情報</h3>
-        <a href="{zoom_url}" style="display: inline-block; background-color: #2196f3; color: white; padding: 20px 40px; font-size: 24px; text-decoration: none; border-radius: 10px; font-weight: bold; margin: 15px 0;">
-            🚀 ここをクリックしてZoomに参加
-        </a>
-        <p style="font-size: 20px; margin: 15px 0;"><strong>URL:</strong> {zoom_url}</p>
-"""
-        if zoom_passcode:
-            zoom_info_html += f'        <p style="font-size: 20px; margin: 10px 0;"><strong>🔑 パスコード:</strong> {zoom_passcode}</p>\n'
-        zoom_info_html += "    </div>"
-
-    for email in pending_emails:
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"【ミーティングのお知らせ】{meeting_title}（要アカウント登録）"
-            msg['From'] = sender_email
-            msg['To'] = email
-
-            text_body = f"""
-{email} 様
-
-{host_name}さんから「{group_name}」グループのミーティングにご招待されました。
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📅 ミーティング名：{meeting_title}
-📆 開催日時：{formatted_date}
-👥 グループ：{group_name}
-👑 ホスト：{host_name}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-{f"📝 説明：{meeting_description}" if meeting_description else ""}
-{zoom_info_text}
-
-【重要】ミーティングに参加するには、まずアプリでアカウント登録が必要です。
-
-🔗 アプリURL：{app_url}
-
-上記URLにアクセスし、「新規登録」からアカウントを作成してください。
-登録時は、このメールアドレス（{email}）をご使用ください。
-
-ご質問があれば、{host_name}さんにお問い合わせください。
-
-AI学習チェックリスト
-            """
-
-            html_body = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-</head>
-<body style="font-family: 'メイリオ', sans-serif; font-size: 20px; line-height: 1.8; color: #333; max-width: 800px; margin: 0 auto; padding: 20px;">
-    <div style="background: linear-gradient(135deg, #4CAF50 0%, #2E7D32 100%); color: white; padding: 30px; border-radius: 15px; margin-bottom: 30px; text-align: center;">
-        <h1 style="margin: 0; font-size: 32px;">📅 ミーティングのお知らせ</h1>
-    </div>
-
-    <p style="font-size: 24px;"><strong>{email}</strong> 様</p>
-    <p style="font-size: 22px;">
-        <strong>{host_name}</strong>さんから「<strong>{group_name}</strong>」グループのミーティングにご招待されました！
-    </p>
-
-    <div style="background-color: #e8f5e9; padding: 30px; border-radius: 15px; border: 3px solid #4CAF50; margin: 25px 0;">
-        <p style="font-size: 26px; margin: 10px 0;"><strong>📅 {meeting_title}</strong></p>
-        <p style="font-size: 24px; margin: 10px 0;">📆 <strong>日時：</strong>{formatted_date}</p>
-        <p style="font-size: 22px; margin: 10px 0;">👥 <strong>グループ：</strong>{group_name}</p>
-        <p style="font-size: 22px; margin: 10px 0;">👑 <strong>ホスト：</strong>{host_name}</p>
-        {f'<p style="font-size: 20px; margin: 15px 0; color: #555;">📝 {meeting_description}</p>' if meeting_description else ''}
-    </div>
-
-    {zoom_info_html}
-
-    <div style="background-color: #fff3e0; padding: 30px; border-radius: 15px; border: 4px solid #ff9800; margin: 25px 0;">
-        <h3 style="color: #e65100; margin-top: 0; font-size: 26px;">⚠️ 重要：アカウント登録が必要です</h3>
-        <p style="font-size: 20px; color: #e65100;">
-            ミーティングに参加するには、まずアプリでアカウント登録が必要です。
-        </p>
-        <div style="text-align: center; margin: 20px 0;">
-            <a href="{app_url}" style="display: inline-block; background: linear-gradient(135deg, #ff9800 0%, #f57c00 100%); color: white; padding: 20px 40px; font-size: 24px; text-decoration: none; border-radius: 10px; font-weight: bold;">
-                📱 アプリを開いて登録する
-            </a>
-        </div>
-        <p style="font-size: 18px; color: #795548;">
-            ※ 登録時は、このメールアドレス（{email}）をご使用ください。
-        </p>
-    </div>
-
-    <div style="text-align: center; color: #6c757d; font-size: 16px; padding-top: 20px; border-top: 1px solid #dee2e6;">
-        <p>AI学習チェックリスト</p>
-    </div>
-</body>
-</html>
-            """
-
-            part1 = MIMEText(text_body, 'plain', 'utf-8')
-            part2 = MIMEText(html_body, 'html', 'utf-8')
-            msg.attach(part1)
-            msg.attach(part2)
-
-            server.send_message(msg)
-            success_list.append(email)
-
-        except Exception as e:
-            failed_list.append(f"{email} ({str(e)})")
-
-    server.quit()
-
-    if len(failed_list) == 0:
-        return True, f"✅ 未登録者{len(success_list)}名に招待メールを送信しました！", success_list, failed_list
-    elif len(success_list) == 0:
-        return False, "❌ 招待メールの送信に失敗しました", success_list, failed_list
-    else:
-        return True, f"⚠️ {len(success_list)}名に送信成功、{len(failed_list)}名に送信失敗", success_list, failed_list
-
-
 def get_meetings_needing_reminder(user_id: int, hours_before: int = 24) -> List[Dict]:
     """
     リマインダーが必要なミーティングを取得
@@ -2062,203 +2853,35 @@ def get_meetings_needing_reminder(user_id: int, hours_before: int = 24) -> List[
     Returns:
         リマインダーが必要なミーティングのリスト
     """
-    from datetime import datetime, timedelta
-
     conn = get_connection()
     cursor = conn.cursor()
 
-    now = datetime.now()
-    future = now + timedelta(hours=hours_before)
+    now = int(time.time())
+    future = now + hours_before * 3600
 
     reminder_type = 'reminder_24h' if hours_before == 24 else 'reminder_1h'
 
     cursor.execute("""
-        SELECT m.*, u.name as host_name, g.name as group_name,
-               COUNT(mp.user_id) as participant_count
+        SELECT m.*, u.name as host_name, g.name as group_name
         FROM meetings m
         JOIN users u ON m.host_id = u.id
         JOIN groups g ON m.group_id = g.id
-        LEFT JOIN meeting_participants mp ON m.id = mp.meeting_id
         LEFT JOIN reminder_logs rl ON m.id = rl.meeting_id AND rl.reminder_type = ?
         WHERE m.host_id = ?
-          AND m.scheduled_at IS NOT NULL
-          AND m.scheduled_at >= ?
-          AND m.scheduled_at <= ?
+          AND m.scheduled_ts BETWEEN ? AND ?
           AND rl.id IS NULL
-        GROUP BY m.id
-        ORDER BY m.scheduled_at ASC
-    """, (reminder_type, user_id, now.isoformat(), future.isoformat()))
+        ORDER BY m.scheduled_ts ASC
+    """, (reminder_type, user_id, now, future))
 
     meetings = [dict(row) for row in cursor.fetchall()]
+    # まだ作成されていない繰り返しミーティングの回（リマインダーは未送信）
+    meetings.extend(_series_occurrences_in_range(cursor, user_id, now, future + 1, hosted_only=True))
     conn.close()
+    meetings.sort(key=lambda m: m['scheduled_ts'])
 
     return meetings
 
 
-def send_auto_reminder(meeting_id: int, reminder_type: str = 'reminder_24h') -> Tuple[bool, str, int]:
-    """
-    自動リマインダーを送信
-
-    Args:
-        meeting_id: ミーティングID
-        reminder_type: リマインダーの種類
-
-    Returns:
-        (成功, メッセージ, 送信数)
-    """
-    # 既に送信済みかチェック
-    if check_reminder_sent(meeting_id, reminder_type):
-        return True, "リマインダーは既に送信済みです", 0
-
-    # ミーティング情報を取得
-    meeting = get_meeting_by_id(meeting_id)
-    if not meeting:
-        return False, "ミーティングが見つかりません", 0
-
-    # 参加者を取得
-    participants = get_meeting_participants(meeting_id)
-    if not participants:
-        return False, "参加者がいません", 0
-
-    recipients = [{'name': p['name'], 'email': p['email']} for p in participants]
-
-    # フォローアップミーティングかどうか確認
-    is_followup = "フォローアップ" in meeting['title']
-
-    # リマインダーメールを送信
-    success, message, success_list, failed_list = send_zoom_reminder_email(
-        meeting['title'],
-        meeting.get('scheduled_at', ''),
-        recipients,
-        meeting.get('zoom_url', ''),
-        meeting.get('zoom_passcode'),
-        is_followup=is_followup
-    )
-
-    # 送信記録を保存
-    if success_list:
-        log_reminder_sent(meeting_id, reminder_type, len(success_list))
-
-    return success, message, len(success_list)
-
-
-def send_single_meeting_invitation(
-    recipient_email: str,
-    recipient_name: str,
-    meeting_title: str,
-    meeting_description: str,
-    formatted_date: str,
-    group_name: str,
-    host_name: str,
-    zoom_url: str = None,
-    zoom_passcode: str = None,
-    is_followup: bool = False
-) -> bool:
-    """
-    単一の招待メールを送信（フォローアップミーティング用）
-    """
-    sender_email, sender_password = get_email_config()
-    
-    if not sender_email or not sender_password:
-        return False
-    
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, sender_password)
-    except Exception as e:
-        return False
-    
-    # フォローアップの場合はタイトルを変更
-    if is_followup:
-        subject = f"【フォローアップミーティングのお知らせ】{meeting_title}"
-        intro_text = "フォローアップミーティングのご案内です。"
-    else:
-        subject = f"【ミーティングのお知らせ】{meeting_title}"
-        intro_text = "ミーティングのご案内です。"
-    
-    # Zoom情報のHTML
-    zoom_info_html = ""
-    if zoom_url:
-        zoom_info_html = f"""
-    <div style="background-color: #e3f2fd; padding: 30px; border-radius: 15px; border: 3px solid #2196f3; margin: 25px 0; text-align: center;">
-        <h3 style="color: #1565c0; margin-top: 0; font-size: 28px;">📹 Zoomミーティング情報</h3>
-        <a href="{zoom_url}" style="display: inline-block; background-color: #2196f3; color: white; padding: 20px 40px; font-size: 24px; text-decoration: none; border-radius: 10px; font-weight: bold; margin: 15px 0;">
-            🚀 ここをクリックしてZoomに参加
-        </a>
-        <p style="font-size: 20px; margin: 15px 0;"><strong>URL:</strong> {zoom_url}</p>
-"""
-        if zoom_passcode:
-            zoom_info_html += f'        <p style="font-size: 20px; margin: 10px 0;"><strong>🔑 パスコード:</strong> {zoom_passcode}</p>\n'
-        zoom_info_html += "    </div>"
-    
-    try:
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = sender_email
-        msg['To'] = recipient_email
-        
-        html_body = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-</head>
-<body style="font-family: 'Hiragino Sans', 'Meiryo', sans-serif; max-width: 600px; margin: 0 auto; padding: 20px; background-color: #f5f5f5;">
-    <div style="background-color: white; padding: 40px; border-radius: 20px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
-        <h1 style="color: #1976d2; text-align: center; font-size: 32px; border-bottom: 3px solid #1976d2; padding-bottom: 20px;">
-            {'🔄' if is_followup else '📅'} {meeting_title}
-        </h1>
-        
-        <p style="font-size: 24px; color: #333; margin: 25px 0;">
-            {recipient_name}様
-        </p>
-        
-        <p style="font-size: 20px; color: #333; line-height: 1.8;">
-            {intro_text}
-        </p>
-        
-        <div style="background-color: #fff8e1; padding: 25px; border-radius: 15px; border: 3px solid #ff9800; margin: 25px 0;">
-            <h3 style="color: #f57c00; margin-top: 0; font-size: 24px;">📋 ミーティング詳細</h3>
-            <table style="width: 100%; font-size: 20px; border-collapse: collapse;">
-                <tr>
-                    <td style="padding: 10px 0; font-weight: bold; width: 120px;">📌 タイトル:</td>
-                    <td style="padding: 10px 0;">{meeting_title}</td>
-                </tr>
-                <tr>
-                    <td style="padding: 10px 0; font-weight: bold;">📅 日時:</td>
-                    <td style="padding: 10px 0;">{formatted_date}</td>
-                </tr>
-                <tr>
-                    <td style="padding: 10px 0; font-weight: bold;">👥 グループ:</td>
-                    <td style="padding: 10px 0;">{group_name}</td>
-                </tr>
-                <tr>
-                    <td style="padding: 10px 0; font-weight: bold;">👤 ホスト:</td>
-                    <td style="padding: 10px 0;">{host_name}</td>
-                </tr>
-            </table>
-            {f'<p style="font-size: 18px; margin-top: 15px; color: #555;"><strong>説明:</strong> {meeting_description}</p>' if meeting_description else ''}
-        </div>
-        
-        {zoom_info_html}
-        
-        <p style="font-size: 18px; color: #666; text-align: center; margin-top: 30px;">
-            ご参加をお待ちしております。
-        </p>
-    </div>
-</body>
-</html>
-"""
-        
-        msg.attach(MIMEText(html_body, 'html'))
-        server.sendmail(sender_email, recipient_email, msg.as_string())
-        server.quit()
-        return True
-    except Exception as e:
-        return False
-
-
 # データベース初期化
 if __name__ == "__main__":
     init_database()
@@ -0,0 +1,356 @@
+"""
+オフライン用のOpenAI API代替サーバー
+ネットワークやAPIキーなしで、AIチャット・議事録生成・Whisper文字起こしの動作確認や負荷測定ができます。
+
+対応しているエンドポイント:
+    POST /v1/chat/completions       （stream=true のServer-Sent Eventsにも対応）
+    POST /v1/audio/transcriptions   （json / verbose_json / text）
+    GET  /v1/models
+
+使い方:
+    python fake_openai_server.py --port 8765 --latency 0.5
+    # アプリ側は .env に OPENAI_BASE_URL=http://127.0.0.1:8765/v1 を設定（APIキーは任意の文字列でよい）
+
+応答の決め方:
+    1. --fixtures のファイルに記録された応答（同じ質問なら同じ応答）
+    2. --fixtures の "rules"（質問に部分一致した応答）
+    3. 決まった既定の応答
+
+    --record を付けると本番のAPIに転送し、その応答を --fixtures のファイルに追記します
+    （実際の応答を一度だけ記録して、以降はオフラインで再生するため）。
+
+fixturesファイルの形式（JSON）:
+    {
+      "rules": [{"contains": "重要なポイント", "response": "..."}],
+      "recorded": {"<質問>": "<応答>"},
+      "transcription": {"text": "...", "duration": 600}
+    }
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+DEFAULT_CHAT_RESPONSE = (
+    "ご質問ありがとうございます。\n\n"
+    "- 今日の学習会では、AIとの上手な付き合い方を学びました\n"
+    "- わからないことは、何度でも気軽に質問してみてください\n\n"
+    "少しずつ慣れていけば大丈夫です。一緒にがんばりましょう！"
+)
+
+DEFAULT_MINUTES = """## 📝 会議の要約
+AIの基本的な使い方について学びました。参加者は実際にAIに質問して、回答を確かめました。
+
+## 📌 主要なトピック
+- AIとは何か
+- AIへの質問のしかた
+
+## ✅ 決定事項
+- 特になし
+
+## 🔄 次回への申し送り事項
+- 家でAIに1つ質問してみる"""
+
+DEFAULT_TRANSCRIPTION = "本日はAIの使い方について学びます。まずはAIに質問してみましょう。"
+
+# 音声の長さの見積もり（実際の音声を解析しないため、128kbpsのMP3とみなす）
+AUDIO_BYTES_PER_SECOND = 16000
+
+UPSTREAM_URL = "https://api.openai.com/v1"
+
+
+class FakeOpenAIConfig:
+    """サーバーの設定と、fixturesファイルの読み書き"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, stream_delay: float = 0.0,
+                 fixtures_path: Optional[str] = None, record: bool = False, upstream_api_key: str = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.stream_delay = stream_delay
+        self.fixtures_path = fixtures_path
+        self.record = record
+        self.upstream_api_key = upstream_api_key
+        self.lock = threading.Lock()
+        self.fixtures: Dict = {"rules": [], "recorded": {}, "transcription": {}}
+        if fixtures_path:
+            try:
+                with open(fixtures_path, encoding="utf-8") as f:
+                    self.fixtures.update(json.load(f))
+            except FileNotFoundError:
+                pass
+
+    def wait(self):
+        """設定された応答遅延を再現"""
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def record_chat(self, question: str, answer: str):
+        """本番のAPIから受け取ったチャットの応答をfixturesファイルに追記"""
+        with self.lock:
+            self.fixtures["recorded"][question] = answer
+            self._write_fixtures()
+
+    def record_transcription(self, text: str, duration: Optional[float]):
+        """本番のAPIから受け取った文字起こし結果をfixturesファイルに保存"""
+        with self.lock:
+            self.fixtures["transcription"] = {"text": text, "duration": duration}
+            self._write_fixtures()
+
+    def _write_fixtures(self):
+        if self.fixtures_path:
+            with open(self.fixtures_path, "w", encoding="utf-8") as f:
+                json.dump(self.fixtures, f, ensure_ascii=False, indent=2)
+
+
+def estimate_tokens(text: str) -> int:
+    """トークン数のおおよその見積もり（日本語は1文字≒1トークン、英数字は4文字≒1トークン）"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_chars) + ascii_chars // 4
+
+
+def canned_chat_response(config: FakeOpenAIConfig, request: Dict) -> str:
+    """リクエストに対する応答文を決める"""
+    messages = request.get("messages", [])
+    question = messages[-1]["content"] if messages else ""
+    system = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+
+    if question in config.fixtures["recorded"]:
+        return config.fixtures["recorded"][question]
+
+    for rule in config.fixtures["rules"]:
+        if rule.get("contains") and rule["contains"] in question:
+            return rule["response"]
+
+    # JSONモード（よくある質問のまとめて回答）：番号付きの質問の数だけ回答を返す
+    if (request.get("response_format") or {}).get("type") == "json_object":
+        count = len(re.findall(r"^\d+\. ", question, flags=re.MULTILINE)) or 1
+        return json.dumps({"answers": [DEFAULT_CHAT_RESPONSE] * count}, ensure_ascii=False)
+
+    if "議事録" in system and "議事録フォーマット" in question:
+        return DEFAULT_MINUTES
+
+    return DEFAULT_CHAT_RESPONSE
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    server_version = "FakeOpenAI/1.0"
+    config: FakeOpenAIConfig = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length) if length else b""
+
+    def forward_to_upstream(self, path: str, body: bytes, content_type: str) -> bytes:
+        """記録モード：同じリクエストを本番のAPIに転送"""
+        request = urllib.request.Request(
+            UPSTREAM_URL + path, data=body, method="POST",
+            headers={"Authorization": f"Bearer {self.config.upstream_api_key}", "Content-Type": content_type}
+        )
+        with urllib.request.urlopen(request, timeout=600) as response:
+            return response.read()
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self.send_json(200, {"object": "list", "data": [
+                {"id": model, "object": "model", "owned_by": "fake"}
+                for model in ("gpt-4o", "gpt-4o-mini", "whisper-1")
+            ]})
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path: {self.path}", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        body = self.read_body()
+        if self.path.endswith("/chat/completions"):
+            self.handle_chat(body)
+        elif self.path.endswith("/audio/transcriptions"):
+            self.handle_transcription(body)
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path: {self.path}", "type": "invalid_request_error"}})
+
+    def handle_chat(self, body: bytes):
+        request = json.loads(body or b"{}")
+        messages = request.get("messages", [])
+        question = messages[-1]["content"] if messages else ""
+
+        if self.config.record and question not in self.config.fixtures["recorded"]:
+            upstream_request = dict(request, stream=False)
+            upstream_body = json.dumps(upstream_request).encode("utf-8")
+            upstream = json.loads(self.forward_to_upstream("/chat/completions", upstream_body, "application/json"))
+            content = upstream["choices"][0]["message"]["content"]
+            self.config.record_chat(question, content)
+        else:
+            self.config.wait()
+            content = canned_chat_response(self.config, request)
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = request.get("model", "gpt-4o")
+        prompt_tokens = sum(estimate_tokens(str(m.get("content", ""))) for m in messages)
+        completion_tokens = estimate_tokens(content)
+
+        if not request.get("stream"):
+            self.send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            })
+            return
+
+        # ストリーミング：数文字ずつServer-Sent Eventsで送る
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def send_chunk(delta: Dict, finish_reason: Optional[str] = None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        send_chunk({"role": "assistant", "content": ""})
+        for start in range(0, len(content), 4):
+            if self.config.stream_delay > 0:
+                time.sleep(self.config.stream_delay)
+            send_chunk({"content": content[start:start + 4]})
+        send_chunk({}, "stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def handle_transcription(self, body: bytes):
+        content_type = self.headers.get("Content-Type", "")
+        fields = parse_multipart_fields(body, content_type)
+        response_format = fields.get("response_format", "json")
+
+        fixture = self.config.fixtures.get("transcription") or {}
+        if self.config.record and not fixture:
+            upstream = self.forward_to_upstream("/audio/transcriptions", body, content_type)
+            if response_format == "text":
+                fixture = {"text": upstream.decode("utf-8").strip()}
+            else:
+                upstream = json.loads(upstream)
+                fixture = {"text": upstream["text"], "duration": upstream.get("duration")}
+            self.config.record_transcription(fixture["text"], fixture.get("duration"))
+        else:
+            self.config.wait()
+
+        text = fixture.get("text", DEFAULT_TRANSCRIPTION)
+        duration = fixture.get("duration") or round(len(body) / AUDIO_BYTES_PER_SECOND, 2)
+
+        if response_format == "text":
+            payload = text.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        elif response_format == "verbose_json":
+            self.send_json(200, {
+                "task": "transcribe",
+                "language": fields.get("language", "ja"),
+                "duration": duration,
+                "text": text,
+                "segments": []
+            })
+        else:
+            self.send_json(200, {"text": text})
+
+
+def parse_multipart_fields(body: bytes, content_type: str) -> Dict[str, str]:
+    """multipart/form-dataから、ファイル以外の項目（model、languageなど）を取り出す"""
+    match = re.search(r"boundary=([^;]+)", content_type)
+    if not match:
+        return {}
+    boundary = match.group(1).strip('"').encode()
+    fields = {}
+    for part in body.split(b"--" + boundary):
+        header, _, value = part.partition(b"\r\n\r\n")
+        name = re.search(rb'name="([^"]+)"', header)
+        if name and b"filename=" not in header:
+            fields[name.group(1).decode()] = value.rstrip(b"\r\n").decode("utf-8", "replace")
+    return fields
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, **config_options) -> ThreadingHTTPServer:
+    """設定を持ったサーバーを作成（port=0で空いているポートを使う）"""
+    handler = type("ConfiguredHandler", (FakeOpenAIHandler,), {"config": FakeOpenAIConfig(**config_options)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, **config_options) -> ThreadingHTTPServer:
+    """サーバーをバックグラウンドのスレッドで起動（ベンチマークなどから使う）"""
+    server = make_server(host, port, **config_options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="オフライン用のOpenAI API代替サーバー")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="応答までの遅延（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="遅延に加えるランダムなばらつき（秒）")
+    parser.add_argument("--stream-delay", type=float, default=0.0, help="ストリーミングのチャンクごとの遅延（秒）")
+    parser.add_argument("--fixtures", help="応答を定義・記録するJSONファイル")
+    parser.add_argument("--record", action="store_true",
+                        help="本番のAPIに転送して応答を--fixturesに記録する（OPENAI_API_KEYが必要）")
+    args = parser.parse_args()
+
+    upstream_api_key = None
+    if args.record:
+        upstream_api_key = os.getenv("OPENAI_API_KEY")
+        if not upstream_api_key or not args.fixtures:
+            parser.error("--record には OPENAI_API_KEY と --fixtures が必要です")
+
+    server = make_server(
+        args.host, args.port,
+        latency=args.latency, jitter=args.jitter, stream_delay=args.stream_delay,
+        fixtures_path=args.fixtures, record=args.record, upstream_api_key=upstream_api_key
+    )
+    print(f"Fake OpenAI server: http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,889 @@
+"""
+メール送信モジュール
+議事録・リマインダー・招待メールの送信を管理
+（smtplib・emailモジュールは、database.pyから初めて使うときに読み込まれる）
+"""
+
+import smtplib
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple
+
+from config import get_config
+from database import (
+    get_meeting_by_id,
+    get_meeting_participants,
+    check_reminder_sent,
+    log_reminder_sent,
+)
+
+def get_email_config() -> Tuple[Optional[str], Optional[str]]:
+    """
+    メール設定を取得（config.pyで読み込んだ設定から）
+
+    Returns:
+        (メールアドレス, アプリパスワード)
+    """
+    config = get_config()
+    return config.email_address, config.email_password
+
+def send_minutes_email(
+    meeting_id: int,
+    meeting_title: str,
+    scheduled_at: str,
+    minutes_content: str,
+    recipients: List[Dict],
+    zoom_url: str = None,
+    zoom_passcode: str = None
+) -> Tuple[bool, str, List[str], List[str]]:
+    """
+    議事録をメールで参加者に送信（Zoom情報含む）
+
+    Args:
+        meeting_id: ミーティングID
+        meeting_title: ミーティングタイトル
+        scheduled_at: 開催日時
+        minutes_content: 議事録の内容
+        recipients: 送信先リスト [{'name': '名前', 'email': 'メールアドレス'}, ...]
+        zoom_url: ZoomミーティングURL（オプション）
+        zoom_passcode: Zoomパスコード（オプション）
+
+    Returns:
+        (成功, メッセージ, 送信成功リスト, 送信失敗リスト)
+    """
+    # メール設定を取得
+    sender_email, sender_password = get_email_config()
+
+    if not sender_email or not sender_password:
+        return False, "メール設定が見つかりません。EMAIL_ADDRESS と EMAIL_PASSWORD を設定してください。", [], []
+
+    # 日時の整形
+    try:
+        dt = datetime.fromisoformat(scheduled_at)
+        formatted_date = dt.strftime('%Y年%m月%d日 %H:%M')
+    except:
+        formatted_date = scheduled_at
+
+    # 送信結果を追跡
+    success_list = []
+    failed_list = []
+
+    # SMTPサーバー（既定はGmail）に接続
+    try:
+        server = smtplib.SMTP(get_config().smtp_host, get_config().smtp_port)
+        server.starttls()
+        server.login(sender_email, sender_password)
+    except smtplib.SMTPAuthenticationError:
+        return False, "メールの認証に失敗しました。EMAIL_ADDRESS と EMAIL_PASSWORD（Gmailアプリパスワード）を確認してください。", [], []
+    except Exception as e:
+        return False, f"メールサーバーへの接続に失敗しました: {str(e)}", [], []
+
+    # Zoom情報のテキスト
+    zoom_info_text = ""
+    zoom_info_html = ""
+    if zoom_url:
+        zoom_info_text = f"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+📹 Zoomミーティング情報
+URL: {zoom_url}
+"""
+        if zoom_passcode:
+            zoom_info_text += f"パスコード: {zoom_passcode}\n"
+        zoom_info_text += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+
+        zoom_info_html = f"""
+    <div style="background-color: #e3f2fd; padding: 25px; border-radius: 10px; border-left: 5px solid #2196f3; margin: 20px 0;">
+        <h3 style="color: #1565c0; margin-top: 0;">📹 Zoomミーティング情報</h3>
+        <p style="font-size: 20px; margin: 10px 0;"><strong>URL:</strong> <a href="{zoom_url}" style="color: #1976d2;">{zoom_url}</a></p>
+"""
+        if zoom_passcode:
+            zoom_info_html += f'        <p style="font-size: 20px; margin: 10px 0;"><strong>パスコード:</strong> {zoom_passcode}</p>\n'
+        zoom_info_html += "    </div>"
+
+    # 各受信者にメールを送信
+    for recipient in recipients:
+        try:
+            # メールを作成
+            msg = MIMEMultipart('alternative')
+            msg['Subject'] = f"【議事録】{meeting_title}"
+            msg['From'] = sender_email
+            msg['To'] = recipient['email']
+
+            # プレーンテキスト版のメール本文（高齢者向けにわかりやすく）
+            text_body = f"""
+{recipient['name']} 様
+
+お疲れ様です。
+以下のミーティングの議事録をお送りいたします。
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+📅 ミーティング名：{meeting_title}
+📆 開催日時：{formatted_date}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{zoom_info_text}
+{minutes_content}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+このメールは自動送信されています。
+ご不明な点がございましたら、ホストにお問い合わせください。
+
+AI学習チェックリスト
+            """
+
+            # HTML版のメール本文（より見やすいフォーマット）
+            html_body = f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <style>
+        body {{
+            font-family: 'メイリオ', 'ヒラギノ角ゴ Pro W3', sans-serif;
+            font-size: 18px;
+            line-height: 1.8;
+            color: #333;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            border-radius: 15px;
+            margin-bottom: 30px;
+        }}
+        .header h1 {{
+            margin: 0;
+            font-size: 28px;
+        }}
+        .meeting-info {{
+            background-color: #f8f9fa;
+            padding: 25px;
+            border-radius: 10px;
+            border-left: 5px solid #007bff;
+            margin-bottom: 30px;
+        }}
+        .meeting-info p {{
+            margin: 10px 0;
+            font-size: 20px;
+        }}
+        .minutes-content {{
+            background-color: #fff;
+            padding: 30px;
+            border-radius: 15px;
+            border: 2px solid #dee2e6;
+            margin-bottom: 30px;
+        }}
+        .footer {{
+            text-align: center;
+            color: #6c757d;
+            font-size: 16px;
+            padding-top: 20px;
+            border-top: 1px solid #dee2e6;
+        }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>📝 議事録のお知らせ</h1>
+    </div>
+
+    <p style="font-size: 22px;"><strong>{recipient['name']}</strong> 様</p>
+    <p>お疲れ様です。<br>以下のミーティングの議事録をお送りいたします。</p>
+
+    <div class="meeting-info">
+        <p>📅 <strong>ミーティング名：</strong>{meeting_title}</p>
+        <p>📆 <strong>開催日時：</strong>{formatted_date}</p>
+    </div>
+
+    {zoom_info_html}
+
+    <div class="minutes-content">
+        {minutes_content.replace(chr(10), '<br>')}
+    </div>
+
+    <div class="footer">
+        <p>このメールは自動送信されています。<br>
+        ご不明な点がございましたら、ホストにお問い合わせください。</p>
+        <p><strong>AI学習チェックリスト</strong></p>
+    </div>
+</body>
+</html>
+            """
+
+            # プレーンテキストとHTMLを追加
+            part1 = MIMEText(text_body, 'plain', 'utf-8')
+            part2 = MIMEText(html_body, 'html', 'utf-8')
+            msg.attach(part1)
+            msg.attach(part2)
+
+            # メール送信
+            server.send_message(msg)
+            success_list.append(recipient['email'])
+
+        except Exception as e:
+            failed_list.append(f"{recipient['email']} ({str(e)})")
+
+    # サーバー接続を閉じる
+    server.quit()
+
+    # 結果メッセージを作成
+    if len(failed_list) == 0:
+        result_message = f"✅ {len(success_list)}名全員にメールを送信しました！"
+        return True, result_message, success_list, failed_list
+    elif len(success_list) == 0:
+        result_message = f"❌ メールの送信に失敗しました"
+        return False, result_message, success_list, failed_list
+    else:
+        result_message = f"⚠️ {len(success_list)}名に送信成功、{len(failed_list)}名に送信失敗"
+        return True, result_message, success_list, failed_list
+
+def send_zoom_reminder_email(
+    meeting_title: str,
+    scheduled_at: str,
+    recipients: List[Dict],
+    zoom_url: str,
+    zoom_passcode: str = None,
+    is_followup: bool = False
+) -> Tuple[bool, str, List[str], List[str]]:
+    """
+    Zoomミーティングのリマインダーメールを送信
+
+    Args:
+        meeting_title: ミーティングタイトル
+        scheduled_at: 開催日時
+        recipients: 送信先リスト
+        zoom_url: ZoomミーティングURL
+        zoom_passcode: Zoomパスコード（オプション）
+        is_followup: フォローアップミーティングかどうか
+
+    Returns:
+        (成功, メッセージ, 送信成功リスト, 送信失敗リスト)
+    """
+    # メール設定を取得
+    sender_email, sender_password = get_email_config()
+
+    if not sender_email or not sender_password:
+        return False, "メール設定が見つかりません。", [], []
+
+    # 日時の整形
+    try:
+        dt = datetime.fromisoformat(scheduled_at)
+        formatted_date = dt.strftime('%Y年%m月%d日 %H:%M')
+    except:
+        formatted_date = scheduled_at
+
+    success_list = []
+    failed_list = []
+
+    try:
+        server = smtplib.SMTP(get_config().smtp_host, get_config().smtp_port)
+        server.starttls()
+        server.login(sender_email, sender_password)
+    except Exception as e:
+        return False, f"メールサーバーへの接続に失敗しました: {str(e)}", [], []
+
+    # フォローアップの場合はタイトルを変更
+    if is_followup or "フォローアップ" in meeting_title:
+        subject_prefix = "【フォローアップリマインダー】"
+        header_text = "🔄 フォローアップミーティングリマインダー"
+        intro_text = "フォローアップミーティングがまもなく始まります！"
+    else:
+        subject_prefix = "【リマインダー】"
+        header_text = "🔔 ミーティングリマインダー"
+        intro_text = "まもなくミーティングが始まります！"
+
+    for recipient in recipients:
+        try:
+            msg = MIMEMultipart('alternative')
+            msg['Subject'] = f"{subject_prefix}{meeting_title} - Zoomミーティングのお知らせ"
+            msg['From'] = sender_email
+            msg['To'] = recipient['email']
+
+            passcode_text = f"\n🔑 パスコード：{zoom_passcode}" if zoom_passcode else ""
+            passcode_html = f'<p style="font-size: 24px; margin: 15px 0;">🔑 <strong>パスコード：</strong>{zoom_passcode}</p>' if zoom_passcode else ""
+
+            text_body = f"""
+{recipient['name']} 様
+
+{intro_text}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+📅 ミーティング名：{meeting_title}
+📆 開催日時：{formatted_date}
+
+📹 Zoomミーティング
+URL: {zoom_url}{passcode_text}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+上記のURLをクリックするとZoomに参加できます。
+
+AI学習チェックリスト
+            """
+
+            html_body = f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+</head>
+<body style="font-family: 'メイリオ', sans-serif; font-size: 20px; line-height: 1.8; color: #333; max-width: 800px; margin: 0 auto; padding: 20px;">
+    <div style="background: linear-gradient(135deg, #4CAF50 0%, #2E7D32 100%); color: white; padding: 30px; border-radius: 15px; margin-bottom: 30px; text-align: center;">
+        <h1 style="margin: 0; font-size: 32px;">{header_text}</h1>
+    </div>
+
+    <p style="font-size: 24px;"><strong>{recipient['name']}</strong> 様</p>
+    <p style="font-size: 22px;">{intro_text}</p>
+
+    <div style="background-color: #e8f5e9; padding: 30px; border-radius: 15px; border: 3px solid #4CAF50; margin: 25px 0;">
+        <p style="font-size: 24px; margin: 10px 0;">📅 <strong>{meeting_title}</strong></p>
+        <p style="font-size: 24px; margin: 10px 0;">📆 <strong>{formatted_date}</strong></p>
+    </div>
+
+    <div style="background-color: #e3f2fd; padding: 30px; border-radius: 15px; border: 3px solid #2196f3; margin: 25px 0; text-align: center;">
+        <h2 style="color: #1565c0; margin-top: 0;">📹 Zoomに参加する</h2>
+        <a href="{zoom_url}" style="display: inline-block; background-color: #2196f3; color: white; padding: 20px 40px; font-size: 24px; text-decoration: none; border-radius: 10px; font-weight: bold; margin: 15px 0;">
+            🚀 ここをクリックして参加
+        </a>
+        {passcode_html}
+    </div>
+
+    <div style="text-align: center; color: #6c757d; font-size: 16px; padding-top: 20px; border-top: 1px solid #dee2e6;">
+        <p>AI学習チェックリスト</p>
+    </div>
+</body>
+</html>
+            """
+
+            part1 = MIMEText(text_body, 'plain', 'utf-8')
+            part2 = MIMEText(html_body, 'html', 'utf-8')
+            msg.attach(part1)
+            msg.attach(part2)
+
+            server.send_message(msg)
+            success_list.append(recipient['email'])
+
+        except Exception as e:
+            failed_list.append(f"{recipient['email']} ({str(e)})")
+
+    server.quit()
+
+    if len(failed_list) == 0:
+        return True, f"✅ {len(success_list)}名にリマインダーを送信しました！", success_list, failed_list
+    elif len(success_list) == 0:
+        return False, "❌ リマインダーの送信に失敗しました", success_list, failed_list
+    else:
+        return True, f"⚠️ {len(success_list)}名に送信成功、{len(failed_list)}名に送信失敗", success_list, failed_list
+
+def send_meeting_invitation_email(
+    meeting_id: int,
+    meeting_title: str,
+    meeting_description: str,
+    scheduled_at: str,
+    host_name: str,
+    group_name: str,
+    recipients: List[Dict],
+    zoom_url: str = None,
+    zoom_passcode: str = None,
+    recurrence: str = None
+) -> Tuple[bool, str, List[str], List[str]]:
+    """
+    ミーティング招待メールを送信（作成時に自動送信）
+
+    Args:
+        meeting_id: ミーティングID
+        meeting_title: ミーティングタイトル
+        meeting_description: ミーティングの説明
+        scheduled_at: 開催日時
+        host_name: ホスト名
+        group_name: グループ名
+        recipients: 送信先リスト
+        zoom_url: ZoomミーティングURL（オプション）
+        zoom_passcode: Zoomパスコード（オプション）
+        recurrence: 繰り返しの説明（繰り返しミーティングのとき。例：「毎週・全12回」）
+
+    Returns:
+        (成功, メッセージ, 送信成功リスト, 送信失敗リスト)
+    """
+    # 既に送信済みかチェック
+    if check_reminder_sent(meeting_id, 'invitation'):
+        return True, "招待メールは既に送信済みです", [], []
+
+    # メール設定を取得
+    sender_email, sender_password = get_email_config()
+
+    if not sender_email or not sender_password:
+        return False, "メール設定が見つかりません。", [], []
+
+    # 日時の整形
+    try:
+        dt = datetime.fromisoformat(scheduled_at)
+        formatted_date = dt.strftime('%Y年%m月%d日 %H:%M')
+    except:
+        formatted_date = scheduled_at
+
+    # 繰り返しミーティングは、開催日時が初回の日時であることと繰り返しの内容を添える
+    recurrence_text = f"🔁 繰り返し：{recurrence}（初回の日時です）\n" if recurrence else ""
+
+    success_list = []
+    failed_list = []
+
+    try:
+        server = smtplib.SMTP(get_config().smtp_host, get_config().smtp_port)
+        server.starttls()
+        server.login(sender_email, sender_password)
+    except Exception as e:
+        return False, f"メールサーバーへの接続に失敗しました: {str(e)}", [], []
+
+    # Zoom情報のHTML
+    zoom_info_html = ""
+    if zoom_url:
+        zoom_info_html = f"""
+    <div style="background-color: #e3f2fd; padding: 30px; border-radius: 15px; border: 3px solid #2196f3; margin: 25px 0; text-align: center;">
+        <h3 style="color: #1565c0; margin-top: 0; font-size: 28px;">📹 Zoomミーティング情報</h3>
+        <a href="{zoom_url}" style="display: inline-block; background-color: #2196f3; color: white; padding: 20px 40px; font-size: 24px; text-decoration: none; border-radius: 10px; font-weight: bold; margin: 15px 0;">
+            🚀 ここをクリックしてZoomに参加
+        </a>
+        <p style="font-size: 20px; margin: 15px 0;"><strong>URL:</strong> {zoom_url}</p>
+"""
+        if zoom_passcode:
+            zoom_info_html += f'        <p style="font-size: 20px; margin: 10px 0;"><strong>🔑 パスコード:</strong> {zoom_passcode}</p>\n'
+        zoom_info_html += "    </div>"
+
+    for recipient in recipients:
+        try:
+            msg = MIMEMultipart('alternative')
+            msg['Subject'] = f"【ミーティングのお知らせ】{meeting_title}"
+            msg['From'] = sender_email
+            msg['To'] = recipient['email']
+
+            text_body = f"""
+{recipient['name']} 様
+
+新しいミーティングのお知らせです。
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+📅 ミーティング名：{meeting_title}
+📆 開催日時：{formatted_date}
+{recurrence_text}👥 グループ：{group_name}
+👑 ホスト：{host_name}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+{f"📝 説明：{meeting_description}" if meeting_description else ""}
+
+{f"📹 Zoom URL：{zoom_url}" if zoom_url else ""}
+{f"🔑 パスコード：{zoom_passcode}" if zoom_passcode else ""}
+
+カレンダーに予定を追加しておいてくださいね！
+
+AI学習チェックリスト
+            """
+
+            html_body = f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+</head>
+<body style="font-family: 'メイリオ', sans-serif; font-size: 20px; line-height: 1.8; color: #333; max-width: 800px; margin: 0 auto; padding: 20px;">
+    <div style="background: linear-gradient(135deg, #4CAF50 0%, #2E7D32 100%); color: white; padding: 30px; border-radius: 15px; margin-bottom: 30px; text-align: center;">
+        <h1 style="margin: 0; font-size: 32px;">📅 ミーティングのお知らせ</h1>
+    </div>
+
+    <p style="font-size: 24px;"><strong>{recipient['name']}</strong> 様</p>
+    <p style="font-size: 22px;">新しいミーティングが予定されました！<br>ぜひご参加ください。</p>
+
+    <div style="background-color: #e8f5e9; padding: 30px; border-radius: 15px; border: 3px solid #4CAF50; margin: 25px 0;">
+        <p style="font-size: 26px; margin: 10px 0;"><strong>📅 {meeting_title}</strong></p>
+        <p style="font-size: 24px; margin: 10px 0;">📆 <strong>日時：</strong>{formatted_date}</p>
+        {f'<p style="font-size: 24px; margin: 10px 0;">🔁 <strong>繰り返し：</strong>{recurrence}（初回の日時です）</p>' if recurrence else ''}
+        <p style="font-size: 22px; margin: 10px 0;">👥 <strong>グループ：</strong>{group_name}</p>
+        <p style="font-size: 22px; margin: 10px 0;">👑 <strong>ホスト：</strong>{host_name}</p>
+        {f'<p style="font-size: 20px; margin: 15px 0; color: #555;">📝 {meeting_description}</p>' if meeting_description else ''}
+    </div>
+
+    {zoom_info_html}
+
+    <div style="background-color: #fff3e0; padding: 25px; border-radius: 15px; border: 3px solid #ff9800; margin: 25px 0;">
+        <p style="font-size: 22px; color: #e65100; margin: 0;">
+            📌 <strong>お願い：</strong>カレンダーに予定を追加しておいてくださいね！
+        </p>
+    </div>
+
+    <div style="text-align: center; color: #6c757d; font-size: 16px; padding-top: 20px; border-top: 1px solid #dee2e6;">
+        <p>AI学習チェックリスト</p>
+    </div>
+</body>
+</html>
+            """
+
+            part1 = MIMEText(text_body, 'plain', 'utf-8')
+            part2 = MIMEText(html_body, 'html', 'utf-8')
+            msg.attach(part1)
+            msg.attach(part2)
+
+            server.send_message(msg)
+            success_list.append(recipient['email'])
+
+        except Exception as e:
+            failed_list.append(f"{recipient['email']} ({str(e)})")
+
+    server.quit()
+
+    # 送信記録を保存
+    if success_list:
+        log_reminder_sent(meeting_id, 'invitation', len(success_list))
+
+    if len(failed_list) == 0:
+        return True, f"✅ {len(success_list)}名に招待メールを送信しました！", success_list, failed_list
+    elif len(success_list) == 0:
+        return False, "❌ 招待メールの送信に失敗しました", success_list, failed_list
+    else:
+        return True, f"⚠️ {len(success_list)}名に送信成功、{len(failed_list)}名に送信失敗", success_list, failed_list
+
+def send_meeting_invitation_to_pending(
+    meeting_title: str,
+    meeting_description: str,
+    scheduled_at: str,
+    host_name: str,
+    group_name: str,
+    pending_emails: List[str],
+    app_url: str,
+    zoom_url: str = None,
+    zoom_passcode: str = None,
+    recurrence: str = None
+) -> Tuple[bool, str, List[str], List[str]]:
+    """
+    未登録の招待者にミーティング招待メールを送信
+
+    Args:
+        meeting_title: ミーティングタイトル
+        meeting_description: ミーティングの説明
+        scheduled_at: 開催日時
+        host_name: ホスト名
+        group_name: グループ名
+        pending_emails: 未登録の招待者メールアドレスリスト
+        app_url: アプリのURL
+        zoom_url: ZoomミーティングURL（オプション）
+        zoom_passcode: Zoomパスコード（オプション）
+        recurrence: 繰り返しの説明（繰り返しミーティングのとき。例：「毎週・全12回」）
+
+    Returns:
+        (成功, メッセージ, 送信成功リスト, 送信失敗リスト)
+    """
+    if not pending_emails:
+        return True, "送信対象者がいません", [], []
+
+    # メール設定を取得
+    sender_email, sender_password = get_email_config()
+
+    if not sender_email or not sender_password:
+        return False, "メール設定が見つかりません。", [], []
+
+    # 日時の整形
+    try:
+        dt = datetime.fromisoformat(scheduled_at)
+        formatted_date = dt.strftime('%Y年%m月%d日 %H:%M')
+    except:
+        formatted_date = scheduled_at
+
+    # 繰り返しミーティングは、開催日時が初回の日時であることと繰り返しの内容を添える
+    recurrence_text = f"🔁 繰り返し：{recurrence}（初回の日時です）\n" if recurrence else ""
+
+    success_list = []
+    failed_list = []
+
+    try:
+        server = smtplib.SMTP(get_config().smtp_host, get_config().smtp_port)
+        server.starttls()
+        server.login(sender_email, sender_password)
+    except Exception as e:
+        return False, f"メールサーバーへの接続に失敗しました: {str(e)}", [], []
+
+    # Zoom情報のHTML
+    zoom_info_html = ""
+    zoom_info_text = ""
+    if zoom_url:
+        zoom_info_text = f"""
+📹 Zoom URL：{zoom_url}
+🔑 パスコード：{zoom_passcode if zoom_passcode else '（なし）'}
+"""
+        zoom_info_html = f"""
+    <div style="background-color: #e3f2fd; padding: 30px; border-radius: 15px; border: 3px solid #2196f3; margin: 25px 0; text-align: center;">
+        <h3 style="color: #1565c0; margin-top: 0; font-size: 28px;">📹 Zoomミーティング情報</h3>
+        <a href="{zoom_url}" style="display: inline-block; background-color: #2196f3; color: white; padding: 20px 40px; font-size: 24px; text-decoration: none; border-radius: 10px; font-weight: bold; margin: 15px 0;">
+            🚀 ここをクリックしてZoomに参加
+        </a>
+        <p style="font-size: 20px; margin: 15px 0;"><strong>URL:</strong> {zoom_url}</p>
+"""
+        if zoom_passcode:
+            zoom_info_html += f'        <p style="font-size: 20px; margin: 10px 0;"><strong>🔑 パスコード:</strong> {zoom_passcode}</p>\n'
+        zoom_info_html += "    </div>"
+
+    for email in pending_emails:
+        try:
+            msg = MIMEMultipart('alternative')
+            msg['Subject'] = f"【ミーティングのお知らせ】{meeting_title}（要アカウント登録）"
+            msg['From'] = sender_email
+            msg['To'] = email
+
+            text_body = f"""
+{email} 様
+
+{host_name}さんから「{group_name}」グループのミーティングにご招待されました。
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+📅 ミーティング名：{meeting_title}
+📆 開催日時：{formatted_date}
+{recurrence_text}👥 グループ：{group_name}
+👑 ホスト：{host_name}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+{f"📝 説明：{meeting_description}" if meeting_description else ""}
+{zoom_info_text}
+
+【重要】ミーティングに参加するには、まずアプリでアカウント登録が必要です。
+
+🔗 アプリURL：{app_url}
+
+上記URLにアクセスし、「新規登録」からアカウントを作成してください。
+登録時は、このメールアドレス（{email}）をご使用ください。
+
+ご質問があれば、{host_name}さんにお問い合わせください。
+
+AI学習チェックリスト
+            """
+
+            html_body = f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+</head>
+<body style="font-family: 'メイリオ', sans-serif; font-size: 20px; line-height: 1.8; color: #333; max-width: 800px; margin: 0 auto; padding: 20px;">
+    <div style="background: linear-gradient(135deg, #4CAF50 0%, #2E7D32 100%); color: white; padding: 30px; border-radius: 15px; margin-bottom: 30px; text-align: center;">
+        <h1 style="margin: 0; font-size: 32px;">📅 ミーティングのお知らせ</h1>
+    </div>
+
+    <p style="font-size: 24px;"><strong>{email}</strong> 様</p>
+    <p style="font-size: 22px;">
+        <strong>{host_name}</strong>さんから「<strong>{group_name}</strong>」グループのミーティングにご招待されました！
+    </p>
+
+    <div style="background-color: #e8f5e9; padding: 30px; border-radius: 15px; border: 3px solid #4CAF50; margin: 25px 0;">
+        <p style="font-size: 26px; margin: 10px 0;"><strong>📅 {meeting_title}</strong></p>
+        <p style="font-size: 24px; margin: 10px 0;">📆 <strong>日時：</strong>{formatted_date}</p>
+        {f'<p style="font-size: 24px; margin: 10px 0;">🔁 <strong>繰り返し：</strong>{recurrence}（初回の日時です）</p>' if recurrence else ''}
+        <p style="font-size: 22px; margin: 10px 0;">👥 <strong>グループ：</strong>{group_name}</p>
+        <p style="font-size: 22px; margin: 10px 0;">👑 <strong>ホスト：</strong>{host_name}</p>
+        {f'<p style="font-size: 20px; margin: 15px 0; color: #555;">📝 {meeting_description}</p>' if meeting_description else ''}
+    </div>
+
+    {zoom_info_html}
+
+    <div style="background-color: #fff3e0; padding: 30px; border-radius: 15px; border: 4px solid #ff9800; margin: 25px 0;">
+        <h3 style="color: #e65100; margin-top: 0; font-size: 26px;">⚠️ 重要：アカウント登録が必要です</h3>
+        <p style="font-size: 20px; color: #e65100;">
+            ミーティングに参加するには、まずアプリでアカウント登録が必要です。
+        </p>
+        <div style="text-align: center; margin: 20px 0;">
+            <a href="{app_url}" style="display: inline-block; background: linear-gradient(135deg, #ff9800 0%, #f57c00 100%); color: white; padding: 20px 40px; font-size: 24px; text-decoration: none; border-radius: 10px; font-weight: bold;">
+                📱 アプリを開いて登録する
+            </a>
+        </div>
+        <p style="font-size: 18px; color: #795548;">
+            ※ 登録時は、このメールアドレス（{email}）をご使用ください。
+        </p>
+    </div>
+
+    <div style="text-align: center; color: #6c757d; font-size: 16px; padding-top: 20px; border-top: 1px solid #dee2e6;">
+        <p>AI学習チェックリスト</p>
+    </div>
+</body>
+</html>
+            """
+
+            part1 = MIMEText(text_body, 'plain', 'utf-8')
+            part2 = MIMEText(html_body, 'html', 'utf-8')
+            msg.attach(part1)
+            msg.attach(part2)
+
+            server.send_message(msg)
+            success_list.append(email)
+
+        except Exception as e:
+            failed_list.append(f"{email} ({str(e)})")
+
+    server.quit()
+
+    if len(failed_list) == 0:
+        return True, f"✅ 未登録者{len(success_list)}名に招待メールを送信しました！", success_list, failed_list
+    elif len(success_list) == 0:
+        return False, "❌ 招待メールの送信に失敗しました", success_list, failed_list
+    else:
+        return True, f"⚠️ {len(success_list)}名に送信成功、{len(failed_list)}名に送信失敗", success_list, failed_list
+
+def send_auto_reminder(meeting_id: int, reminder_type: str = 'reminder_24h') -> Tuple[bool, str, int]:
+    """
+    自動リマインダーを送信
+
+    Args:
+        meeting_id: ミーティングID
+        reminder_type: リマインダーの種類
+
+    Returns:
+        (成功, メッセージ, 送信数)
+    """
+    # 既に送信済みかチェック
+    if check_reminder_sent(meeting_id, reminder_type):
+        return True, "リマインダーは既に送信済みです", 0
+
+    # ミーティング情報を取得
+    meeting = get_meeting_by_id(meeting_id)
+    if not meeting:
+        return False, "ミーティングが見つかりません", 0
+
+    # 参加者を取得
+    participants = get_meeting_participants(meeting_id)
+    if not participants:
+        return False, "参加者がいません", 0
+
+    recipients = [{'name': p['name'], 'email': p['email']} for p in participants]
+
+    # フォローアップミーティングかどうか確認
+    is_followup = "フォローアップ" in meeting['title']
+
+    # リマインダーメールを送信
+    success, message, success_list, failed_list = send_zoom_reminder_email(
+        meeting['title'],
+        meeting.get('scheduled_at', ''),
+        recipients,
+        meeting.get('zoom_url', ''),
+        meeting.get('zoom_passcode'),
+        is_followup=is_followup
+    )
+
+    # 送信記録を保存
+    if success_list:
+        log_reminder_sent(meeting_id, reminder_type, len(success_list))
+
+    return success, message, len(success_list)
+
+def send_single_meeting_invitation(
+    recipient_email: str,
+    recipient_name: str,
+    meeting_title: str,
+    meeting_description: str,
+    formatted_date: str,
+    group_name: str,
+    host_name: str,
+    zoom_url: str = None,
+    zoom_passcode: str = None,
+    is_followup: bool = False
+) -> bool:
+    """
+    単一の招待メールを送信（フォローアップミーティング用）
+    """
+    sender_email, sender_password = get_email_config()
+    
+    if not sender_email or not sender_password:
+        return False
+    
+    try:
+        server = smtplib.SMTP(get_config().smtp_host, get_config().smtp_port)
+        server.starttls()
+        server.login(sender_email, sender_password)
+    except Exception as e:
+        return False
+    
+    # フォローアップの場合はタイトルを変更
+    if is_followup:
+        subject = f"【フォローアップミーティングのお知らせ】{meeting_title}"
+        intro_text = "フォローアップミーティングのご案内です。"
+    else:
+        subject = f"【ミーティングのお知らせ】{meeting_title}"
+        intro_text = "ミーティングのご案内です。"
+    
+    # Zoom情報のHTML
+    zoom_info_html = ""
+    if zoom_url:
+        zoom_info_html = f"""
+    <div style="background-color: #e3f2fd; padding: 30px; border-radius: 15px; border: 3px solid #2196f3; margin: 25px 0; text-align: center;">
+        <h3 style="color: #1565c0; margin-top: 0; font-size: 28px;">📹 Zoomミーティング情報</h3>
+        <a href="{zoom_url}" style="display: inline-block; background-color: #2196f3; color: white; padding: 20px 40px; font-size: 24px; text-decoration: none; border-radius: 10px; font-weight: bold; margin: 15px 0;">
+            🚀 ここをクリックしてZoomに参加
+        </a>
+        <p style="font-size: 20px; margin: 15px 0;"><strong>URL:</strong> {zoom_url}</p>
+"""
+        if zoom_passcode:
+            zoom_info_html += f'        <p style="font-size: 20px; margin: 10px 0;"><strong>🔑 パスコード:</strong> {zoom_passcode}</p>\n'
+        zoom_info_html += "    </div>"
+    
+    try:
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = sender_email
+        msg['To'] = recipient_email
+        
+        html_body = f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+</head>
+<body style="font-family: 'Hiragino Sans', 'Meiryo', sans-serif; max-width: 600px; margin: 0 auto; padding: 20px; background-color: #f5f5f5;">
+    <div style="background-color: white; padding: 40px; border-radius: 20px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
+        <h1 style="color: #1976d2; text-align: center; font-size: 32px; border-bottom: 3px solid #1976d2; padding-bottom: 20px;">
+            {'🔄' if is_followup else '📅'} {meeting_title}
+        </h1>
+        
+        <p style="font-size: 24px; color: #333; margin: 25px 0;">
+            {recipient_name}様
+        </p>
+        
+        <p style="font-size: 20px; color: #333; line-height: 1.8;">
+            {intro_text}
+        </p>
+        
+        <div style="background-color: #fff8e1; padding: 25px; border-radius: 15px; border: 3px solid #ff9800; margin: 25px 0;">
+            <h3 style="color: #f57c00; margin-top: 0; font-size: 24px;">📋 ミーティング詳細</h3>
+            <table style="width: 100%; font-size: 20px; border-collapse: collapse;">
+                <tr>
+                    <td style="padding: 10px 0; font-weight: bold; width: 120px;">📌 タイトル:</td>
+                    <td style="padding: 10px 0;">{meeting_title}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 10px 0; font-weight: bold;">📅 日時:</td>
+                    <td style="padding: 10px 0;">{formatted_date}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 10px 0; font-weight: bold;">👥 グループ:</td>
+                    <td style="padding: 10px 0;">{group_name}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 10px 0; font-weight: bold;">👤 ホスト:</td>
+                    <td style="padding: 10px 0;">{host_name}</td>
+                </tr>
+            </table>
+            {f'<p style="font-size: 18px; margin-top: 15px; color: #555;"><strong>説明:</strong> {meeting_description}</p>' if meeting_description else ''}
+        </div>
+        
+        {zoom_info_html}
+        
+        <p style="font-size: 18px; color: #666; text-align: center; margin-top: 30px;">
+            ご参加をお待ちしております。
+        </p>
+    </div>
+</body>
+</html>
+"""
+        
+        msg.attach(MIMEText(html_body, 'html'))
+        server.sendmail(sender_email, recipient_email, msg.as_string())
+        server.quit()
+        return True
+    except Exception as e:
+        return False
@@ -0,0 +1,167 @@
+"""
+パスワードのハッシュ化モジュール
+ユーザーごとのソルト付きで、計算コスト（メモリ・時間）を調整できるハッシュ方式を管理
+
+保存形式：
+    scrypt$<n>$<r>$<p>$<ソルト(base64)>$<ハッシュ(base64)>
+    （旧形式）ソルトなしのSHA-256（16進数64文字）
+
+ログインに成功したとき、旧形式や現在の設定と違うコストのハッシュは作り直す（needs_rehash）。
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from config import get_config
+
+
+class PasswordHasher(ABC):
+    """ハッシュ方式の共通インターフェース"""
+    algorithm = ""
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        """パスワードをハッシュにする（保存する文字列を返す）"""
+
+    @abstractmethod
+    def verify(self, password: str, encoded: str) -> bool:
+        """パスワードが保存されたハッシュと一致するか"""
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """保存されたハッシュを、このハッシュ方式・設定で作り直すべきか"""
+        return True
+
+
+class ScryptHasher(PasswordHasher):
+    """
+    scrypt（hashlib.scrypt）
+    n: CPU・メモリのコスト（2のべき乗）、r: ブロックサイズ、p: 並列度
+    使用メモリはおよそ 128 × n × r バイト（n=2^14, r=8 で16MB）
+    """
+    algorithm = "scrypt"
+    salt_size = 16
+    dklen = 32
+
+    def __init__(self, n: int = 2 ** 14, r: int = 8, p: int = 1):
+        if n < 2 or n & (n - 1):
+            raise ValueError("scryptのnは2以上の2のべき乗にしてください")
+        self.n = n
+        self.r = r
+        self.p = p
+
+    def _derive(self, password: str, salt: bytes, n: int, r: int, p: int, dklen: int) -> bytes:
+        return hashlib.scrypt(
+            password.encode(), salt=salt, n=n, r=r, p=p, dklen=dklen,
+            maxmem=256 * n * r * max(1, p)
+        )
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(self.salt_size)
+        derived = self._derive(password, salt, self.n, self.r, self.p, self.dklen)
+        return "$".join([
+            self.algorithm, str(self.n), str(self.r), str(self.p),
+            base64.b64encode(salt).decode(), base64.b64encode(derived).decode(),
+        ])
+
+    @staticmethod
+    def _parse(encoded: str) -> Optional[Dict]:
+        try:
+            algorithm, n, r, p, salt, derived = encoded.split("$")
+            if algorithm != ScryptHasher.algorithm:
+                return None
+            return {
+                "n": int(n), "r": int(r), "p": int(p),
+                "salt": base64.b64decode(salt), "derived": base64.b64decode(derived),
+            }
+        except (ValueError, TypeError):
+            return None
+
+    def verify(self, password: str, encoded: str) -> bool:
+        params = self._parse(encoded)
+        if params is None:
+            return False
+        derived = self._derive(password, params["salt"], params["n"], params["r"], params["p"],
+                               len(params["derived"]))
+        return hmac.compare_digest(derived, params["derived"])
+
+    def needs_rehash(self, encoded: str) -> bool:
+        params = self._parse(encoded)
+        return params is None or (params["n"], params["r"], params["p"]) != (self.n, self.r, self.p)
+
+
+class LegacySHA256Hasher(PasswordHasher):
+    """旧形式（ソルトなしのSHA-256）。照合のみに使い、ログイン時にscryptへ作り直す"""
+    algorithm = "sha256"
+
+    def hash(self, password: str) -> str:
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    def verify(self, password: str, encoded: str) -> bool:
+        return hmac.compare_digest(self.hash(password), encoded)
+
+    @staticmethod
+    def matches(encoded: str) -> bool:
+        return len(encoded) == 64 and all(ch in "0123456789abcdef" for ch in encoded)
+
+
+_legacy_hasher = LegacySHA256Hasher()
+# 保存形式の先頭（algorithm）から照合に使う方式を選ぶ（照合のコストは保存されたハッシュの値を使う）
+_verifiers: Dict[str, PasswordHasher] = {ScryptHasher.algorithm: ScryptHasher()}
+_default_hasher: Optional[PasswordHasher] = None
+# 存在しないメールアドレスでも照合と同じ時間をかけるためのハッシュ
+_dummy_hash: Optional[str] = None
+
+
+def get_hasher() -> PasswordHasher:
+    """新しいパスワードのハッシュに使う方式（コストは設定から）"""
+    global _default_hasher
+    if _default_hasher is None:
+        config = get_config()
+        _default_hasher = ScryptHasher(config.password_scrypt_n, config.password_scrypt_r, config.password_scrypt_p)
+    return _default_hasher
+
+
+def set_hasher(hasher: Optional[PasswordHasher]):
+    """ハッシュ方式を差し替える（Noneで設定の値に戻す。ベンチマークなどで使用）"""
+    global _default_hasher, _dummy_hash
+    _default_hasher = hasher
+    _dummy_hash = None
+    if hasher is not None and hasher.algorithm:
+        _verifiers.setdefault(hasher.algorithm, hasher)
+
+
+def _hasher_for(encoded: str) -> PasswordHasher:
+    if LegacySHA256Hasher.matches(encoded):
+        return _legacy_hasher
+    return _verifiers.get(encoded.split("$", 1)[0], get_hasher())
+
+
+def hash_password(password: str) -> str:
+    """パスワードをハッシュ化"""
+    return get_hasher().hash(password)
+
+
+def verify_password(password: str, encoded: Optional[str]) -> bool:
+    """
+    パスワードを照合（比較は一定時間で行う）
+    encodedがNone（ユーザーが存在しない）のときも同じだけ計算してからFalseを返す
+    """
+    global _dummy_hash
+    if not encoded:
+        if _dummy_hash is None:
+            _dummy_hash = hash_password("dummy-password")
+        get_hasher().verify(password, _dummy_hash)
+        return False
+    return _hasher_for(encoded).verify(password, encoded)
+
+
+def needs_rehash(encoded: str) -> bool:
+    """旧形式や、現在の設定と違うコストのハッシュならTrue"""
+    hasher = get_hasher()
+    if LegacySHA256Hasher.matches(encoded):
+        return not isinstance(hasher, LegacySHA256Hasher)
+    return hasher.needs_rehash(encoded)
@@ -0,0 +1,224 @@
+"""
+ログイン試行の回数制限モジュール
+メールアドレスごと・接続元ごとのトークンバケットで、パスワードの総当たりや
+リスト型攻撃（大量のメールアドレスとパスワードの組み合わせを試す攻撃）を止める。
+制限にかかった試行は、パスワードの照合やデータベースの読み込みの前に打ち切る。
+
+バケットはプロセス内のメモリに保持し、件数が上限を超えたら最も古く使われたものから捨てる（LRU）。
+複数のプロセスで動かすときは、RATE_LIMIT_DBにSQLiteのファイルを指定するとバケットを共有できる。
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from config import get_config
+import database as db
+
+# メールアドレスごと：連続5回まで、その後は1分に1回
+EMAIL_BUCKET_CAPACITY = 5
+EMAIL_REFILL_PER_SECOND = 1 / 60
+# 接続元（IPアドレス）ごと：連続20回まで、その後は6秒に1回
+CLIENT_BUCKET_CAPACITY = 20
+CLIENT_REFILL_PER_SECOND = 1 / 6
+# 接続元がわからないときにまとめて数えるキー（接続元が自分で選べない値にする）
+UNKNOWN_CLIENT_KEY = "unknown"
+# メモリに保持するバケットの上限（種類ごと）
+MAX_BUCKETS = 10000
+
+
+class RateLimiter:
+    """
+    トークンバケットによる回数制限
+    キーごとに最大capacity個のトークンを持ち、1秒あたりrefill_per_second個ずつ回復する。
+    1回の試行でトークンを1個使い、足りなければ拒否する。
+    """
+
+    def __init__(self, name: str, capacity: float, refill_per_second: float,
+                 max_keys: int = MAX_BUCKETS, db_path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        self.db_path = db_path
+        self.clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if db_path:
+            self._init_table()
+
+    def _refill(self, tokens: float, updated_at: float, now: float) -> float:
+        return min(self.capacity, tokens + max(0.0, now - updated_at) * self.refill_per_second)
+
+    def _take(self, tokens: float, cost: float) -> Tuple[bool, float, float]:
+        """(許可, 残りのトークン, 再試行までの秒数)"""
+        if tokens >= cost:
+            return True, tokens - cost, 0.0
+        return False, tokens, (cost - tokens) / self.refill_per_second
+
+    def hit(self, key: str, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        試行を1回記録
+
+        Returns:
+            (許可, 再試行できるまでの秒数)
+        """
+        if self.db_path:
+            return self._hit_persistent(key, cost)
+
+        now = self.clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+            allowed, tokens, retry_after = self._take(self._refill(tokens, updated_at, now), cost)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+    def reset(self, key: str):
+        """キーの記録を消す（ログインに成功したときなど）"""
+        if self.db_path:
+            conn = self._connect()
+            conn.execute("DELETE FROM rate_limit_buckets WHERE name = ? AND key = ?", (self.name, key))
+            conn.commit()
+            conn.close()
+            return
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def __len__(self) -> int:
+        if self.db_path:
+            conn = self._connect()
+            count = conn.execute("SELECT COUNT(*) FROM rate_limit_buckets WHERE name = ?", (self.name,)).fetchone()[0]
+            conn.close()
+            return count
+        return len(self._buckets)
+
+    # SQLiteで共有する場合
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+
+    def _init_table(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                name TEXT NOT NULL,
+                key TEXT NOT NULL,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (name, key)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_limit_buckets_updated ON rate_limit_buckets(name, updated_at)")
+        conn.close()
+
+    def _hit_persistent(self, key: str, cost: float) -> Tuple[bool, float]:
+        now = self.clock()
+        conn = self._connect()
+        try:
+            # 読み込みから書き込みまでを他のプロセスと重ならないようにする
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limit_buckets WHERE name = ? AND key = ?", (self.name, key)
+            ).fetchone()
+            tokens, updated_at = row if row else (self.capacity, now)
+            allowed, tokens, retry_after = self._take(self._refill(tokens, updated_at, now), cost)
+            conn.execute("""
+                INSERT INTO rate_limit_buckets (name, key, tokens, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(name, key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at
+            """, (self.name, key, tokens, now))
+            if not row:
+                # 満タンまで回復したバケットは記録がなくても同じなので、古いものを片付ける
+                full_after = self.capacity / self.refill_per_second
+                conn.execute(
+                    "DELETE FROM rate_limit_buckets WHERE name = ? AND updated_at < ?", (self.name, now - full_after)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return allowed, retry_after
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_login_limiters() -> Tuple[RateLimiter, RateLimiter]:
+    """ログイン用の（メールアドレスごと, 接続元ごと）の制限"""
+    with _limiters_lock:
+        if not _limiters:
+            db_path = get_config().rate_limit_db
+            _limiters["email"] = RateLimiter("login_email", EMAIL_BUCKET_CAPACITY, EMAIL_REFILL_PER_SECOND,
+                                             db_path=db_path)
+            _limiters["client"] = RateLimiter("login_client", CLIENT_BUCKET_CAPACITY, CLIENT_REFILL_PER_SECOND,
+                                              db_path=db_path)
+        return _limiters["email"], _limiters["client"]
+
+
+def set_login_limiters(email_limiter: Optional[RateLimiter], client_limiter: Optional[RateLimiter] = None):
+    """ログイン用の制限を差し替える（Noneで設定の値に戻す。シミュレーションなどで使用）"""
+    with _limiters_lock:
+        _limiters.clear()
+        if email_limiter is not None and client_limiter is not None:
+            _limiters["email"] = email_limiter
+            _limiters["client"] = client_limiter
+
+
+def client_key_from_forwarded(forwarded: Optional[str], trusted_hops: int = 0) -> Optional[str]:
+    """
+    X-Forwarded-Forから回数制限に使う接続元を取り出す
+
+    先頭の値は接続元が自由に書けるため使わない。信頼できるプロキシが末尾に追記した値のうち、
+    外側（右）からtrusted_hops番目が、最も外側のプロキシに接続してきたアドレスになる。
+
+    Args:
+        forwarded: X-Forwarded-Forヘッダーの値
+        trusted_hops: アプリの前にあるプロキシの数（0ならヘッダーを使わない）
+
+    Returns:
+        接続元のIPアドレス（わからなければNone）
+    """
+    if not forwarded or trusted_hops <= 0:
+        return None
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    if not hops:
+        return None
+    # ヘッダーの値がプロキシの数より少なければ、すべてプロキシが追記したもの
+    return hops[-min(trusted_hops, len(hops))]
+
+
+def authenticate_with_rate_limit(email: str, password: str,
+                                 client_key: Optional[str] = None) -> Tuple[Optional[Dict], float]:
+    """
+    回数制限つきのユーザー認証
+
+    Args:
+        email: メールアドレス
+        password: パスワード
+        client_key: 接続元（IPアドレスなど、わからなければNone）
+
+    Returns:
+        (ユーザー情報（失敗・制限時はNone）, 再試行できるまでの秒数（制限にかかっていなければ0）)
+    """
+    email_limiter, client_limiter = get_login_limiters()
+    email_key = email.strip().lower()
+
+    if client_key:
+        allowed, retry_after = client_limiter.hit(client_key)
+        if not allowed:
+            return None, retry_after
+    allowed, retry_after = email_limiter.hit(email_key)
+    if not allowed:
+        return None, retry_after
+
+    user = db.authenticate_user(email, password)
+    if user:
+        email_limiter.reset(email_key)
+    return user, 0.0